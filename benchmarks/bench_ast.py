@@ -0,0 +1,84 @@
+# benchmarks/bench_ast.py
+
+"""
+Confronta i nodi tipizzati (__slots__) con la vecchia forma a dizionari:
+memoria occupata dall'AST, tempo di parsing e tempo di visita dei campi.
+
+    python benchmarks/bench_ast.py [numero_di_funzioni]
+"""
+
+import sys
+import tracemalloc
+
+from common import generate_program, best_of
+
+from chiron_runtime.lexer import Lexer
+from chiron_runtime.parser import Parser
+from chiron_runtime.nodes import Node, from_dict
+
+
+def measure(build):
+    """Byte allocati (e ancora vivi) per costruire l'oggetto restituito da build()."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, after - before
+
+
+def walk_nodes(tree):
+    stack = list(tree)
+    count = 0
+    while stack:
+        node = stack.pop()
+        count += 1
+        for name in node.fields:
+            value = getattr(node, name)
+            if isinstance(value, Node):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(v for v in value if isinstance(v, Node))
+    return count
+
+
+def walk_dicts(tree):
+    stack = list(tree)
+    count = 0
+    while stack:
+        node = stack.pop()
+        count += 1
+        for value in node.values():
+            if isinstance(value, dict):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(v for v in value if isinstance(v, dict))
+    return count
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    source = generate_program(n)
+    tokens = Lexer(source).tokenize()
+    print(f"sorgente: {len(source) / 1024:.0f} KiB, {len(tokens) - 1} token, {n} funzioni")
+
+    # entrambe le forme vengono ricostruite dagli stessi dizionari, così condividono le stringhe
+    dicts = [stmt.to_dict() for stmt in Parser(tokens).parse()]
+    nodes, node_bytes = measure(lambda: from_dict(dicts))
+    _, dict_bytes = measure(lambda: [stmt.to_dict() for stmt in nodes])
+
+    print(f"memoria AST   nodi: {node_bytes / 2**20:7.2f} MiB   dizionari: {dict_bytes / 2**20:7.2f} MiB"
+          f"   ({dict_bytes / node_bytes:.2f}x)")
+    print(f"rapporto memoria/sorgente   nodi: {node_bytes / len(source):.1f}x"
+          f"   dizionari: {dict_bytes / len(source):.1f}x")
+
+    parse = best_of(lambda: Parser(tokens).parse())
+    print(f"parsing (nodi): {parse * 1000:8.1f} ms")
+
+    t_nodes = best_of(lambda: walk_nodes(nodes))
+    t_dicts = best_of(lambda: walk_dicts(dicts))
+    print(f"visita        nodi: {t_nodes * 1000:8.1f} ms   dizionari: {t_dicts * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
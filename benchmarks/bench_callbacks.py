@@ -0,0 +1,67 @@
+# benchmarks/bench_callbacks.py
+
+"""
+Costo dei callable Chiron chiamati da Python: chiave di sorted, predicato di
+filter e funzione a due argomenti di map, con il tempo per callback di ogni
+backend. Il backend python, che genera funzioni Python, fa da riferimento.
+
+    python benchmarks/bench_callbacks.py [n_elementi]
+"""
+
+import sys
+
+from common import best_of
+
+from chiron_runtime.cache import parse_source
+from chiron_runtime.closures import ClosureInterpreter
+from chiron_runtime.interpreter import Interpreter
+from chiron_runtime.passes import PassManager
+from chiron_runtime.transpiler import PythonBackend
+from chiron_runtime.vm import VM
+
+BACKENDS = {'tree': Interpreter, 'closure': ClosureInterpreter, 'vm': VM, 'python': PythonBackend}
+
+PRELUDE = """\
+import builtins as py;
+auto xs = py.list(py.range({n}));
+"""
+
+CASES = {
+    'sorted(key)': """\
+callable chiave(int x) -> int {{ return x % 1000; }};
+auto ys = py.sorted(xs, key = chiave);
+""",
+    'filter': """\
+callable pari(int x) -> bool {{ return x % 2 == 0; }};
+auto ys = py.list(py.filter(pari, xs));
+""",
+    'map(a, b)': """\
+callable somma(int a, int b) -> int {{ return a + b; }};
+auto ys = py.list(py.map(somma, xs, xs));
+""",
+}
+
+
+def load(case, n):
+    return parse_source((PRELUDE + CASES[case]).format(n=n), optimizer=PassManager(1))
+
+
+def run(backend, tree):
+    BACKENDS[backend]().interpret(tree)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    trees = {case: load(case, n) for case in CASES}
+
+    print(f"{'backend':<8}" + ''.join(f" {case:>12} {'us/callback':>12}" for case in CASES))
+    for backend in BACKENDS:
+        row = f"{backend:<8}"
+        for case, tree in trees.items():
+            elapsed = best_of(lambda: run(backend, tree), repeat=3)
+            row += f" {elapsed * 1000:10.1f}ms {elapsed / n * 1e6:12.2f}"
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/bench_calls.py
+
+"""
+Costo delle chiamate tra callable Chiron nei backend tree, closure e vm: fib
+ricorsivo, piccoli helper chiamati in un ciclo e, con tracemalloc, la memoria
+tenuta da ogni chiamata annidata (scope del callable compreso).
+
+    python benchmarks/bench_calls.py [n_fib]
+"""
+
+import sys
+import tracemalloc
+
+from common import best_of
+
+from chiron_runtime.cache import parse_source
+from chiron_runtime.closures import ClosureInterpreter
+from chiron_runtime.interpreter import Interpreter
+from chiron_runtime.passes import PassManager
+from chiron_runtime.vm import VM
+
+BACKENDS = {'tree': Interpreter, 'closure': ClosureInterpreter, 'vm': VM}
+
+FIB = """\
+callable fib(int n) -> int {{
+    if (n < 2) {{
+        return n;
+    }}
+    return fib(n - 1) + fib(n - 2);
+}};
+int result = fib({n});
+"""
+
+HELPERS = """\
+callable square(int x) -> int {{ return x * x; }};
+callable add(int a, int b) -> int {{ return a + b; }};
+callable zero() -> int {{ return 0; }};
+int acc = 0;
+for (int i = 0; i < {n}; i:++) {{
+    int acc = add(acc, square(i) % 7);
+    zero();
+}}
+"""
+
+DEPTH = """\
+callable down(int n) -> int {{
+    if (n == 0) {{
+        return 0;
+    }}
+    return down(n - 1) + 1;
+}};
+int result = down({n});
+"""
+
+RECURSION_DEPTH = 150
+
+
+def fib_calls(n):
+    """Numero di chiamate eseguite da fib(n)."""
+    a, b = 1, 1
+    for _ in range(n):
+        a, b = b, a + b + 1
+    return a
+
+
+def load(template, n):
+    return parse_source(template.format(n=n), optimizer=PassManager(1))
+
+
+def run(backend, tree):
+    BACKENDS[backend]().interpret(tree)
+
+
+def bytes_per_call(backend, tree, depth):
+    """Picco di memoria durante la ricorsione, diviso per la profondità."""
+    tracemalloc.start()
+    try:
+        run(backend, tree)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / depth
+
+
+def main():
+    n_fib = int(sys.argv[1]) if len(sys.argv) > 1 else 18
+    n_loop = 20000
+    fib_tree = load(FIB, n_fib)
+    helpers_tree = load(HELPERS, n_loop)
+    depth_tree = load(DEPTH, RECURSION_DEPTH)
+
+    print(f"{'backend':<8} {'fib(%d)' % n_fib:>10} {'us/chiamata':>12} "
+          f"{'helper':>10} {'us/chiamata':>12} {'byte/chiamata':>14}")
+    for backend in BACKENDS:
+        fib_time = best_of(lambda: run(backend, fib_tree), repeat=3)
+        helpers_time = best_of(lambda: run(backend, helpers_tree), repeat=3)
+        memory = bytes_per_call(backend, depth_tree, RECURSION_DEPTH)
+        print(f"{backend:<8} {fib_time * 1000:8.1f}ms {fib_time / fib_calls(n_fib) * 1e6:12.2f} "
+              f"{helpers_time * 1000:8.1f}ms {helpers_time / (3 * n_loop) * 1e6:12.2f} "
+              f"{memory:14.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# benchmarks/bench_expr.py
+
+"""
+Tempo di parsing su sorgenti fatti quasi solo di espressioni: letterali isolati,
+catene di operatori binari e parentesi annidate in profondità.
+
+    python benchmarks/bench_expr.py [numero_di_righe]
+"""
+
+import random
+import sys
+
+from common import best_of
+
+from chiron_runtime.lexer import Lexer
+from chiron_runtime.parser import Parser
+
+OPERATORS = ['+', '-', '*', '/', '%', '<', '==', 'and', 'or']
+
+
+def literals(n):
+    return ''.join(f"int v{i} = {i};\n" for i in range(n))
+
+
+def chains(n, seed=0):
+    rnd = random.Random(seed)
+    lines = []
+    for i in range(n):
+        terms = [rnd.choice(['a', 'b.c', str(i), '2.5', 'f(a, k=1)']) for _ in range(8)]
+        expr = terms[0]
+        for term in terms[1:]:
+            expr += f" {rnd.choice(OPERATORS)} {term}"
+        lines.append(f"bool v{i} = not ({expr}) or x:++ > ++: y;\n")
+    return ''.join(lines)
+
+
+def nested(n, depth=50):
+    expr = '(' * depth + 'a + 1' + ')' * depth
+    return ''.join(f"int v{i} = {expr};\n" for i in range(n))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    for label, source in (('letterali', literals(n)), ('catene', chains(n)), ('annidate', nested(n // 5))):
+        tokens = Lexer(source).tokenize()
+        elapsed = best_of(lambda: Parser(tokens).parse())
+        print(f"{label:<10} {len(tokens) - 1:8d} token  {elapsed * 1000:8.1f} ms"
+              f"  {(len(tokens) - 1) / elapsed / 1e6:6.2f} Mtoken/s")
+    # annidamento oltre il limite di ricorsione di Python
+    depth = sys.getrecursionlimit() * 4
+    Parser(Lexer(f"int v = {'(' * depth}1{')' * depth};").tokenize()).parse()
+    print(f"annidamento di {depth} parentesi: ok")
+
+
+if __name__ == '__main__':
+    main()
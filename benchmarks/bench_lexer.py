@@ -0,0 +1,55 @@
+# benchmarks/bench_lexer.py
+
+"""
+Throughput del lexer (MB/s) su un file ricco di commenti e su uno ricco di codice.
+
+    python benchmarks/bench_lexer.py [dimensione_in_KiB]
+"""
+
+import sys
+
+from common import generate_program, best_of, FUNCTION_TEMPLATE
+
+from chiron_runtime.lexer import Lexer
+
+LICENSE_HEADER = """\
+// Copyright (c) Chiron contributors.
+   Permission is hereby granted, free of charge, to any person obtaining a copy
+   of this software and associated documentation files (the "Software"), to deal
+   in the Software without restriction, including without limitation the rights
+   to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+   copies of the Software, subject to the following conditions. .//
+"""
+
+
+def comment_heavy(size):
+    """Intestazioni di licenza, codice commentato e commenti '#' con poco codice vivo."""
+    parts = []
+    i = 0
+    while sum(map(len, parts)) < size:
+        parts.append(LICENSE_HEADER)
+        parts.append("//\n" + FUNCTION_TEMPLATE.format(i=i).replace('//', '#') + ".//\n")
+        parts.append("# " + "commento su una riga " * 4 + "\n")
+        parts.append(f"int v{i} = {i};   # valore\n")
+        i += 1
+    return ''.join(parts)
+
+
+def code_heavy(size):
+    source = generate_program(1)
+    n = max(1, size // len(source))
+    return generate_program(n)
+
+
+def main():
+    size = (int(sys.argv[1]) if len(sys.argv) > 1 else 1024) * 1024
+    for label, source in (('commenti', comment_heavy(size)), ('codice', code_heavy(size))):
+        data = len(source.encode('utf-8'))
+        elapsed = best_of(lambda: Lexer(source).tokenize())
+        tokens = len(Lexer(source).tokenize()) - 1
+        print(f"{label:<9} {data / 2**20:6.2f} MB  {tokens:8d} token  "
+              f"{elapsed * 1000:8.1f} ms  {data / 2**20 / elapsed:7.2f} MB/s")
+
+
+if __name__ == '__main__':
+    main()
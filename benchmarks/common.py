@@ -0,0 +1,52 @@
+# benchmarks/common.py
+
+"""Utility condivise dai benchmark: percorso del runtime e generatore di programmi .chy."""
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, ROOT)
+
+FUNCTION_TEMPLATE = """\
+# funzione generata numero {i}
+callable f{i}(int a, int b) -> int {{
+    int acc = a * {i} + b;
+    for (int k = 0; k < 10; k:++) {{
+        if (k % 3 == 0 and acc > {i}) {{
+            acc:--;
+        }} else {{
+            int step = acc + k * 2;
+            acc:++;
+        }}
+    }}
+    // blocco di commento
+       su più righe .//
+    try {{
+        print(acc / (b - {i}));
+    }} except ZeroDivisionError as e {{
+        print("zero", e);
+    }}
+    return acc + f_helper(a, "testo {i}");
+}};
+"""
+
+
+def generate_program(n_functions):
+    """Programma sintetico con `n_functions` callable, simile agli script generati."""
+    parts = ["from std.io import print;\n",
+             "callable f_helper(int x, str s) -> int { return x; };\n"]
+    parts.extend(FUNCTION_TEMPLATE.format(i=i) for i in range(n_functions))
+    return ''.join(parts)
+
+
+def best_of(fn, repeat=5):
+    """Tempo minimo (secondi) su `repeat` esecuzioni di fn()."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -0,0 +1,3 @@
+# chiron_runtime
+
+__version__ = "0.1.0"
@@ -0,0 +1,151 @@
+# chiron_runtime/cache.py
+
+import hashlib
+import marshal
+import os
+
+from chiron_runtime import __version__
+from chiron_runtime.locations import Program, SourceMap
+from chiron_runtime.nodes import from_dict
+
+CACHE_DIR   = '__chycache__'
+# formato delle voci: va alzato a ogni modifica della forma a dizionario dei nodi,
+# della semantica dei pass, del formato delle posizioni o del codice Python generato,
+# così le voci scritte da un runtime precedente con la stessa __version__ non si rileggono
+CACHE_FORMAT = 3
+CACHE_MAGIC  = b'CHYC' + bytes([CACHE_FORMAT])
+CACHE_LIMIT = 32 * 1024 * 1024      # byte per cartella __chycache__, oltre si elimina il meno recente
+
+
+def source_key(source, tag=''):
+    """Chiave della cache: hash del sorgente più versione del runtime (e tag del formato)."""
+    h = hashlib.sha256()
+    h.update(f"{__version__}\0{tag}\0".encode('utf-8'))
+    h.update(source.encode('utf-8'))
+    return h.digest()
+
+
+def cache_path(path, suffix, tag=''):
+    """File della voce: `tag` (es. il livello -O) separa le voci dello stesso sorgente."""
+    directory, filename = os.path.split(os.path.abspath(path))
+    stem = os.path.splitext(filename)[0]
+    if tag:
+        stem = f"{stem}.{tag}"
+    return os.path.join(directory, CACHE_DIR, f"{stem}{suffix}")
+
+
+def load(path, key, suffix, tag=''):
+    """Restituisce l'oggetto salvato per `path` se la chiave corrisponde, altrimenti None."""
+    target = cache_path(path, suffix, tag)
+    try:
+        with open(target, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    header = CACHE_MAGIC + key
+    if not data.startswith(header):
+        return None
+    try:
+        value = marshal.loads(data[len(header):])
+    except (EOFError, ValueError, TypeError):
+        return None
+    try:
+        os.utime(target)            # aggiorna la recency per l'LRU
+    except OSError:
+        pass
+    return value
+
+
+def store(path, key, value, suffix, tag='', limit=CACHE_LIMIT):
+    """
+    Scrive la voce in modo atomico (file temporaneo + os.replace), così più processi
+    possono condividere la stessa cartella; poi riporta la cartella sotto `limit`.
+    """
+    target = cache_path(path, suffix, tag)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(tmp, 'wb') as f:
+            f.write(CACHE_MAGIC + key + marshal.dumps(value))
+        os.replace(tmp, target)
+    except (OSError, ValueError):
+        # cache non scrivibile o valore non serializzabile: si ricompila alla prossima esecuzione
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return
+    evict(os.path.dirname(target), limit)
+
+
+def evict(directory, limit=CACHE_LIMIT):
+    """Elimina le voci usate meno di recente (mtime) finché la cartella non rientra in `limit`."""
+    entries = []
+    total = 0
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.endswith('.tmp'):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+    except OSError:
+        return
+    if total <= limit:
+        return
+    entries.sort()
+    for _, size, entry_path in entries:
+        try:
+            os.remove(entry_path)
+        except OSError:
+            # già rimossa da un altro processo
+            pass
+        total -= size
+        if total <= limit:
+            break
+
+
+# ——— AST del parser ———
+
+AST_SUFFIX = '.chyc'
+STREAM_THRESHOLD = 1024 * 1024      # oltre questa dimensione il parser legge i token in streaming
+
+
+def _parse(source, dev_mode=False):
+    from chiron_runtime.lexer import Lexer
+    from chiron_runtime.parser import Parser
+
+    lexer = Lexer(source)
+    tokens = lexer.stream() if len(source) > STREAM_THRESHOLD else lexer.tokenize()
+    return Parser(tokens, dev_mode=dev_mode).parse()
+
+
+def parse_source(source, path=None, use_cache=True, optimizer=None, dev_mode=False):
+    """
+    Lexing e parsing di `source`, poi i pass di `optimizer` (un PassManager) se
+    indicato; con `path` l'AST già ottimizzato viene letto/salvato in __chycache__.
+    Con `dev_mode` il parser è un TracedParser e la cache non viene usata, perché
+    il parser deve girare per produrre la traccia.
+    """
+    if path is None or not use_cache or dev_mode:
+        tree = _parse(source, dev_mode)
+        return optimizer.optimize(tree) if optimizer is not None else tree
+    level = 'raw' if optimizer is None else optimizer.tag
+    key = source_key(source, f"ast-{level}")
+    data = load(path, key, AST_SUFFIX, level)
+    if data is not None:
+        stmts, offsets = data
+        tree = Program(from_dict(stmts))
+        tree.locations = SourceMap(source).load(tree, offsets)
+        return tree
+    tree = _parse(source)
+    if optimizer is not None:
+        optimizer.optimize(tree)
+    # marshal conosce solo i tipi base: i nodi vengono salvati nella forma a dizionario,
+    # le posizioni come offset nell'ordine di visita delle istruzioni
+    store(path, key, ([stmt.to_dict() for stmt in tree], tree.locations.dump(tree)), AST_SUFFIX, level)
+    return tree
@@ -0,0 +1,808 @@
+# chiron_runtime/closures.py
+
+import operator
+from types import CodeType
+
+from chiron_runtime.interpreter import (
+    Interpreter, Frame, UNSET, RuntimeError, BindingPlan,
+    Completion, BREAK, CONTINUE,
+)
+from chiron_runtime.resolver import Resolver
+from chiron_runtime.inline_cache import MethodCache
+from chiron_runtime.specialize import binary_handler, spec_types
+
+BINARY_OPS = {
+    '+':  operator.add,
+    '-':  operator.sub,
+    '*':  operator.mul,
+    '/':  operator.truediv,
+    '%':  operator.mod,
+    '<':  operator.lt,
+    '>':  operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+def _noop(env):
+    return None
+
+
+def _completes(stmts, jumps=True):
+    """
+    True se il blocco può terminare con una Completion (return, o break/continue del
+    ciclo corrente se `jumps`). Solo le closure di questi blocchi restituiscono un
+    esito significativo; le altre vengono eseguite ignorando il valore restituito.
+    """
+    for stmt in stmts or ():
+        t = stmt.type
+        if t == 'return' or (jumps and t in ('break', 'continue')):
+            return True
+        if t == 'if' and (_completes(stmt.body, jumps) or _completes(stmt.orelse, jumps)):
+            return True
+        if t in ('while', 'for') and _completes(stmt.body, False):
+            # break/continue si fermano al ciclo, un return lo attraversa
+            return True
+        if t == 'try':
+            if _completes(stmt.body, jumps) or _completes(stmt.final, jumps):
+                return True
+            if any(_completes(h.body, jumps) for h in stmt.handlers):
+                return True
+    return False
+
+
+class ClosureCompiler:
+    """
+    Compila l'AST del parser in closure Python annidate, una per nodo.
+    Tipo del nodo, operatori e figli vengono risolti una sola volta: a runtime
+    ogni closure riceve soltanto l'ambiente.
+    """
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.positions = {}         # id del codice di una closure -> (codice, istruzione)
+        self.statements = {
+            'import':               self.compile_import,
+            'from_import':          self.compile_from_import,
+            'declaration':          self.compile_declaration,
+            'declaration_callable': self.compile_declaration_callable,
+            'call_callable':        self.compile_call_stmt,
+            'return':               self.compile_return,
+            'try':                  self.compile_try,
+            'if':                   self.compile_if,
+            'while':                self.compile_while,
+            'for':                  self.compile_for,
+            'expr_stmt':            self.compile_expr_stmt,
+            'break':                self.compile_break,
+            'continue':             self.compile_continue,
+        }
+        self.expressions = {
+            'literal':       self.compile_literal,
+            'identifier':    self.compile_identifier,
+            'logic':         self.compile_logic,
+            'unary_logic':   self.compile_unary_logic,
+            'binary_op':     self.compile_binary_op,
+            'unary_op':      self.compile_unary_op,
+            'call_callable': self.compile_call,
+            'get_attr':      self.compile_get_attr,
+        }
+
+    # ——— Entry points ———
+
+    def compile_statement(self, node):
+        t = node.type
+        compiler = self.statements.get(t)
+        if compiler is None:
+            raise RuntimeError(f"Unknown statement type: {t}")
+        return self.locate(compiler(node), node)
+
+    def locate(self, fn, node):
+        """
+        Dà alla closure `fn` un oggetto codice tutto suo, registrato per `node`:
+        format_error risale dai frame del traceback all'istruzione senza che
+        l'esecuzione faccia nulla in più.
+        """
+        code = fn.__code__.replace()
+        fn.__code__ = code
+        self.positions[id(code)] = (code, node)
+        return fn
+
+    def compile_expression(self, node):
+        t = node.type
+        compiler = self.expressions.get(t)
+        if compiler is None:
+            # come il tree walker, l'errore emerge solo se il nodo viene valutato
+            def unknown(env):
+                raise RuntimeError(f"Unknown expression type {t}")
+            return unknown
+        return compiler(node)
+
+    def compile_block(self, stmts):
+        """
+        Closure del blocco. Se il blocco può terminare con return/break/continue
+        (vedi _completes) restituisce l'esito, altrimenti un valore da ignorare.
+        """
+        fns = tuple(self.compile_statement(stmt) for stmt in stmts or ())
+        if not fns:
+            return _noop
+        if _completes(stmts):
+            return self.compile_block_status(stmts, fns)
+        if len(fns) == 1:
+            return fns[0]
+        if len(fns) == 2:
+            first, second = fns
+            def block2(env):
+                first(env)
+                second(env)
+            return block2
+
+        def block(env):
+            for fn in fns:
+                fn(env)
+        return block
+
+    def compile_block_status(self, stmts, fns):
+        # si controlla l'esito solo delle istruzioni che possono produrne uno
+        steps = tuple((fn, _completes((stmt,))) for stmt, fn in zip(stmts, fns))
+        if len(steps) == 1:
+            return fns[0]
+
+        def block_status(env):
+            for fn, completes in steps:
+                if completes:
+                    status = fn(env)
+                    if status is not None:
+                        return status
+                else:
+                    fn(env)
+            return None
+        return block_status
+
+    def compile_body(self, stmts):
+        """Come compile_block, ma la closure restituisce sempre l'esito (None o una Completion)."""
+        block = self.compile_block(stmts)
+        if block is _noop or _completes(stmts):
+            return block
+        def body(env):
+            block(env)
+        return body
+
+    def compile_load(self, node, name, kind='Variable'):
+        """Closure di lettura specializzata sulla coppia (depth, slot) del Resolver."""
+        depth, slot = node.depth, node.slot
+        load_name = self.interpreter.load_name
+
+        if depth is None:
+            global_vars = self.interpreter.global_env.vars
+            def load_global(env):
+                value = global_vars.get(name, UNSET)
+                if value is UNSET:
+                    raise RuntimeError(f"{kind} '{name}' not defined")
+                return value
+            return load_global
+        if depth == 0:
+            def load_local(env):
+                value = env.slots[slot]
+                if value is UNSET:
+                    return load_name(node, name, env, kind)
+                return value
+            return load_local
+        if depth == 1:
+            def load_enclosing(env):
+                value = env.parent.slots[slot]
+                if value is UNSET:
+                    return load_name(node, name, env, kind)
+                return value
+            return load_enclosing
+
+        def load(env):
+            return load_name(node, name, env, kind)
+        return load
+
+    # ——— Statements ———
+
+    def compile_import(self, node):
+        exec_import = self.interpreter._exec_import
+        def import_(env):
+            exec_import(node, env)
+        return import_
+
+    def compile_from_import(self, node):
+        exec_from_import = self.interpreter._exec_from_import
+        def from_import(env):
+            exec_from_import(node, env)
+        return from_import
+
+    def compile_declaration(self, node):
+        name = node.name
+        slot = node.slot
+        value = self.compile_expression(node.value)
+        if slot is None:
+            def declaration(env):
+                env.vars[name] = value(env)
+            return declaration
+
+        def declaration_local(env):
+            env.slots[slot] = value(env)
+        return declaration_local
+
+    def compile_declaration_callable(self, node):
+        name = node.name
+        slot = node.slot
+        names = node.locals
+        # i default non literal diventano closure, eseguite nello scope della dichiarazione
+        plan = BindingPlan(name, node.params, len(names), self.compile_expression)
+        n_params = plan.n_params
+        # senza altri nomi locali gli argomenti sono già tutti gli slot del frame
+        exact = n_params == len(names)
+        stmts = node.body or []
+        tail = None
+        if stmts and stmts[-1].type == 'return' and stmts[-1].expression is not None \
+                and not _completes(stmts[:-1]):
+            # `...; return expr;` senza altre uscite (chiavi, predicati): il valore
+            # si calcola direttamente, senza Completion né controllo dell'esito
+            tail = self.locate(self.compile_expression(stmts[-1].expression), stmts[-1])
+            stmts = stmts[:-1]
+        prefix = bool(stmts)
+        body = self.compile_block(stmts)
+        returns = _completes(stmts)
+        # senza default, uno o due parametri: forme ad arità fissa come nel tree walker
+        fixed = n_params if plan.n_required == n_params and n_params in (1, 2) else 0
+        pad = [UNSET] * (len(names) - n_params)
+
+        def declaration_callable(env):
+            evaluate = lambda default: default(env)
+            if fixed == 1:
+                def func(a=UNSET, /, *rest, **kwargs):
+                    if kwargs or rest or a is UNSET:
+                        local_env = Frame(names, env, plan.bind_given((a,), rest, kwargs, evaluate))
+                    else:
+                        local_env = Frame(names, env, [a, *pad])
+                    if tail is not None:
+                        if prefix:
+                            body(local_env)
+                        return tail(local_env)
+                    status = body(local_env)
+                    if returns and status is not None:
+                        return status.value
+            elif fixed == 2:
+                def func(a=UNSET, b=UNSET, /, *rest, **kwargs):
+                    if kwargs or rest or b is UNSET:
+                        local_env = Frame(names, env, plan.bind_given((a, b), rest, kwargs, evaluate))
+                    else:
+                        local_env = Frame(names, env, [a, b, *pad])
+                    if tail is not None:
+                        if prefix:
+                            body(local_env)
+                        return tail(local_env)
+                    status = body(local_env)
+                    if returns and status is not None:
+                        return status.value
+            else:
+                def func(*args, **kwargs):
+                    if kwargs or len(args) != n_params:
+                        local_env = Frame(names, env, plan.bind(args, kwargs, evaluate))
+                    elif exact:
+                        local_env = Frame(names, env, list(args))
+                    else:
+                        local_env = Frame(names, env)
+                        local_env.slots[:n_params] = args
+                    if tail is not None:
+                        if prefix:
+                            body(local_env)
+                        return tail(local_env)
+                    if returns:
+                        status = body(local_env)
+                        if status is not None:
+                            return status.value
+                    else:
+                        body(local_env)
+            if slot is None:
+                env.define_func(name, func)
+            else:
+                env.slots[slot] = func
+        return declaration_callable
+
+    def compile_call_stmt(self, node):
+        callee = self.compile_load(node, node.name, 'Function')
+        args = tuple(self.compile_expression(arg) for arg in node.args)
+        if self.interpreter.interop is not None:
+            return self.compile_profiled_call(node, callee, args)
+        if node.kwargs:
+            kwargs = tuple(
+                (key, self.compile_expression(val)) for key, val in node.kwargs.items()
+            )
+            def call_stmt_kw(env):
+                return callee(env)(*[arg(env) for arg in args], **{key: val(env) for key, val in kwargs})
+            return call_stmt_kw
+        if not args:
+            def call_stmt0(env):
+                return callee(env)()
+            return call_stmt0
+        if len(args) == 1:
+            arg0, = args
+            def call_stmt1(env):
+                return callee(env)(arg0(env))
+            return call_stmt1
+        if len(args) == 2:
+            arg0, arg1 = args
+            def call_stmt2(env):
+                return callee(env)(arg0(env), arg1(env))
+            return call_stmt2
+
+        def call_stmt(env):
+            return callee(env)(*[arg(env) for arg in args])
+        return call_stmt
+
+    def compile_return(self, node):
+        if node.expression is None:
+            completion = Completion('return')
+            def return_none(env):
+                return completion
+            return return_none
+
+        value = self.compile_expression(node.expression)
+        def return_(env):
+            return Completion('return', value(env))
+        return return_
+
+    def compile_try(self, node):
+        body = self.compile_body(node.body)
+        handlers = tuple(
+            (handler.exception, handler.locals, self.compile_body(handler.body))
+            for handler in node.handlers
+        )
+        final = self.compile_body(node.final) if node.final else None
+
+        def try_(env):
+            status = None
+            try:
+                status = body(env)
+            except Exception as e:
+                for exception, names, handler in handlers:
+                    if exception in (type(e).__name__, 'Exception'):
+                        local_env = Frame(names, env)
+                        local_env.slots[0] = str(e)
+                        status = handler(local_env)
+                        break
+                else:
+                    raise
+            finally:
+                if final is not None:
+                    # come in Python, un return nel finally prevale
+                    final_status = final(env)
+                    if final_status is not None:
+                        status = final_status
+            return status
+        return try_
+
+    def compile_if(self, node):
+        cond = self.compile_expression(node.condition)
+        if _completes((node,)):
+            body, orelse = self.compile_body(node.body), self.compile_body(node.orelse)
+            def if_status(env):
+                if cond(env):
+                    return body(env)
+                return orelse(env)
+            return if_status
+
+        body = self.compile_block(node.body)
+        if not node.orelse:
+            def if_(env):
+                if cond(env):
+                    body(env)
+            return if_
+
+        orelse = self.compile_block(node.orelse)
+        def if_else(env):
+            if cond(env):
+                body(env)
+            else:
+                orelse(env)
+        return if_else
+
+    def compile_while(self, node):
+        cond = self.compile_expression(node.condition)
+        body = self.compile_block(node.body)
+        if not _completes(node.body):
+            def while_(env):
+                while cond(env):
+                    body(env)
+            return while_
+
+        def while_status(env):
+            while cond(env):
+                status = body(env)
+                if status is not None and status is not CONTINUE:
+                    return None if status is BREAK else status
+            return None
+        return while_status
+
+    def compile_for(self, node):
+        init = self.compile_statement(node.init)
+        cond = self.compile_expression(node.condition)
+        update = self.compile_expression(node.update)
+        body = self.compile_block(node.body)
+        completes = _completes(node.body)
+        if not completes:
+            def loop(env):
+                while cond(env):
+                    body(env)
+                    update(env)
+        else:
+            def loop(env):
+                while cond(env):
+                    status = body(env)
+                    if status is not None and status is not CONTINUE:
+                        return None if status is BREAK else status
+                    update(env)
+                return None
+        if node.counted:
+            return self.compile_counted_for(node, init, body, loop, completes)
+
+        def for_(env):
+            init(env)
+            return loop(env)
+        return for_
+
+    def compile_counted_for(self, node, init, body, loop, completes):
+        """Ciclo marcato dal pass counted-loops: range() se inizio e fine sono interi, altrimenti `loop`."""
+        name, slot = node.init.name, node.init.slot
+        stop_value = self.compile_expression(node.condition.right)
+        inclusive = node.condition.op == '<='
+
+        def counted_for(env):
+            init(env)
+            if slot is None:
+                slots, key = env.vars, name
+            else:
+                slots, key = env.slots, slot
+            start, stop = slots[key], stop_value(env)
+            if type(start) is not int or type(stop) is not int:
+                return loop(env)
+            if inclusive:
+                stop += 1
+            if completes:
+                for i in range(start, stop):
+                    slots[key] = i
+                    status = body(env)
+                    if status is not None and status is not CONTINUE:
+                        return None if status is BREAK else status
+            else:
+                for i in range(start, stop):
+                    slots[key] = i
+                    body(env)
+            # valore finale come nel ciclo generico
+            slots[key] = max(start, stop)
+        return counted_for
+
+    def compile_expr_stmt(self, node):
+        return self.compile_expression(node.expr)
+
+    def compile_break(self, node):
+        def break_(env):
+            return BREAK
+        return break_
+
+    def compile_continue(self, node):
+        def continue_(env):
+            return CONTINUE
+        return continue_
+
+    # ——— Expressions ———
+
+    def compile_literal(self, node):
+        value = node.value
+        def literal(env):
+            return value
+        return literal
+
+    def compile_identifier(self, node):
+        return self.compile_load(node, node.name)
+
+    def compile_logic(self, node):
+        # come il tree walker: entrambi gli operandi vengono sempre valutati
+        left = self.compile_expression(node.left)
+        right = self.compile_expression(node.right)
+        if node.op == 'and':
+            def logic_and(env):
+                l = left(env)
+                r = right(env)
+                return l and r
+            return logic_and
+
+        def logic_or(env):
+            l = left(env)
+            r = right(env)
+            return l or r
+        return logic_or
+
+    def compile_unary_logic(self, node):
+        expr = self.compile_expression(node.expr)
+        def unary_logic(env):
+            return not expr(env)
+        return unary_logic
+
+    def compile_binary_op(self, node):
+        op = BINARY_OPS.get(node.op)
+        if op is None:
+            raise RuntimeError(f"Unknown binary operator {node.op}")
+        if node.spec is not None:
+            return self.compile_specialized(node, op)
+        left = self.compile_expression(node.left)
+        if node.right.type == 'literal':
+            value = node.right.value
+            def binary_op_const(env):
+                return op(left(env), value)
+            return binary_op_const
+
+        right = self.compile_expression(node.right)
+        def binary_op(env):
+            return op(left(env), right(env))
+        return binary_op
+
+    def compile_specialized(self, node, op):
+        """
+        binary_op con i tipi noti dal pass type-specialize: literal e slot locali sono
+        letti nel gestore stesso, che esegue l'operatore in linea se i tipi sono quelli
+        dichiarati (il runtime non li fa rispettare) e altrimenti ripiega su `op`.
+        """
+        left, right = self.compile_expression(node.left), self.compile_expression(node.right)
+        operands = []
+        for operand, read in ((node.left, left), (node.right, right)):
+            if operand.type == 'literal':
+                operands.append(('const', operand.value))
+            elif operand.type == 'identifier' and operand.depth == 0:
+                operands.append(('slot', operand.slot))
+            else:
+                operands.append(('read', read))
+
+        def fallback(a, b, env):
+            # uno slot non ancora assegnato si legge come nel percorso generico
+            if a is UNSET:
+                a = left(env)
+            if b is UNSET:
+                b = right(env)
+            return op(a, b)
+        return binary_handler(node.op, operands, spec_types(node), fallback)
+
+    def compile_unary_op(self, node):
+        name = node.target
+        op = node.op
+        if op in ('++_pre', '++_post'):
+            delta = 1
+        elif op in ('--_pre', '--_post'):
+            delta = -1
+        else:
+            raise RuntimeError(f"Unknown unary op {op}")
+
+        if node.depth == 0:
+            slot = node.slot
+            step_name = self.interpreter.step_name
+            def step(env):
+                slots = env.slots
+                old = slots[slot]
+                if old is UNSET:
+                    return step_name(node, name, env, delta)
+                slots[slot] = old + delta
+                return old
+        else:
+            step_name = self.interpreter.step_name
+            def step(env):
+                return step_name(node, name, env, delta)
+
+        if op.endswith('_post'):
+            return step
+        def pre_step(env):
+            return step(env) + delta
+        return pre_step
+
+    def compile_get_attr(self, node):
+        obj = self.compile_expression(node.object)
+        attr = node.attr
+        def get_attr(env):
+            return getattr(obj(env), attr)
+        return get_attr
+
+    def compile_call(self, node):
+        name_node = node.name
+        if name_node.type == 'identifier':
+            callee = self.compile_load(node, name_node.name, 'Function')
+        elif name_node.type == 'get_attr':
+            return self.compile_method_call(node)
+        else:
+            raise RuntimeError(f"Invalid function name: {name_node}")
+
+        args = tuple(self.compile_expression(arg) for arg in node.args)
+        if self.interpreter.interop is not None:
+            return self.compile_profiled_call(node, callee, args)
+        kwargs = tuple(
+            (key, self.compile_expression(val)) for key, val in node.kwargs.items()
+        )
+        if kwargs:
+            def call_kw(env):
+                func = callee(env)
+                pos_args = [arg(env) for arg in args]
+                kw_args = {key: val(env) for key, val in kwargs}
+                return func(*pos_args, **kw_args)
+            return call_kw
+        if not args:
+            def call0(env):
+                return callee(env)()
+            return call0
+        if len(args) == 1:
+            arg0, = args
+            def call1(env):
+                func = callee(env)
+                return func(arg0(env))
+            return call1
+        if len(args) == 2:
+            arg0, arg1 = args
+            def call2(env):
+                func = callee(env)
+                return func(arg0(env), arg1(env))
+            return call2
+
+        def call(env):
+            func = callee(env)
+            return func(*[arg(env) for arg in args])
+        return call
+
+    def compile_method_call(self, node):
+        """obj.metodo(...) con la MethodCache del sito (vedi inline_cache)."""
+        name_node = node.name
+        obj = self.compile_expression(name_node.object)
+        attr = name_node.attr
+        if self.interpreter.interop is not None:
+            # il profilo misura il metodo legato, senza inline cache
+            def bound_method(env):
+                return getattr(obj(env), attr)
+            args = tuple(self.compile_expression(arg) for arg in node.args)
+            return self.compile_profiled_call(node, bound_method, args)
+        cache = MethodCache(attr)
+        self.interpreter.call_caches.append(cache)
+        update = cache.update
+        args = tuple(self.compile_expression(arg) for arg in node.args)
+        kwargs = tuple(
+            (key, self.compile_expression(val)) for key, val in node.kwargs.items()
+        )
+        # la guardia sul tipo è qui: un ricevente senza metodo in cache (moduli,
+        # istanze di classi Python) arriva a getattr senza altre chiamate
+        if not kwargs and not args:
+            def method_call0(env):
+                receiver = obj(env)
+                if type(receiver) is cache.type:
+                    method = cache.func
+                    if method is not None:
+                        cache.hits += 1
+                        return method(receiver)
+                else:
+                    method = update(receiver)
+                    if method is not None:
+                        return method(receiver)
+                return getattr(receiver, attr)()
+            return method_call0
+        if not kwargs and len(args) == 1:
+            arg0, = args
+            def method_call1(env):
+                receiver = obj(env)
+                if type(receiver) is cache.type:
+                    method = cache.func
+                    if method is not None:
+                        cache.hits += 1
+                        return method(receiver, arg0(env))
+                else:
+                    method = update(receiver)
+                    if method is not None:
+                        return method(receiver, arg0(env))
+                return getattr(receiver, attr)(arg0(env))
+            return method_call1
+        if not kwargs:
+            def method_call_n(env):
+                receiver = obj(env)
+                if type(receiver) is cache.type:
+                    method = cache.func
+                    if method is not None:
+                        cache.hits += 1
+                        return method(receiver, *[arg(env) for arg in args])
+                else:
+                    method = update(receiver)
+                    if method is not None:
+                        return method(receiver, *[arg(env) for arg in args])
+                return getattr(receiver, attr)(*[arg(env) for arg in args])
+            return method_call_n
+
+        def method_call(env):
+            receiver = obj(env)
+            if type(receiver) is cache.type:
+                method = cache.func
+                if method is not None:
+                    cache.hits += 1
+            else:
+                method = update(receiver)
+            if method is None:
+                func = getattr(receiver, attr)
+            pos_args = [arg(env) for arg in args]
+            kw_args = {key: val(env) for key, val in kwargs}
+            if method is not None:
+                return method(receiver, *pos_args, **kw_args)
+            return func(*pos_args, **kw_args)
+        return method_call
+
+    def compile_profiled_call(self, node, callee, args):
+        """Chiamata che passa dall'InteropProfile dell'interprete (--interop-stats)."""
+        profile = self.interpreter.interop
+        kwargs = tuple(
+            (key, self.compile_expression(val)) for key, val in node.kwargs.items()
+        )
+        def profiled_call(env):
+            func = callee(env)
+            return profile.call(func, [arg(env) for arg in args], {key: val(env) for key, val in kwargs})
+        return profiled_call
+
+
+class ClosureInterpreter(Interpreter):
+    """
+    Variante dell'interprete che compila l'AST in closure una sola volta
+    e poi esegue direttamente le closure, senza dispatch sul tipo del nodo.
+    """
+
+    def __init__(self, devMode=False):
+        super().__init__(devMode)
+        self.compiler = ClosureCompiler(self)
+
+    def is_chiron_callable(self, func):
+        return id(getattr(func, '__code__', None)) in CALLABLE_BODIES
+
+    def error_calls(self, error):
+        """Come nel tree walker, ma le istruzioni in corso sono i frame delle loro closure."""
+        offsets = self.locations.offsets
+        positions = self.compiler.positions
+        calls = [['<global>', None]]
+        tb = error.__traceback__
+        while tb is not None:
+            frame = tb.tb_frame
+            if id(frame.f_code) in CALLABLE_BODIES:
+                calls.append([frame.f_locals['plan'].name, None])
+            else:
+                located = positions.get(id(frame.f_code))
+                if located is not None and located[1] in offsets:
+                    calls[-1][1] = located[1]
+            tb = tb.tb_next
+        return calls
+
+    def run_program(self, ast):
+        Resolver().resolve(ast)
+        compiled = [(stmt, self.compiler.compile_statement(stmt)) for stmt in ast]
+        entry = None
+
+        # stesso ordine del tree walker: import, funzioni, poi main o codice globale
+        for stmt, fn in compiled:
+            if stmt.type in ('import', 'from_import'):
+                fn(self.global_env)
+
+        for stmt, fn in compiled:
+            if stmt.type == 'declaration_callable':
+                fn(self.global_env)
+                if stmt.name == 'main':
+                    entry = stmt
+
+        if entry:
+            self.global_env.get_func('main')()
+        else:
+            for stmt, fn in compiled:
+                if stmt.type not in ('declaration_callable', 'import', 'from_import'):
+                    # un return nel codice globale lo termina, come nel tree walker
+                    if fn(self.global_env) is not None and _completes((stmt,)):
+                        break
+
+        if self.devMode: self.dump_env()
+
+
+# codice dei callable Chiron compilati (forma generale e ad arità fissa), per
+# riconoscerli per identità tra le funzioni Python e nei frame del traceback
+_DECLARATION = next(const for const in ClosureCompiler.compile_declaration_callable.__code__.co_consts
+                    if isinstance(const, CodeType) and const.co_name == 'declaration_callable')
+CALLABLE_BODIES = frozenset(id(const) for const in _DECLARATION.co_consts
+                            if isinstance(const, CodeType) and const.co_name == 'func')
@@ -0,0 +1,498 @@
+# chiron_runtime/compiler.py
+
+import operator
+from bisect import bisect_right
+
+from chiron_runtime.interpreter import RuntimeError, BindingPlan
+from chiron_runtime.nodes import Node
+
+# ——— Opcodes ———
+# Ogni istruzione occupa due celle nel codice: [opcode, argomento].
+# I salti usano come argomento l'offset assoluto nel codice.
+
+LOAD_CONST        = 1
+LOAD_NAME         = 2
+LOAD_FUNC         = 3
+STORE_NAME        = 4
+STORE_FUNC        = 5
+LOAD_ATTR         = 6
+BINARY_OP         = 7
+UNARY_NOT         = 8
+PRE_INC           = 9
+PRE_DEC           = 10
+POST_INC          = 11
+POST_DEC          = 12
+CALL              = 13
+CALL_KW           = 14
+POP_TOP           = 15
+JUMP              = 16
+POP_JUMP_IF_FALSE = 17
+RETURN_VALUE      = 18
+MAKE_FUNCTION     = 19
+IMPORT            = 20
+FROM_IMPORT       = 21
+SETUP_EXCEPT      = 22
+POP_BLOCK         = 23
+PUSH_SCOPE        = 24
+POP_SCOPE         = 25
+MATCH_EXCEPT      = 26
+BIND_EXCEPT       = 27
+RERAISE           = 28
+INC_NAME          = 29
+DEC_NAME          = 30
+
+OPNAMES = {value: name for name, value in globals().items() if name.isupper() and isinstance(value, int)}
+
+JUMP_OPS  = (JUMP, POP_JUMP_IF_FALSE, SETUP_EXCEPT)
+NAME_OPS  = (LOAD_NAME, LOAD_FUNC, STORE_NAME, STORE_FUNC, LOAD_ATTR,
+             PRE_INC, PRE_DEC, POST_INC, POST_DEC, INC_NAME, DEC_NAME, BIND_EXCEPT)
+CONST_OPS = (LOAD_CONST, MAKE_FUNCTION, IMPORT, FROM_IMPORT, MATCH_EXCEPT)
+
+
+def _logic_and(left, right):
+    return left and right
+
+
+def _logic_or(left, right):
+    return left or right
+
+
+# 'and'/'or' valutano sempre entrambi gli operandi, come nel tree walker
+BINARY_OPS = ('+', '-', '*', '/', '%', '<', '>', '<=', '>=', '==', '!=', 'and', 'or')
+BINARY_FUNCS = (
+    operator.add, operator.sub, operator.mul, operator.truediv, operator.mod,
+    operator.lt, operator.gt, operator.le, operator.ge, operator.eq, operator.ne,
+    _logic_and, _logic_or,
+)
+
+UNARY_OPS = {'++_pre': PRE_INC, '--_pre': PRE_DEC, '++_post': POST_INC, '--_post': POST_DEC}
+# forma senza risultato, usata quando il valore viene scartato (es. `i:++;`)
+UNARY_STMT_OPS = {'++_pre': INC_NAME, '--_pre': DEC_NAME, '++_post': INC_NAME, '--_post': DEC_NAME}
+
+
+class CodeObject:
+    """Bytecode lineare di un modulo o di un callable, con i propri pool di costanti e nomi."""
+
+    def __init__(self, name, params=()):
+        self.name   = name
+        self.params = params
+        self.code   = []
+        self.consts = []
+        self.names  = []
+        self.plan   = None      # BindingPlan dei callable: keyword e default
+        # posizioni per i messaggi d'errore: pc d'inizio (crescente) di ogni istruzione
+        # e l'istruzione stessa; None per il codice che non appartiene a un'istruzione
+        self.starts = []
+        self.stmts  = []
+
+    def statement_at(self, pc):
+        """Istruzione che contiene l'opcode in `pc`, o None."""
+        i = bisect_right(self.starts, pc) - 1
+        return self.stmts[i] if i >= 0 else None
+
+    def __repr__(self):
+        return f"<CodeObject {self.name} ({len(self.code) // 2} instructions)>"
+
+
+class Compiler:
+    """
+    Traduce l'AST prodotto da Parser.parse() in CodeObject eseguibili dalla VM.
+    """
+
+    def __init__(self):
+        self.co = None
+        # blocchi aperti nella funzione corrente, usati da return/break/continue
+        # per sapere cosa chiudere: ('except',), ('finally', body), ('scope',), ('loop', ...)
+        self.blocks = []
+        self.outer  = []
+
+    # ——— Entry points ———
+
+    def compile_module(self, ast, name='<module>'):
+        co = self._begin(name)
+        # stesso ordine del tree walker: import, funzioni, poi main o codice globale
+        for stmt in ast:
+            if stmt.type in ('import', 'from_import'):
+                self.compile_statement(stmt)
+        has_main = False
+        for stmt in ast:
+            if stmt.type == 'declaration_callable':
+                self.compile_statement(stmt)
+                has_main = has_main or stmt.name == 'main'
+        if has_main:
+            self.mark(None)
+            self.emit(LOAD_FUNC, self.name_index('main'))
+            self.emit(CALL, 0)
+            self.emit(POP_TOP)
+        else:
+            for stmt in ast:
+                if stmt.type not in ('declaration_callable', 'import', 'from_import'):
+                    self.compile_statement(stmt)
+        self.emit(LOAD_CONST, self.const_index(None))
+        self.emit(RETURN_VALUE)
+        return self._end(co)
+
+    def compile_callable(self, node):
+        params = tuple(param.name for param in node.params)
+        plan = BindingPlan(node.name, node.params, len(params),
+                           lambda default: self.compile_default(default, node.name))
+        co = self._begin(node.name, params)
+        co.plan = plan
+        self.compile_block(node.body)
+        self.emit(LOAD_CONST, self.const_index(None))
+        self.emit(RETURN_VALUE)
+        return self._end(co)
+
+    def compile_default(self, node, owner):
+        """
+        Default non literal: CodeObject a sé, eseguito nello scope della dichiarazione.
+        Porta il nome del callable `owner`, come nel traceback .chy del tree walker.
+        """
+        co = self._begin(owner)
+        self.compile_expression(node)
+        self.emit(RETURN_VALUE)
+        return self._end(co)
+
+    def _begin(self, name, params=()):
+        self.outer.append((self.co, self.blocks))
+        self.co = CodeObject(name, params)
+        self.blocks = []
+        return self.co
+
+    def _end(self, co):
+        self.co, self.blocks = self.outer.pop()
+        return co
+
+    # ——— Emission helpers ———
+
+    def emit(self, op, arg=0):
+        self.co.code.extend((op, arg))
+        return len(self.co.code) - 1      # posizione dell'argomento, per il patch dei salti
+
+    def mark(self, node):
+        """Da qui in poi gli opcode appartengono all'istruzione `node`."""
+        self.co.starts.append(len(self.co.code))
+        self.co.stmts.append(node)
+
+    def patch(self, arg_pos, target=None):
+        self.co.code[arg_pos] = len(self.co.code) if target is None else target
+
+    def here(self):
+        return len(self.co.code)
+
+    def const_index(self, value):
+        consts = self.co.consts
+        for i, c in enumerate(consts):
+            if c is value or (type(c) is type(value) and c == value):
+                return i
+        consts.append(value)
+        return len(consts) - 1
+
+    def name_index(self, name):
+        names = self.co.names
+        if name in names:
+            return names.index(name)
+        names.append(name)
+        return len(names) - 1
+
+    # ——— Statements ———
+
+    def compile_block(self, stmts):
+        for stmt in stmts or ():
+            self.compile_statement(stmt)
+
+    def compile_statement(self, node):
+        t = node.type
+        self.mark(node)
+
+        if t == 'import':
+            self.emit(IMPORT, self.const_index(node))
+
+        elif t == 'from_import':
+            self.emit(FROM_IMPORT, self.const_index(node))
+
+        elif t == 'declaration':
+            self.compile_expression(node.value)
+            self.emit(STORE_NAME, self.name_index(node.name))
+
+        elif t == 'declaration_callable':
+            code = self.compile_callable(node)
+            self.emit(MAKE_FUNCTION, self.const_index(code))
+            self.emit(STORE_FUNC, self.name_index(node.name))
+
+        elif t == 'call_callable':
+            self.emit(LOAD_FUNC, self.name_index(node.name))
+            self.compile_arguments(node)
+            self.emit(POP_TOP)
+
+        elif t == 'return':
+            if node.expression is None:
+                self.emit(LOAD_CONST, self.const_index(None))
+            else:
+                self.compile_expression(node.expression)
+            self.unwind_blocks(0)
+            self.emit(RETURN_VALUE)
+
+        elif t == 'try':
+            self.compile_try(node)
+
+        elif t == 'if':
+            self.compile_expression(node.condition)
+            to_else = self.emit(POP_JUMP_IF_FALSE)
+            self.compile_block(node.body)
+            if node.orelse:
+                to_end = self.emit(JUMP)
+                self.patch(to_else)
+                self.compile_block(node.orelse)
+                self.patch(to_end)
+            else:
+                self.patch(to_else)
+
+        elif t == 'while':
+            start = self.here()
+            self.compile_expression(node.condition)
+            to_end = self.emit(POP_JUMP_IF_FALSE)
+            loop = ('loop', [], [])
+            self.blocks.append(loop)
+            self.compile_block(node.body)
+            self.blocks.pop()
+            self.emit(JUMP, start)
+            self.patch(to_end)
+            self.patch_loop(loop, start)
+
+        elif t == 'for':
+            self.compile_statement(node.init)
+            start = self.here()
+            self.compile_expression(node.condition)
+            to_end = self.emit(POP_JUMP_IF_FALSE)
+            loop = ('loop', [], [])
+            self.blocks.append(loop)
+            self.compile_block(node.body)
+            self.blocks.pop()
+            update = self.here()            # continue nel for salta all'update
+            self.mark(node)
+            self.compile_discarded(node.update)
+            self.emit(JUMP, start)
+            self.patch(to_end)
+            self.patch_loop(loop, update)
+
+        elif t == 'expr_stmt':
+            self.compile_discarded(node.expr)
+
+        elif t in ('break', 'continue'):
+            self.compile_jump(t)
+
+        else:
+            raise RuntimeError(f"Unknown statement type: {t}")
+
+    def compile_try(self, node):
+        final = node.final
+        if final:
+            to_finally = self.emit(SETUP_EXCEPT)
+            self.blocks.append(('finally', final))
+
+        to_handlers = self.emit(SETUP_EXCEPT)
+        self.blocks.append(('except',))
+        self.compile_block(node.body)
+        self.blocks.pop()
+        self.emit(POP_BLOCK)
+        to_end = [self.emit(JUMP)]
+
+        # gestori: in cima allo stack c'è l'eccezione
+        self.patch(to_handlers)
+        self.mark(node)
+        for handler in node.handlers:
+            self.emit(MATCH_EXCEPT, self.const_index(handler.exception))
+            to_next = self.emit(POP_JUMP_IF_FALSE)
+            self.emit(PUSH_SCOPE)
+            self.emit(BIND_EXCEPT, self.name_index(handler.var))
+            self.blocks.append(('scope',))
+            self.compile_block(handler.body)
+            self.blocks.pop()
+            self.emit(POP_SCOPE)
+            self.emit(POP_TOP)
+            to_end.append(self.emit(JUMP))
+            self.patch(to_next)
+            self.mark(node)
+        self.emit(RERAISE)
+
+        for pos in to_end:
+            self.patch(pos)
+
+        if final:
+            self.blocks.pop()
+            self.emit(POP_BLOCK)
+            self.compile_block(final)
+            to_after = self.emit(JUMP)
+            # percorso eccezionale: esegue il finally e rilancia
+            self.patch(to_finally)
+            self.compile_block(final)
+            self.mark(node)
+            self.emit(RERAISE)
+            self.patch(to_after)
+
+    def unwind_blocks(self, depth):
+        """Chiude i blocchi aperti sopra `depth`, eseguendo i finally incontrati."""
+        saved = self.blocks
+        for i in range(len(saved) - 1, depth - 1, -1):
+            block = saved[i]
+            kind = block[0]
+            if kind == 'except':
+                self.emit(POP_BLOCK)
+            elif kind == 'scope':
+                self.emit(POP_SCOPE)
+            elif kind == 'finally':
+                self.emit(POP_BLOCK)
+                # il corpo del finally viene compilato fuori dai blocchi che chiude
+                self.blocks = saved[:i]
+                self.compile_block(block[1])
+                self.blocks = saved
+
+    def compile_jump(self, kind):
+        for i in range(len(self.blocks) - 1, -1, -1):
+            block = self.blocks[i]
+            if block[0] == 'loop':
+                break
+        else:
+            raise RuntimeError(f"'{kind}' outside loop")
+        self.unwind_blocks(i + 1)
+        jumps = block[1] if kind == 'break' else block[2]
+        jumps.append(self.emit(JUMP))
+
+    def patch_loop(self, loop, continue_target):
+        _, breaks, continues = loop
+        for pos in breaks:
+            self.patch(pos)
+        for pos in continues:
+            self.patch(pos, continue_target)
+
+    # ——— Expressions ———
+
+    def compile_discarded(self, node):
+        """Compila un'espressione il cui valore non viene usato."""
+        if node.type == 'unary_op' and node.op in UNARY_STMT_OPS:
+            self.emit(UNARY_STMT_OPS[node.op], self.name_index(node.target))
+        else:
+            self.compile_expression(node)
+            self.emit(POP_TOP)
+
+    def compile_expression(self, node):
+        t = node.type
+
+        if t == 'literal':
+            self.emit(LOAD_CONST, self.const_index(node.value))
+
+        elif t == 'identifier':
+            self.emit(LOAD_NAME, self.name_index(node.name))
+
+        elif t in ('logic', 'binary_op'):
+            if node.op not in BINARY_OPS:
+                raise RuntimeError(f"Unknown binary operator {node.op}")
+            self.compile_expression(node.left)
+            self.compile_expression(node.right)
+            self.emit(BINARY_OP, BINARY_OPS.index(node.op))
+
+        elif t == 'unary_logic':
+            self.compile_expression(node.expr)
+            self.emit(UNARY_NOT)
+
+        elif t == 'unary_op':
+            if node.op not in UNARY_OPS:
+                raise RuntimeError(f"Unknown unary op {node.op}")
+            self.emit(UNARY_OPS[node.op], self.name_index(node.target))
+
+        elif t == 'call_callable':
+            name_node = node.name
+            if name_node.type == 'identifier':
+                self.emit(LOAD_FUNC, self.name_index(name_node.name))
+            elif name_node.type == 'get_attr':
+                self.compile_expression(name_node.object)
+                self.emit(LOAD_ATTR, self.name_index(name_node.attr))
+            else:
+                raise RuntimeError(f"Invalid function name: {name_node}")
+            self.compile_arguments(node)
+
+        elif t == 'get_attr':
+            self.compile_expression(node.object)
+            self.emit(LOAD_ATTR, self.name_index(node.attr))
+
+        else:
+            raise RuntimeError(f"Unknown expression type {t}")
+
+
+    def compile_arguments(self, node):
+        """Argomenti di una chiamata, con il chiamato già sullo stack, e l'istruzione CALL/CALL_KW."""
+        for arg in node.args:
+            self.compile_expression(arg)
+        kwargs = node.kwargs
+        if kwargs:
+            for val in kwargs.values():
+                self.compile_expression(val)
+            self.emit(LOAD_CONST, self.const_index(tuple(kwargs)))
+            self.emit(CALL_KW, len(node.args) + len(kwargs))
+        else:
+            self.emit(CALL, len(node.args))
+
+
+# ——— Disassembler ———
+
+def disassemble(co, recursive=True):
+    """Restituisce il listato leggibile di un CodeObject (e dei callable che contiene)."""
+    lines = [f"Disassembly of {co.name}" + (f"({', '.join(co.params)})" if co.params else '') + ":"]
+    targets = {co.code[i + 1] for i in range(0, len(co.code), 2) if co.code[i] in JUMP_OPS}
+    for pc in range(0, len(co.code), 2):
+        op, arg = co.code[pc], co.code[pc + 1]
+        marker = '>>' if pc in targets else '  '
+        text = f"{marker} {pc:4d} {OPNAMES[op]:<18}"
+        if op in JUMP_OPS:
+            text += f"{arg:4d}"
+        elif op in NAME_OPS:
+            text += f"{arg:4d} ({co.names[arg]})"
+        elif op in CONST_OPS:
+            const = co.consts[arg]
+            if isinstance(const, Node):
+                shown = const.type
+            else:
+                shown = repr(const)
+            text += f"{arg:4d} ({shown})"
+        elif op == BINARY_OP:
+            text += f"{arg:4d} ({BINARY_OPS[arg]})"
+        elif op in (CALL, CALL_KW):
+            text += f"{arg:4d}"
+        lines.append(text.rstrip())
+    if recursive:
+        for const in co.consts:
+            if isinstance(const, CodeObject):
+                lines.append('')
+                lines.append(disassemble(const))
+    return '\n'.join(lines)
+
+
+def _find_code(co, name):
+    if co.name == name:
+        return co
+    for const in co.consts:
+        if isinstance(const, CodeObject):
+            found = _find_code(const, name)
+            if found is not None:
+                return found
+    return None
+
+
+if __name__ == '__main__':
+    # uso: python -m chiron_runtime.compiler <file.chy> [callable]
+    import sys
+    from chiron_runtime.lexer import Lexer
+    from chiron_runtime.parser import Parser
+
+    with open(sys.argv[1]) as f:
+        source = f.read()
+    module = Compiler().compile_module(Parser(Lexer(source).tokenize()).parse())
+    if len(sys.argv) > 2:
+        target = _find_code(module, sys.argv[2])
+        if target is None:
+            print(f"Callable '{sys.argv[2]}' non trovato")
+            sys.exit(1)
+        print(disassemble(target, recursive=False))
+    else:
+        print(disassemble(module))
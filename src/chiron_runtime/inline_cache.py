@@ -0,0 +1,79 @@
+# chiron_runtime/inline_cache.py
+
+"""
+Inline cache monomorfiche per le chiamate di metodo `obj.metodo(...)`.
+
+Ogni sito di chiamata con un get_attr come chiamato ha una MethodCache: ricorda il
+tipo dell'ultimo ricevente e la funzione non legata trovata nel suo MRO, così le
+chiamate successive con lo stesso tipo saltano getattr e la creazione del metodo
+legato e diventano func(obj, *args). La guardia è `type(obj) is tipo` ed è scritta
+nel sito di chiamata stesso: update() viene chiamato solo quando il tipo cambia.
+
+Vengono messi in cache solo i metodi dei tipi built-in senza __dict__ d'istanza
+(list.append, str.upper, ...): i loro attributi non possono essere riassegnati né
+oscurati dall'istanza, quindi la guardia sul tipo basta. Per i moduli (math.sqrt)
+e le catene a.b.c non c'è cache: getattr su un modulo è già una sola lettura del
+suo dizionario, Python non espone la versione del dizionario, e una guardia
+sull'identità del modulo con la rilettura del dizionario non è più veloce di
+getattr. Per questi riceventi il sito resta in cache come esito negativo e costa
+solo il controllo del tipo prima di getattr.
+"""
+
+from types import MethodDescriptorType, WrapperDescriptorType
+
+HEAPTYPE = 1 << 9       # Py_TPFLAGS_HEAPTYPE: classi definite in Python, modificabili
+
+# descrittori che chiamati come desc(obj, *args) equivalgono a obj.metodo(*args)
+UNBOUND_METHODS = (MethodDescriptorType, WrapperDescriptorType)
+
+
+def find_method(tp, attr):
+    """Metodo non legato `attr` del tipo built-in `tp`, o None se non è memorizzabile."""
+    if tp.__flags__ & HEAPTYPE or tp.__dictoffset__:
+        return None
+    for klass in tp.__mro__:
+        namespace = klass.__dict__
+        if attr in namespace:
+            value = namespace[attr]
+            return value if type(value) in UNBOUND_METHODS else None
+    return None
+
+
+class MethodCache:
+    """Cache di un sito di chiamata: tipo del ricevente -> funzione non legata."""
+
+    __slots__ = ('attr', 'type', 'func', 'hits', 'misses')
+
+    def __init__(self, attr):
+        self.attr   = attr
+        self.type   = None
+        self.func   = None
+        self.hits   = 0
+        self.misses = 0
+
+    def update(self, obj):
+        """
+        Miss: il ricevente ha un tipo diverso da quello in cache. Restituisce la nuova
+        `func`, da chiamare come func(obj, *args), o None se va usato getattr; i siti
+        contano in `hits` le chiamate successive che superano la guardia.
+        """
+        self.misses += 1
+        # monomorfica: il nuovo tipo sostituisce il precedente; anche l'esito negativo
+        # (moduli, classi Python) resta in cache, per non ripetere la ricerca a ogni chiamata
+        self.type = type(obj)
+        self.func = find_method(self.type, self.attr)
+        return self.func
+
+
+def format_stats(caches):
+    """Righe di riepilogo per --ic-stats: totali e siti per numero di chiamate."""
+    hits = sum(cache.hits for cache in caches)
+    misses = sum(cache.misses for cache in caches)
+    lines = [f"[inline-cache] siti {len(caches)}, hit {hits}, miss {misses}"]
+    for cache in sorted(caches, key=lambda c: c.hits + c.misses, reverse=True):
+        receiver = cache.type.__name__ if cache.type is not None else '-'
+        if cache.type is not None and cache.func is None:
+            receiver += ' (getattr)'
+        lines.append(f"[inline-cache]   .{cache.attr:<16} {receiver:<20} "
+                     f"hit {cache.hits:>8} miss {cache.misses:>8}")
+    return lines
@@ -0,0 +1,80 @@
+# chiron_runtime/interop.py
+
+"""
+Profilo delle chiamate da Chiron a Python, per --interop-stats.
+
+Il tempo di esecuzione si divide tra codice Python chiamato dal programma
+(builtin, moduli importati, stdlib, metodi dei tipi built-in) e interprete: il
+secondo è il totale meno il primo. Solo con il profilo attivo le chiamate passano
+da InteropProfile.call, che misura ogni funzione nativa; i callable Chiron (che
+il backend riconosce con `is_chiron`) sono chiamati senza misurarli. Il tempo di
+una callback Chiron chiamata da codice nativo resta in quello della funzione
+nativa; le chiamate native annidate contano una volta sola nel totale.
+"""
+
+from time import perf_counter
+
+STDLIB_PREFIX = 'chiron_runtime.stdlib.'
+
+
+def native_name(func):
+    """Nome leggibile di una funzione Python: modulo.nome, o Tipo.metodo per i metodi."""
+    name = getattr(func, '__qualname__', None) or type(func).__name__
+    module = getattr(func, '__module__', None)
+    if module is None or module == 'builtins' or '.' in name:
+        return name
+    if module.startswith(STDLIB_PREFIX):
+        module = module[len(STDLIB_PREFIX):]
+    return f"{module}.{name}"
+
+
+class InteropProfile:
+    """Chiamate e secondi per funzione nativa, più il tempo totale del programma."""
+
+    def __init__(self, is_chiron):
+        self.is_chiron = is_chiron
+        self.functions = {}         # nome -> [chiamate, secondi (annidate comprese)]
+        self.native    = 0.0        # secondi in codice Python, senza contare due volte le annidate
+        self.total     = 0.0
+        self.depth     = 0          # chiamate native in corso
+
+    def run(self, fn, *args):
+        """Esegue fn(*args) misurando il tempo totale."""
+        start = perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self.total += perf_counter() - start
+
+    def call(self, func, args, kwargs=None):
+        if self.is_chiron(func):
+            return func(*args, **kwargs) if kwargs else func(*args)
+        self.depth += 1
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs) if kwargs else func(*args)
+        finally:
+            elapsed = perf_counter() - start
+            self.depth -= 1
+            if not self.depth:
+                self.native += elapsed
+            name = native_name(func)
+            entry = self.functions.get(name)
+            if entry is None:
+                self.functions[name] = [1, elapsed]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+
+    def format_stats(self):
+        """Righe di riepilogo: tempo Python contro interprete, poi le funzioni per tempo."""
+        total, native = self.total, self.native
+        share = native / total * 100 if total else 0.0
+        calls = sum(entry[0] for entry in self.functions.values())
+        lines = [f"[interop] totale {total * 1000:.1f}ms, Python {native * 1000:.1f}ms ({share:.0f}%), "
+                 f"interprete {(total - native) * 1000:.1f}ms, chiamate native {calls}"]
+        for name, (count, elapsed) in sorted(self.functions.items(), key=lambda item: item[1][1],
+                                             reverse=True):
+            lines.append(f"[interop]   {name:<24} chiamate {count:>8} {elapsed * 1000:10.2f}ms "
+                         f"{elapsed / count * 1e6:8.2f}us/chiamata")
+        return lines
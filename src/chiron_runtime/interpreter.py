@@ -1,87 +1,294 @@
 import importlib
+from types import CodeType
+
+from chiron_runtime.locations import locations_of
+from chiron_runtime.resolver import Resolver
+from chiron_runtime.quicken import Quickener, GENERIC
+from chiron_runtime.inline_cache import MethodCache
 
 STDLIB_FOLDER = 'chiron_runtime.stdlib.'
 
 class RuntimeError(Exception):
     pass
 
-class Environment:
-    def __init__(self, parent=None):
-        self.vars    = {}
-        self.funcs   = {}
-        self.modules = {}      # <— moduli importati
-        self.parent  = parent
-
-    def define_var(self, name, value):
-        self.vars[name] = value
+def load_module(mod_name):
+    if mod_name.startswith("std."):
+        # Importa dalla stdlib di Chiron
+        full_py_mod = STDLIB_FOLDER + mod_name
+    else:
+        # Importa come modulo Python puro
+        full_py_mod = mod_name
+
+    try:
+        return importlib.import_module(full_py_mod)
+    except ImportError as e:
+        raise RuntimeError(f"Impossibile importare modulo '{mod_name}': {e}")
+
+# segnaposto per gli slot di un Frame non ancora assegnati (e per i nomi non trovati)
+UNSET = object()
+
+def arity_error(name, expected, given):
+    return RuntimeError(f"{name}() takes {expected} arguments but {given} were given")
+
+class BindingPlan:
+    """
+    Legame tra gli argomenti di una chiamata e gli slot del frame di un callable,
+    calcolato una volta alla sua dichiarazione: i parametri occupano i primi slot,
+    le keyword hanno l'indice del loro slot, i default literal sono già pronti.
+    Gli altri default sono espressioni valutate a ogni chiamata che li usa, nello
+    scope della dichiarazione; `prepare` le converte nella forma del backend e
+    `evaluate` (passata a bind) le esegue.
+    """
+    __slots__ = ('name', 'names', 'n_params', 'n_required', 'n_slots', 'defaults', 'index')
+
+    def __init__(self, name, params, n_slots, prepare=None):
+        self.name       = name
+        self.names      = tuple(param.name for param in params)
+        self.n_params   = len(params)
+        self.n_required = sum(1 for param in params if param.default is None)
+        self.n_slots    = n_slots
+        self.index      = {param_name: i for i, param_name in enumerate(self.names)}
+        defaults = []       # (literal?, valore o espressione) dei parametri dopo gli obbligatori
+        for param in params[self.n_required:]:
+            default = param.default
+            if default.type == 'literal':
+                defaults.append((True, default.value))
+            else:
+                defaults.append((False, prepare(default) if prepare is not None else default))
+        self.defaults = tuple(defaults)
+
+    def bind(self, args, kwargs, evaluate):
+        """Slot iniziali del frame per una chiamata con keyword, default o arità diversa."""
+        name = self.name
+        n = len(args)
+        if n > self.n_params:
+            raise arity_error(name, self.n_params, n)
+        slots = [UNSET] * self.n_slots
+        slots[:n] = args
+        if kwargs:
+            for key, value in kwargs.items():
+                i = self.index.get(key)
+                if i is None:
+                    raise RuntimeError(f"{name}() got an unexpected keyword argument '{key}'")
+                if slots[i] is not UNSET:
+                    raise RuntimeError(f"{name}() got multiple values for argument '{key}'")
+                slots[i] = value
+        missing = [self.names[i] for i in range(n, self.n_required) if slots[i] is UNSET]
+        if missing:
+            raise RuntimeError(f"{name}() missing argument " + ', '.join(f"'{m}'" for m in missing))
+        for i in range(max(n, self.n_required), self.n_params):
+            if slots[i] is UNSET:
+                literal, default = self.defaults[i - self.n_required]
+                slots[i] = default if literal else evaluate(default)
+        return slots
+
+    def bind_given(self, given, rest, kwargs, evaluate):
+        """bind per le funzioni ad arità fissa: in `given` i parametri non passati sono UNSET."""
+        return self.bind(tuple(arg for arg in given if arg is not UNSET) + rest, kwargs, evaluate)
+
+class Scope:
+    """
+    Ricerca per nome comune a Environment e Frame: risale la catena dei parent con
+    un ciclo invece che ricorsivamente. Ogni scope espone solo `_local` e `define_var`.
+    """
+    __slots__ = ()
+
+    def lookup(self, name):
+        env = self
+        while env is not None:
+            value = env._local(name)
+            if value is not UNSET:
+                return value
+            env = env.parent
+        return UNSET
 
     def get_var(self, name):
-        if name in self.vars:
-            return self.vars[name]
-        elif self.parent:
-            return self.parent.get_var(name)
-        else:
+        value = self.lookup(name)
+        if value is UNSET:
             raise RuntimeError(f"Variable '{name}' not defined")
+        return value
+
+    def get_func(self, name):
+        value = self.lookup(name)
+        if value is UNSET:
+            raise RuntimeError(f"Function '{name}' not defined")
+        return value
+
+    def get_module(self, name):
+        value = self.lookup(name)
+        if value is UNSET:
+            raise RuntimeError(f"Module '{name}' not imported")
+        return value
 
     def set_var(self, name, value):
-        if name in self.vars:
-            self.vars[name] = value
-        elif self.parent:
-            self.parent.set_var(name, value)
+        env = self
+        while env is not None:
+            if env._local(name) is not UNSET:
+                env.define_var(name, value)
+                return
+            env = env.parent
+        raise RuntimeError(f"Variable '{name}' not defined")
+
+class Environment(Scope):
+    """
+    Scope a dizionario: codice globale, frame e blocchi except della VM. Il dizionario
+    si crea alla prima definizione, così gli scope che non definiscono nulla non
+    allocano; chi conosce già i nomi (parametri) può passarlo pronto in `vars`.
+    """
+    __slots__ = ('vars', 'parent')
+
+    def __init__(self, parent=None, vars=None):
+        self.vars   = vars      # variabili, funzioni e moduli condividono lo stesso namespace
+        self.parent = parent
+
+    def _local(self, name):
+        vars = self.vars
+        if vars is None:
+            return UNSET
+        return vars.get(name, UNSET)
+
+    def define_var(self, name, value):
+        if self.vars is None:
+            self.vars = {name: value}
         else:
-            raise RuntimeError(f"Variable '{name}' not defined")
+            self.vars[name] = value
 
-    def define_func(self, name, closure):
-        self.funcs[name] = closure
+    define_func = define_var
+    define_module = define_var
+
+    # get_var, get_func e set_var sono i più frequenti nella VM: cercano nei dizionari senza altre chiamate
+    def get_var(self, name):
+        env = self
+        while type(env) is Environment:
+            vars = env.vars
+            if vars is not None and name in vars:
+                return vars[name]
+            env = env.parent
+        if env is None:
+            raise RuntimeError(f"Variable '{name}' not defined")
+        return env.get_var(name)
 
     def get_func(self, name):
-        if name in self.funcs:
-            return self.funcs[name]
-        elif self.parent:
-            return self.parent.get_func(name)
-        else:
+        env = self
+        while type(env) is Environment:
+            vars = env.vars
+            if vars is not None and name in vars:
+                return vars[name]
+            env = env.parent
+        if env is None:
             raise RuntimeError(f"Function '{name}' not defined")
+        return env.get_func(name)
 
-    def define_module(self, name, env):
-        self.modules[name] = env
+    def set_var(self, name, value):
+        env = self
+        while type(env) is Environment:
+            vars = env.vars
+            if vars is not None and name in vars:
+                vars[name] = value
+                return
+            env = env.parent
+        if env is None:
+            raise RuntimeError(f"Variable '{name}' not defined")
+        env.set_var(name, value)
+
+    def lookup(self, name):
+        # catena di soli dizionari (VM): il ciclo legge i dizionari senza chiamare _local
+        env = self
+        while env is not None:
+            if type(env) is not Environment:
+                return env.lookup(name)
+            vars = env.vars
+            if vars is not None and name in vars:
+                return vars[name]
+            env = env.parent
+        return UNSET
+
+class Frame(Scope):
+    """
+    Scope locale a dimensione fissa (callable o gestore except): ogni nome dichiarato
+    ha uno slot assegnato dal Resolver, e gli accessi risolti diventano letture indicizzate.
+    I metodi per nome restano per i percorsi non risolti staticamente (import, import *).
+    """
+    __slots__ = ('slots', 'names', 'parent', 'extra')
+
+    def __init__(self, names, parent, slots=None):
+        # una sola allocazione, già della dimensione giusta; `slots` arriva pronto da BindingPlan.bind
+        self.slots  = slots if slots is not None else [UNSET] * len(names)
+        self.names  = names
+        self.parent = parent
+        self.extra  = None     # nomi definiti dinamicamente, creato solo se serve
+
+    def _local(self, name):
+        if name in self.names:
+            return self.slots[self.names.index(name)]
+        if self.extra is not None:
+            return self.extra.get(name, UNSET)
+        return UNSET
 
-    def get_module(self, name):
-        if name in self.modules:
-            return self.modules[name]
-        elif self.parent:
-            return self.parent.get_module(name)
+    def define_var(self, name, value):
+        if name in self.names:
+            self.slots[self.names.index(name)] = value
         else:
-            raise RuntimeError(f"Module '{name}' not imported")
-
-class ReturnSignal(Exception):
-    def __init__(self, value):
+            if self.extra is None:
+                self.extra = {}
+            self.extra[name] = value
+
+    define_func = define_var
+    define_module = define_var
+
+class Completion:
+    """
+    Esito di un'istruzione terminata da return, break o continue. Le istruzioni
+    restituiscono None se proseguono normalmente, altrimenti una Completion che
+    blocchi, cicli e callable controllano invece di intercettare eccezioni.
+    """
+    __slots__ = ('kind', 'value')
+
+    def __init__(self, kind, value=None):
+        self.kind  = kind
         self.value = value
 
-class BreakSignal(Exception): pass
+    def __repr__(self):
+        return f"Completion({self.kind!r}, {self.value!r})"
 
-class ContinueSignal(Exception): pass
+BREAK    = Completion('break')
+CONTINUE = Completion('continue')
 
 
 class Interpreter:
     def __init__(self, devMode=False):
-        self.global_env = Environment()
+        self.global_env = Environment(vars={})    # i backend leggono il dizionario globale direttamente
         self.loaded_modules = {}  # <— inizializza qui, una volta sola
+        self.quickener = Quickener(self, UNSET)
+        self.call_caches = []     # MethodCache dei siti di chiamata creati da questo interprete
+        self.locations = None     # SourceMap del programma in esecuzione, per i messaggi d'errore
+        self.interop = None       # InteropProfile con --interop-stats: le chiamate passano da lì
 
         self.devMode = devMode
 
     def interpret(self, ast):
+        self.locations = locations_of(ast)
+        try:
+            self.run_program(ast)
+        except Exception as e:
+            # gli errori risalgono senza essere avvolti: il messaggio con la
+            # posizione .chy si costruisce una volta sola, qui
+            raise RuntimeError(self.format_error(e)) from e
+
+    def run_program(self, ast):
         entry = None
+        Resolver().resolve(ast)
 
         # 1. Prima esegue tutti gli import
         for stmt in ast:
-            if stmt['type'] in ('import', 'from_import'):
+            if stmt.type in ('import', 'from_import'):
                 self.exec_statement(stmt, self.global_env)
 
         # 2. Poi registra tutte le funzioni
         for stmt in ast:
-            if stmt['type'] == 'declaration_callable':
+            if stmt.type == 'declaration_callable':
                 self.exec_statement(stmt, self.global_env)
-                if stmt['name'] == 'main':
+                if stmt.name == 'main':
                     entry = stmt
 
         # 3. Infine, o esegue main() o il codice globale
@@ -89,203 +296,207 @@ class Interpreter:
             self.global_env.get_func('main')()
         else:
             for stmt in ast:
-                if stmt['type'] not in ('declaration_callable', 'import', 'from_import'):
-                    self.exec_statement(stmt, self.global_env)
+                if stmt.type not in ('declaration_callable', 'import', 'from_import'):
+                    # un return nel codice globale lo termina
+                    if self.exec_statement(stmt, self.global_env) is not None:
+                        break
 
         if self.devMode: self.dump_env()
 
-    def safe_execute(self, node, env):
-        try:
-            return self.exec_statement(node, env)
-        except Exception as e:
-            line = node.get('line', '?')
-            col = node.get('col', '?')
-            raise RuntimeError(f"ChironError at line {line}, col {col}: {e}")
+    def exec_body(self, stmts, env):
+        """Esegue il corpo di if/while/for; restituisce la prima Completion, o None."""
+        for stmt in stmts:
+            status = self.exec_statement(stmt, env)
+            if status is not None:
+                return status
+        return None
 
     def exec_statement(self, node, env):
-        t = node['type']
+        """Esegue un'istruzione; restituisce None o la Completion di return/break/continue."""
+        t = node.type
 
         if t == 'import':
-            for module_name in node['modules']:
-                if module_name[0].startswith("std."):
-                    # Importa dalla stdlib di Chiron
-                    full_py_mod = 'chiron_runtime.stdlib.' + module_name[0]
-                else:
-                    # Importa come modulo Python puro
-                    full_py_mod = module_name[0]
-
-                try:
-                    module = importlib.import_module(full_py_mod)
-                except ImportError as e:
-                    raise RuntimeError(f"Impossibile importare modulo '{module_name}': {e}")
-
-                alias = module_name[1]
-                env.define_var(alias, module)
+            self._exec_import(node, env)
 
         elif t == 'from_import':
-            mod_name = node['module']
-            if mod_name.startswith("std."):
-                full_py_mod = 'chiron_runtime.stdlib.' + mod_name
-
-            else:
-                full_py_mod = mod_name
-
-            try:
-                module = importlib.import_module(full_py_mod)
-            except ImportError as e:
-                raise RuntimeError(f"Impossibile importare modulo '{mod_name}': {e}")
-
-            for item in node['names']:
-                if isinstance(item, tuple):
-                    name, alias = item
-
-                else:
-
-                    name = item
-                    alias = name
-
-                if name == '*':
-                    # importa tutto ciò che non è privato
-                    for attr in dir(module):
-                        if not attr.startswith("_"):
-                            obj = getattr(module, attr)
-                            if callable(obj):
-                                env.define_func(attr, obj)
-                            else:
-                                env.define_var(attr, obj)
-
-                else:
-                    if not hasattr(module, name):
-                        raise RuntimeError(f"Il modulo '{mod_name}' non ha attributo '{name}'")
-
-                    obj = getattr(module, name)
-                    if callable(obj):
-                        env.define_func(alias, obj)
-
-                    else:
-                        env.define_var(alias, obj)
+            self._exec_from_import(node, env)
 
         elif t == 'declaration':
-            val = self.eval_expression(node['value'], env)
-            env.define_var(node['name'], val)
+            val = self.eval_expression(node.value, env)
+            if node.slot is None:
+                env.define_var(node.name, val)
+            else:
+                env.slots[node.slot] = val
 
         elif t == 'declaration_callable':
-            def func(*args):
-                local_env = Environment(env)
-                for i, param in enumerate(node['params']):
-                    local_env.define_var(param['name'], args[i])
-                try:
-                    for stmt in node.get('body', []):
-                        result = self.exec_statement(stmt, local_env)
-                        if isinstance(result, ReturnSignal):
-                            return result.value
-                except ReturnSignal as rs:
-                    return rs.value
-
-            env.define_func(node['name'], func)
+            names = node.locals
+            plan = BindingPlan(node.name, node.params, len(names))
+            n_params = plan.n_params
+            # senza altri nomi locali gli argomenti sono già tutti gli slot del frame
+            exact = n_params == len(names)
+            evaluate = lambda default: self.eval_expression(default, env)
+            pad = [UNSET] * (len(names) - n_params)
+            # senza default, uno o due parametri (chiavi, predicati, callback di map):
+            # la chiamata posizionale esatta riempie il frame senza tuple né controlli
+            # di arità; keyword e arità diverse passano dal piano come nella forma generale
+            if plan.n_required == n_params == 1:
+                def func(a=UNSET, /, *rest, **kwargs):
+                    if kwargs or rest or a is UNSET:
+                        local_env = Frame(names, env, plan.bind_given((a,), rest, kwargs, evaluate))
+                    else:
+                        local_env = Frame(names, env, [a, *pad])
+                    for stmt in node.body:
+                        status = self.exec_statement(stmt, local_env)
+                        if status is not None:
+                            return status.value
+            elif plan.n_required == n_params == 2:
+                def func(a=UNSET, b=UNSET, /, *rest, **kwargs):
+                    if kwargs or rest or b is UNSET:
+                        local_env = Frame(names, env, plan.bind_given((a, b), rest, kwargs, evaluate))
+                    else:
+                        local_env = Frame(names, env, [a, b, *pad])
+                    for stmt in node.body:
+                        status = self.exec_statement(stmt, local_env)
+                        if status is not None:
+                            return status.value
+            else:
+                def func(*args, **kwargs):
+                    if kwargs or len(args) != n_params:
+                        local_env = Frame(names, env, plan.bind(args, kwargs, evaluate))
+                    elif exact:
+                        local_env = Frame(names, env, list(args))
+                    else:
+                        local_env = Frame(names, env)
+                        # i parametri occupano i primi slot: copiati in un colpo solo
+                        local_env.slots[:n_params] = args
+                    for stmt in node.body:
+                        status = self.exec_statement(stmt, local_env)
+                        if status is not None:
+                            return status.value
+
+            if node.slot is None:
+                env.define_func(node.name, func)
+            else:
+                env.slots[node.slot] = func
 
         elif t == 'call_callable':
-            func = env.get_func(node['name'])
-            args = [self.eval_expression(arg, env) for arg in node['args']]
-            return func(*args)
+            func = self.load_name(node, node.name, env, 'Function')
+            self.call(func, node, env)
 
         elif t == 'return':
-            value = self.eval_expression(node['expression'], env)
-            raise ReturnSignal(value)
+            if node.expression is None:
+                return Completion('return')
+            return Completion('return', self.eval_expression(node.expression, env))
 
         elif t == 'try':
+            status = None
             try:
-                for stmt in node['body']:
-                    self.exec_statement(stmt, env)
+                for stmt in node.body:
+                    status = self.exec_statement(stmt, env)
+                    if status is not None:
+                        break
             except Exception as e:
-                handled = False
-                for handler in node.get('handlers', []):
-                    if handler['exception'] in (type(e).__name__, 'Exception'):
-                        local_env = Environment(env)
-                        local_env.define_var(handler['var'], str(e))  # o l'oggetto eccezione stesso
-                        for stmt in handler['body']:
-                            self.exec_statement(stmt, local_env)
-                        handled = True
+                for handler in node.handlers:
+                    if handler.exception in (type(e).__name__, 'Exception'):
+                        local_env = Frame(handler.locals, env)
+                        local_env.slots[0] = str(e)  # o l'oggetto eccezione stesso
+                        for stmt in handler.body:
+                            status = self.exec_statement(stmt, local_env)
+                            if status is not None:
+                                break
                         break
-                if not handled:
+                else:
                     raise e
             finally:
-                for stmt in node.get('finally', []):
-                    self.exec_statement(stmt, env)
+                for stmt in node.final or ():
+                    # come in Python, un return nel finally prevale
+                    final_status = self.exec_statement(stmt, env)
+                    if final_status is not None:
+                        status = final_status
+                        break
+            return status
 
         elif t == 'if':
-            condition = self.eval_expression(node['condition'], env)
+            condition = self.eval_expression(node.condition, env)
             if condition:
-                for stmt in node['body']:
-                    self.safe_execute(stmt, env)
-            elif node['else']:
-                for stmt in node['else']:
-                    self.safe_execute(stmt, env)
+                return self.exec_body(node.body, env)
+            elif node.orelse:
+                return self.exec_body(node.orelse, env)
 
         elif t == 'while':
-            while self.eval_expression(node['condition'], env):
-                try:
-                    for stmt in node['body']:
-                        self.safe_execute(stmt, env)
-                except BreakSignal:
-                    break
-                except ContinueSignal:
-                    continue
+            while self.eval_expression(node.condition, env):
+                status = self.exec_body(node.body, env)
+                if status is not None and status is not CONTINUE:
+                    return None if status is BREAK else status
 
         elif t == 'for':
-            self.exec_statement(node['init'], env)
-            while self.eval_expression(node['condition'], env):
-                try:
-                    for stmt in node['body']:
-                        self.safe_execute(stmt, env)
-                except BreakSignal:
-                    break
-                except ContinueSignal:
-                    pass
-                self.exec_statement({'type': 'expr_stmt', 'expr': node['update']}, env)
+            self.exec_statement(node.init, env)
+            if node.counted:
+                status = self.exec_counted_for(node, env)
+                if status is not False:
+                    return status
+            while self.eval_expression(node.condition, env):
+                status = self.exec_body(node.body, env)
+                if status is not None and status is not CONTINUE:
+                    return None if status is BREAK else status
+                self.eval_expression(node.update, env)
 
         elif t == 'expr_stmt':
             # espressione standalone terminata da ';'
-            self.eval_expression(node['expr'], env)
-            return None
+            self.eval_expression(node.expr, env)
 
         elif t == 'break':
-            raise BreakSignal()
+            return BREAK
 
         elif t == 'continue':
-            raise ContinueSignal()
+            return CONTINUE
 
 
         else:
             raise RuntimeError(f"Unknown statement type: {t}")
 
     def eval_expression(self, node, env):
-        t = node['type']
+        t = node.type
 
         if t == 'literal':
-            return node['value']
+            return node.value
 
         elif t == 'identifier':
-            return env.get_var(node['name'])
+            if node.depth == 0:
+                value = env.slots[node.slot]
+                if value is not UNSET:
+                    return value
+            return self.load_name(node, node.name, env)
 
         elif t == 'logic':
-            left = self.eval_expression(node['left'], env)
-            right = self.eval_expression(node['right'], env)
-
-            if node['op'] == 'and':
+            if node.quick is not None:
+                return node.quick(self, env)
+            left = self.eval_expression(node.left, env)
+            right = self.eval_expression(node.right, env)
+            if node.seen is not GENERIC:
+                self.quickener.observe(node, (type(left), type(right)))
+
+            if node.op == 'and':
                 return left and right
             else:  # 'or'
                 return left or right
 
         elif t == 'unary_logic':
-            val = self.eval_expression(node['expr'], env)
+            val = self.eval_expression(node.expr, env)
             # 'not' ha sempre booleana semantica
             return not val
 
         elif t == 'binary_op':
-            left = self.eval_expression(node['left'], env)
-            right = self.eval_expression(node['right'], env)
-            op = node['op']
+            if node.quick is not None:
+                return node.quick(self, env)
+            if node.spec is not None and node.seen is None:
+                # tipi noti dal pass type-specialize: si specializza senza osservare
+                return self.quickener.specialize(node)(self, env)
+            left = self.eval_expression(node.left, env)
+            right = self.eval_expression(node.right, env)
+            if node.seen is not GENERIC:
+                self.quickener.observe(node, (type(left), type(right)))
+            op = node.op
             if op == '+':   return left + right
             if op == '-':   return left - right
             if op == '*':   return left * right
@@ -300,55 +511,278 @@ class Interpreter:
             raise RuntimeError(f"Unknown binary operator {op}")
 
         elif t == 'unary_op':
-            expr = node['expr']
-            name = expr.get('name')
-            if node['op'] == '++_pre':
-                v = env.get_var(name) + 1
-                env.set_var(name, v)
-                return v
-            if node['op'] == '--_pre':
-                v = env.get_var(name) - 1
-                env.set_var(name, v)
-                return v
-            if node['op'] == '++_post':
-                old = env.get_var(name)
-                env.set_var(name, old + 1)
-                return old
-            if node['op'] == '--_post':
-                old = env.get_var(name)
-                env.set_var(name, old - 1)
-                return old
-            raise RuntimeError(f"Unknown unary op {node['op']}")
+            if node.quick is not None:
+                return node.quick(self, env)
+            name = node.target
+            op = node.op
+            if op == '++_pre' or op == '++_post':
+                old = self.step_name(node, name, env, 1)
+                result = old + 1 if op == '++_pre' else old
+            elif op == '--_pre' or op == '--_post':
+                old = self.step_name(node, name, env, -1)
+                result = old - 1 if op == '--_pre' else old
+            else:
+                raise RuntimeError(f"Unknown unary op {op}")
+            if node.seen is not GENERIC:
+                self.quickener.observe(node, type(old))
+            return result
 
         elif t == 'call_callable':
-            name_node = node['name']
-            if name_node['type'] == 'identifier':
-                func = env.get_func(name_node['name'])
-            elif name_node['type'] == 'get_attr':
-                obj = self.eval_expression(name_node['object'], env)
-                func = getattr(obj, name_node['attr'])
+            name_node = node.name
+            method = None
+            if name_node.type == 'identifier':
+                func = self.load_name(node, name_node.name, env, 'Function')
+            elif name_node.type == 'get_attr':
+                obj = self.eval_expression(name_node.object, env)
+                cache = node.cache
+                if cache is None:
+                    cache = node.cache = MethodCache(name_node.attr)
+                    self.call_caches.append(cache)
+                if type(obj) is cache.type:
+                    method = cache.func
+                    if method is not None:
+                        cache.hits += 1
+                else:
+                    method = cache.update(obj)
+                if method is None:
+                    func = getattr(obj, name_node.attr)
             else:
                 raise RuntimeError(f"Invalid function name: {name_node}")
 
-            pos_args = [self.eval_expression(arg, env) for arg in node['args']]
-            kw_args = {key: self.eval_expression(val, env) for key, val in node.get('kwargs', {}).items()}
-            return func(*pos_args, **kw_args)
+            if method is not None:
+                if self.interop is not None:
+                    # il profilo misura il metodo legato, come ogni altra funzione nativa
+                    return self.call(getattr(obj, name_node.attr), node, env)
+                args = node.args
+                if node.kwargs:
+                    kw_args = {key: self.eval_expression(val, env) for key, val in node.kwargs.items()}
+                    return method(obj, *[self.eval_expression(arg, env) for arg in args], **kw_args)
+                if len(args) == 1:
+                    return method(obj, self.eval_expression(args[0], env))
+                return method(obj, *[self.eval_expression(arg, env) for arg in args])
+            return self.call(func, node, env)
+
+        elif t == 'get_attr':
+            return getattr(self.eval_expression(node.object, env), node.attr)
 
         else:
             raise RuntimeError(f"Unknown expression type {t}")
 
+    def exec_counted_for(self, node, env):
+        """
+        Ciclo marcato dal pass counted-loops, già inizializzato: il contatore scorre un
+        range() e viene scritto nell'ambiente a ogni giro. Restituisce l'esito del ciclo
+        (None o la Completion di un return), oppure False, senza eseguire nulla, se inizio
+        o fine non sono interi (si usa il ciclo generico).
+        """
+        init, cond = node.init, node.condition
+        # il contatore sta in uno slot del frame o, nel codice globale, nel dizionario
+        if init.slot is None:
+            slots, slot = env.vars, init.name
+        else:
+            slots, slot = env.slots, init.slot
+        start = slots[slot]
+        stop = self.eval_expression(cond.right, env)
+        if type(start) is not int or type(stop) is not int:
+            return False
+        if cond.op == '<=':
+            stop += 1
+        for i in range(start, stop):
+            slots[slot] = i
+            status = self.exec_body(node.body, env)
+            if status is not None and status is not CONTINUE:
+                return None if status is BREAK else status
+        # valore finale come nel ciclo generico: il primo che rende falsa la condizione
+        slots[slot] = max(start, stop)
+        return None
+
+    # ——— Errori ———
+
+    def format_error(self, error):
+        """
+        Messaggio di un errore con la posizione dell'istruzione che lo ha sollevato e,
+        se è avvenuto dentro un callable, il traceback .chy delle chiamate.
+        """
+        calls = self.error_calls(error)
+        lines = []
+        for name, node in calls:
+            if node is not None:
+                line, col = self.locations.position(node)
+                lines.append(f"  line {line}, col {col}, in {name}")
+            else:
+                lines.append(f"  in {name}")
+        located = [node for _, node in calls if node is not None]
+        if located:
+            line, col = self.locations.position(located[-1])
+            message = f"ChironError at line {line}, col {col}: {error}"
+        else:
+            message = f"ChironError: {error}"
+        if len(calls) > 1:
+            message += "\nTraceback (.chy, most recent call last):\n" + '\n'.join(collapse_repeats(lines))
+        return message
+
+    def error_calls(self, error):
+        """
+        [callable, ultima istruzione con posizione] per ogni chiamata in corso, dal
+        codice globale a quella che ha sollevato l'errore. Le istruzioni in corso si
+        leggono dai frame di exec_statement rimasti nel traceback Python.
+        """
+        offsets = self.locations.offsets
+        calls = [['<global>', None]]
+        tb = error.__traceback__
+        while tb is not None:
+            frame = tb.tb_frame
+            if frame.f_code is EXEC_STATEMENT:
+                node = frame.f_locals['node']
+                if node in offsets:
+                    calls[-1][1] = node
+            elif id(frame.f_code) in CALLABLE_BODIES:
+                calls.append([frame.f_locals['node'].name, None])
+            tb = tb.tb_next
+        return calls
+
+    # ——— Nomi risolti dal Resolver ———
+
+    def call(self, func, node, env):
+        """Chiama func con gli argomenti del nodo: senza keyword le arità piccole non creano liste."""
+        args = node.args
+        if node.kwargs or self.interop is not None:
+            pos_args = [self.eval_expression(arg, env) for arg in args]
+            kw_args = {key: self.eval_expression(val, env) for key, val in node.kwargs.items()}
+            if self.interop is not None:
+                return self.interop.call(func, pos_args, kw_args)
+            return func(*pos_args, **kw_args)
+        n = len(args)
+        if n == 0:
+            return func()
+        if n == 1:
+            return func(self.eval_expression(args[0], env))
+        if n == 2:
+            return func(self.eval_expression(args[0], env), self.eval_expression(args[1], env))
+        return func(*[self.eval_expression(arg, env) for arg in args])
+
+    def is_chiron_callable(self, func):
+        """Vero per i callable dichiarati nel programma, che il profilo interop non misura."""
+        return id(getattr(func, '__code__', None)) in CALLABLE_BODIES
+
+    def load_name(self, node, name, env, kind='Variable'):
+        depth = node.depth
+        if depth is None:
+            scope = self.global_env.vars
+            if name in scope:
+                return scope[name]
+            raise RuntimeError(f"{kind} '{name}' not defined")
+        if depth >= 0:
+            while depth:
+                env = env.parent
+                depth -= 1
+            value = env.slots[node.slot]
+            if value is not UNSET:
+                return value
+            # slot non ancora assegnato: il nome si riferisce a uno scope esterno
+            env = env.parent
+        return env.get_func(name) if kind == 'Function' else env.get_var(name)
+
+    def step_name(self, node, name, env, delta):
+        """Applica ++/-- al nome con un solo attraversamento; restituisce il valore precedente."""
+        depth = node.depth
+        if depth is None:
+            scope = self.global_env.vars
+            if name not in scope:
+                raise RuntimeError(f"Variable '{name}' not defined")
+            old = scope[name]
+            scope[name] = old + delta
+            return old
+        if depth >= 0:
+            while depth:
+                env = env.parent
+                depth -= 1
+            slots = env.slots
+            old = slots[node.slot]
+            if old is not UNSET:
+                slots[node.slot] = old + delta
+                return old
+            env = env.parent
+        old = env.get_var(name)
+        env.set_var(name, old + delta)
+        return old
+
+    def _exec_import(self, node, env):
+        for module_name in node.modules:
+            module = load_module(module_name[0])
+            alias = module_name[1]
+            env.define_var(alias, module)
+
+    def _exec_from_import(self, node, env):
+        mod_name = node.module
+        module = load_module(mod_name)
+
+        for item in node.names:
+            if isinstance(item, tuple):
+                name, alias = item
+
+            else:
+
+                name = item
+                alias = name
+
+            if name == '*':
+                # importa tutto ciò che non è privato
+                for attr in dir(module):
+                    if not attr.startswith("_"):
+                        obj = getattr(module, attr)
+                        if callable(obj):
+                            env.define_func(attr, obj)
+                        else:
+                            env.define_var(attr, obj)
+
+            else:
+                if not hasattr(module, name):
+                    raise RuntimeError(f"Il modulo '{mod_name}' non ha attributo '{name}'")
+
+                obj = getattr(module, name)
+                if callable(obj):
+                    env.define_func(alias, obj)
+
+                else:
+                    env.define_var(alias, obj)
+
     def _interpret_in_env(self, ast, env):
         # versione interna di interpret che usa l'env fornito
+        Resolver().resolve(ast)
         for stmt in ast:
-            if stmt['type']=='declaration_callable':
+            if stmt.type=='declaration_callable':
                 self.exec_statement(stmt, env)
         for stmt in ast:
-            if stmt['type']!='declaration_callable':
+            if stmt.type!='declaration_callable':
                 self.exec_statement(stmt, env)
 
     def dump_env(self):
         print("\n=== Ambiente finale ===")
         for name, val in self.global_env.vars.items():
-            print(f"{name} = {val}")
-        for name in self.global_env.funcs:
-            print(f"Function: {name}()")
\ No newline at end of file
+            if callable(val):
+                print(f"Function: {name}()")
+            else:
+                print(f"{name} = {val}")
+
+
+# codice di exec_statement e dei corpi dei callable (forma generale e ad arità fissa),
+# riconosciuti per identità nei frame del traceback
+EXEC_STATEMENT = Interpreter.exec_statement.__code__
+CALLABLE_BODIES = frozenset(id(const) for const in EXEC_STATEMENT.co_consts
+                            if isinstance(const, CodeType) and const.co_name == 'func')
+
+REPEAT_LIMIT = 3        # righe uguali di fila mostrate prima di riassumerle
+
+
+def collapse_repeats(lines):
+    """Riassume le righe ripetute di un traceback (ricorsione), come fa Python."""
+    out = []
+    count = 0
+    for i, line in enumerate(lines):
+        count = count + 1 if i and line == lines[i - 1] else 1
+        if count <= REPEAT_LIMIT:
+            out.append(line)
+        if count > REPEAT_LIMIT and (i + 1 == len(lines) or lines[i + 1] != line):
+            out.append(f"  [Previous line repeated {count - REPEAT_LIMIT} more times]")
+    return out
@@ -1,4 +1,90 @@
 import re
+import sys
+from array import array
+from bisect import bisect_right
+
+# ——— Token kinds ———
+
+EOF        = 0
+LE         = 1
+GE         = 2
+EQ         = 3
+NE         = 4
+LT         = 5
+GT         = 6
+EQUAL      = 7
+INCREMENT  = 8
+DECREMENT  = 9
+ARROW      = 10
+PLUS       = 11
+MINUS      = 12
+STAR       = 13
+SLASH      = 14
+PERCENT    = 15
+LPAREN     = 16
+RPAREN     = 17
+LBRACKET   = 18
+RBRACKET   = 19
+LBRACE     = 20
+RBRACE     = 21
+COMMA      = 22
+COLON      = 23
+SEMICOLON  = 24
+DOT        = 25
+NUMBER     = 26
+STRING     = 27
+CHAR       = 28
+ID         = 29
+
+# parole chiave: riconosciute dal lexer, ma usabili ancora come nomi dove il parser si aspetta un ID
+KW_IF       = 40
+KW_ELSE     = 41
+KW_WHILE    = 42
+KW_FOR      = 43
+KW_TRY      = 44
+KW_EXCEPT   = 45
+KW_FINALLY  = 46
+KW_AS       = 47
+KW_RETURN   = 48
+KW_IMPORT   = 49
+KW_FROM     = 50
+KW_AND      = 51
+KW_OR       = 52
+KW_NOT      = 53
+# modificatori e tipi che aprono una dichiarazione (intervallo contiguo)
+KW_CONST    = 60
+KW_STATIC   = 61
+KW_GLOBAL   = 62
+KW_LOCAL    = 63
+KW_AUTO     = 64
+KW_INT      = 65
+KW_FLOAT    = 66
+KW_BOOL     = 67
+KW_CHAR     = 68
+KW_STR      = 69
+KW_CALLABLE = 70
+
+FIRST_KEYWORD = KW_IF
+FIRST_DECL, LAST_DECL = KW_CONST, KW_CALLABLE
+FIRST_MODIFIER, LAST_MODIFIER = KW_CONST, KW_LOCAL
+
+KIND_NAMES = {value: name for name, value in globals().items()
+              if name.isupper() and isinstance(value, int)
+              and not name.startswith(('FIRST_', 'LAST_'))}
+
+KEYWORDS = {sys.intern(name[3:].lower()): kind
+            for kind, name in KIND_NAMES.items() if name.startswith('KW_')}
+KEYWORD_TEXT = {kind: text for text, kind in KEYWORDS.items()}
+
+# tipo dei Token mostrati all'utente (messaggi d'errore, iterazione): le parole chiave
+# restano 'ID' come prima che il lexer le distinguesse
+TOKEN_TYPES = {kind: 'ID' if kind >= FIRST_KEYWORD else name for kind, name in KIND_NAMES.items()}
+
+
+def expected_name(kind):
+    """Come indicare il tipo `kind` in "Expected ...": una parola chiave con il suo testo."""
+    return f"'{KEYWORD_TEXT[kind]}'" if kind >= FIRST_KEYWORD else KIND_NAMES[kind]
+
 
 class Token:
     def __init__(self, type_, value, line=0, col=0):
@@ -9,13 +95,202 @@ class Token:
     def __repr__(self):
         return f"Token({self.type!r}, {self.value!r}, line={self.line}, col={self.col})"
 
+
+class LineIndex:
+    """Offset di inizio di ogni riga del sorgente: (riga, colonna) si ricavano con bisect."""
+
+    __slots__ = ('starts',)
+
+    def __init__(self, source):
+        starts = array('I', [0])
+        find = source.find
+        i = find('\n')
+        while i != -1:
+            starts.append(i + 1)
+            i = find('\n', i + 1)
+        self.starts = starts
+
+    def position(self, offset):
+        line = bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
+
+
+class TokenBuffer:
+    """
+    Sequenza di token in forma compatta: tipo in un array('B'), offset nel sorgente
+    in array('I'). Il testo di un token si ricava dal sorgente solo quando serve
+    (value), e così riga e colonna (position). I nomi vengono internati.
+    L'ultimo token è sempre EOF.
+    """
+
+    __slots__ = ('source', 'kinds', 'starts', 'ends', '_lines')
+
+    def __init__(self, source):
+        self.source = source
+        self.kinds  = array('B')
+        self.starts = array('I')
+        self.ends   = array('I')
+        self._lines = None
+
+    @classmethod
+    def from_tokens(cls, tokens):
+        """
+        Costruisce il buffer da oggetti Token (con tipo testuale), per compatibilità.
+        Il sorgente viene ricostruito mettendo ogni token alla sua riga e colonna.
+        """
+        parts = []
+        offset = 0
+        line = col = 1
+        buf = cls('')
+        for tok in tokens:
+            if tok.type == 'EOF':
+                break
+            if tok.line > line:
+                parts.append('\n' * (tok.line - line))
+                offset += tok.line - line
+                line, col = tok.line, 1
+            gap = max(tok.col - col, 0)      # i testi sono letti per offset: possono anche toccarsi
+            parts.append(' ' * gap)
+            offset += gap
+            kind = KEYWORDS.get(tok.value, ID) if tok.type == 'ID' else KINDS_BY_NAME[tok.type]
+            buf.append(kind, offset, offset + len(tok.value))
+            parts.append(tok.value)
+            offset += len(tok.value)
+            col += gap + len(tok.value)
+        buf.source = ''.join(parts)
+        buf.append(EOF, offset, offset)
+        return buf
+
+    def append(self, kind, start, end):
+        self.kinds.append(kind)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    @property
+    def lines(self):
+        """Indice delle righe, costruito alla prima richiesta di una posizione."""
+        if self._lines is None:
+            self._lines = LineIndex(self.source)
+        return self._lines
+
+    def offset(self, i):
+        """Offset nel sorgente del primo carattere del token i."""
+        return self.starts[i]
+
+    def position(self, i):
+        """(riga, colonna) del token i, contate da 1."""
+        return self.lines.position(self.starts[i])
+
+    def value(self, i):
+        kind = self.kinds[i]
+        if kind >= FIRST_KEYWORD:
+            return KEYWORD_TEXT[kind]
+        text = self.source[self.starts[i]:self.ends[i]]
+        return sys.intern(text) if kind == ID else text
+
+    def token(self, i):
+        """Token completo in posizione i (messaggi d'errore, debug)."""
+        if i >= len(self.kinds):
+            i = len(self.kinds) - 1
+        kind = self.kinds[i]
+        line, col = self.position(i)
+        return Token(TOKEN_TYPES[kind], self.value(i), line, col)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, i):
+        return self.token(i)
+
+    def __iter__(self):
+        # come il vecchio tokenize(): senza il token EOF finale
+        for i in range(len(self.kinds) - 1):
+            yield self.token(i)
+
+
+class TokenStream:
+    """
+    Token letti pigramente da Lexer.iter_tokens() attraverso un ring buffer di
+    `size` posizioni: il parser vede gli stessi indici assoluti di un TokenBuffer,
+    ma restano in memoria solo gli ultimi token letti e quelli di lookahead.
+    Riga e colonna vengono contate in avanti, senza indice delle righe.
+    """
+
+    __slots__ = ('source', 'kinds', '_tokens', '_ring_kinds', '_ring_starts', '_ring_ends',
+                 '_mask', '_count', '_line', '_line_offset')
+
+    def __init__(self, source, tokens, size=8):
+        assert size & (size - 1) == 0, "size deve essere una potenza di 2"
+        self.source       = source
+        self.kinds        = self
+        self._tokens      = iter(tokens)
+        self._ring_kinds  = array('B', bytes(size))
+        self._ring_starts = array('I', bytes(4 * size))
+        self._ring_ends   = array('I', bytes(4 * size))
+        self._mask        = size - 1
+        self._count       = 0          # token letti finora
+        self._line        = 1          # riga dell'ultimo offset chiesto a position()
+        self._line_offset = 0
+
+    def _read(self, i):
+        """Legge dal lexer fino al token i compreso e ne restituisce lo slot nel ring."""
+        mask = self._mask
+        if i < self._count - mask:
+            raise IndexError(f"token {i} uscito dal buffer di lookahead")
+        while self._count <= i:
+            slot = self._count & mask
+            token = next(self._tokens, None)
+            if token is None:
+                # dopo la fine il flusso ripete EOF
+                end = len(self.source)
+                token = (EOF, end, end)
+            self._ring_kinds[slot], self._ring_starts[slot], self._ring_ends[slot] = token
+            self._count += 1
+        return i & mask
+
+    def kind(self, i):
+        if self._count - self._mask <= i < self._count:
+            return self._ring_kinds[i & self._mask]
+        return self._ring_kinds[self._read(i)]
+
+    # il parser indicizza `tokens.kinds[i]`: per lo stream la vista è lo stream stesso
+    __getitem__ = kind
+
+    def value(self, i):
+        slot = self._read(i)
+        kind = self._ring_kinds[slot]
+        if kind >= FIRST_KEYWORD:
+            return KEYWORD_TEXT[kind]
+        text = self.source[self._ring_starts[slot]:self._ring_ends[slot]]
+        return sys.intern(text) if kind == ID else text
+
+    def offset(self, i):
+        return self._ring_starts[self._read(i)]
+
+    def position(self, i):
+        offset = self._ring_starts[self._read(i)]
+        source = self.source
+        if offset < self._line_offset:
+            self._line, self._line_offset = 1, 0
+        self._line += source.count('\n', self._line_offset, offset)
+        self._line_offset = offset
+        return self._line, offset - source.rfind('\n', 0, offset)
+
+    def token(self, i):
+        kind = self.kind(i)
+        line, col = self.position(i)
+        return Token(TOKEN_TYPES[kind], self.value(i), line, col)
+
+
+KINDS_BY_NAME = {name: kind for kind, name in KIND_NAMES.items()}
+
+
 class Lexer:
     def __init__(self, code):
         self.code = code
         self.token_specification = [
             ('COMMENT_MULTILINE_START', r'//'),
             ('COMMENT_MULTILINE_END', r'\.//'),
-            ('COMMENT_SINGLELINE', r'#.*'),
             ('LE',         r'<='),
             ('GE',         r'>='),
             ('EQ',         r'=='),
@@ -45,43 +320,57 @@ class Lexer:
             ('STRING',      r'"([^"\\]|\\.)*"'),
             ('CHAR',        r"'([^'\\]|\\.)'"),
             ('ID',          r'[A-Za-z_][A-Za-z0-9_]*'),
-            ('NEWLINE',     r'\n'),
-            ('SKIP',        r'[ \t]+'),
             ('MISMATCH',    r'.'),
 
         ]
+        # spazi, a capo e commenti '#' vengono saltati dentro la stessa match del token;
+        # lookahead + backreference rendono il salto atomico (niente backtracking dentro i commenti)
+        self.skip_pattern = r'(?=(?P<SKIP>(?:[ \t\n]+|#[^\n]*)*))(?P=SKIP)'
         self.master_pat = re.compile(
-            '|'.join(f'(?P<{name}>{pat})' for name,pat in self.token_specification)
+            self.skip_pattern + '(?:'
+            + '|'.join(f'(?P<{name}>{pat})' for name,pat in self.token_specification)
+            + ')'
         )
 
     def tokenize(self):
-        line = 1
-        col = 1
-        in_multiline_comment = False
-        for mo in self.master_pat.finditer(self.code):
+        """Tutto il flusso di token in un TokenBuffer."""
+        buf = TokenBuffer(self.code)
+        kinds, starts, ends = buf.kinds, buf.starts, buf.ends
+        for kind, start, end in self.iter_tokens():
+            kinds.append(kind)
+            starts.append(start)
+            ends.append(end)
+        buf.append(EOF, len(self.code), len(self.code))
+        return buf
+
+    def stream(self, size=8):
+        """Token letti su richiesta del parser, con un ring buffer di `size` posizioni."""
+        return TokenStream(self.code, self.iter_tokens(), size)
+
+    def iter_tokens(self):
+        """Genera (tipo, inizio, fine) per ogni token, senza il token EOF finale."""
+        code = self.code
+        keywords = KEYWORDS
+        group_kinds = KINDS_BY_NAME
+        match = self.master_pat.match
+        pos = 0
+        while True:
+            mo = match(code, pos)
+            if mo is None:
+                return                  # restano solo spazi o commenti
             kind = mo.lastgroup
-            val = mo.group()
-
-            if in_multiline_comment:
-                if kind == 'COMMENT_MULTILINE_END':
-                    in_multiline_comment = False
-                continue
-
-            if kind == 'COMMENT_MULTILINE_START':
-                in_multiline_comment = True
-                continue
-
-            if kind == 'COMMENT_SINGLELINE':
-                continue
-
-            if kind == 'NEWLINE':
-                line += 1
-                col = 1
-                continue
-            if kind == 'SKIP':
-                col += len(val)
-                continue
-            if kind == 'MISMATCH':
-                raise RuntimeError(f'Unexpected {val!r} at {line}:{col}')
-            yield Token(kind, val, line, col)
-            col += len(val)
+            start, pos = mo.span(kind)
+
+            if kind == 'ID':
+                yield keywords.get(mo.group(kind), ID), start, pos
+            elif kind == 'COMMENT_MULTILINE_START':
+                # salta direttamente al terminatore; se manca, il commento arriva a fine file
+                end = code.find('.//', pos)
+                if end == -1:
+                    return
+                pos = end + 3
+            elif kind == 'MISMATCH' or kind == 'COMMENT_MULTILINE_END':
+                line, col = LineIndex(code).position(start)
+                raise RuntimeError(f'Unexpected {mo.group(kind)!r} at {line}:{col}')
+            else:
+                yield group_kinds[kind], start, pos
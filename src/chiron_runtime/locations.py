@@ -0,0 +1,78 @@
+# chiron_runtime/locations.py
+
+"""
+Posizioni nel sorgente delle istruzioni, tenute fuori dai nodi.
+
+Il parser registra per ogni istruzione solo l'offset del suo primo token in una
+SourceMap associata al programma; riga e colonna si calcolano dal sorgente solo
+quando servono (messaggi d'errore, numeri di riga del backend python), con un
+indice delle righe costruito alla prima richiesta.
+"""
+
+from chiron_runtime.lexer import LineIndex
+from chiron_runtime.nodes import Stmt, iter_children
+
+# offset salvato in cache per le istruzioni senza posizione (create dai pass)
+NO_OFFSET = -1
+
+
+class SourceMap:
+    """Tabella nodo -> offset delle istruzioni di un programma, con il suo sorgente."""
+
+    __slots__ = ('source', 'offsets', '_lines')
+
+    def __init__(self, source=''):
+        self.source  = source
+        self.offsets = {}           # istruzione -> offset del primo token (per identità)
+        self._lines  = None
+
+    def record(self, node, offset):
+        self.offsets[node] = offset
+
+    def position(self, node):
+        """(riga, colonna) dell'istruzione contate da 1, o None se non è nota."""
+        offset = self.offsets.get(node)
+        if offset is None:
+            return None
+        if self._lines is None:
+            self._lines = LineIndex(self.source)
+        return self._lines.position(offset)
+
+    # ——— Cache ———
+    # In __chycache__ le posizioni sono una lista di offset, una per istruzione
+    # nell'ordine di visita dell'AST: i nodi ricostruiti da from_dict sono nuovi.
+
+    def dump(self, tree):
+        offsets = self.offsets
+        return [offsets.get(stmt, NO_OFFSET) for stmt in iter_statements(tree)]
+
+    def load(self, tree, offsets):
+        for stmt, offset in zip(iter_statements(tree), offsets):
+            if offset != NO_OFFSET:
+                self.offsets[stmt] = offset
+        return self
+
+
+class Program(list):
+    """Lista delle istruzioni di primo livello prodotta dal parser, con la sua SourceMap."""
+
+    __slots__ = ('locations',)
+
+    def __init__(self, stmts=(), locations=None):
+        super().__init__(stmts)
+        self.locations = locations if locations is not None else SourceMap()
+
+
+def iter_statements(tree):
+    """Istruzioni di un albero in ordine di visita, comprese quelle annidate nei blocchi."""
+    stack = list(reversed(tree))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Stmt):
+            yield node
+        stack.extend(reversed(list(iter_children(node))))
+
+
+def locations_of(tree):
+    """SourceMap di un programma; vuota per le liste di istruzioni costruite a mano."""
+    return getattr(tree, 'locations', None) or SourceMap()
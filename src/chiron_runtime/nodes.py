@@ -0,0 +1,422 @@
+# chiron_runtime/nodes.py
+
+"""
+Nodi dell'AST di Chiron.
+
+Ogni tipo di nodo è una classe con __slots__ e un codice intero `kind`; `type`
+resta il nome testuale usato finora (es. 'binary_op'). Per compatibilità con gli
+strumenti che lavoravano sui dizionari i nodi supportano ancora node['campo'] e
+node.get('campo'), e to_dict()/from_dict() convertono da e verso la vecchia forma.
+"""
+
+# ——— Codici dei nodi ———
+
+EXPR_STMT            = 1
+IF                   = 2
+WHILE                = 3
+FOR                  = 4
+TRY                  = 5
+HANDLER              = 6
+RETURN               = 7
+IMPORT               = 8
+FROM_IMPORT          = 9
+CALL                 = 10
+DECLARATION          = 11
+DECLARATION_CALLABLE = 12
+PARAM                = 13
+BREAK                = 14
+CONTINUE             = 15
+LOGIC                = 16
+UNARY_LOGIC          = 17
+BINARY_OP            = 18
+UNARY_OP             = 19
+LITERAL              = 20
+IDENTIFIER           = 21
+GET_ATTR             = 22
+
+# chiavi dei vecchi dizionari che non possono essere nomi di attributo
+KEY_ALIASES = {'else': 'orelse', 'finally': 'final'}
+
+
+class Node:
+    __slots__ = ()
+
+    kind   = 0
+    type   = ''
+    fields = ()          # campi prodotti dal parser, nell'ordine del costruttore
+    annotations = ()     # attributi scritti dai pass di ottimizzazione, salvati se non None
+
+    # ——— Protocollo dizionario (compatibilità) ———
+
+    def __getitem__(self, key):
+        if key == 'type':
+            return self.type
+        try:
+            return getattr(self, KEY_ALIASES.get(key, key))
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        try:
+            setattr(self, KEY_ALIASES.get(key, key), value)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        return key == 'type' or hasattr(self, KEY_ALIASES.get(key, key))
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        args = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.fields)
+        return f"{self.__class__.__name__}({args})"
+
+    # ——— Conversione ———
+
+    def to_dict(self):
+        """Forma a dizionario usata prima dei nodi tipizzati (solo i campi del parser)."""
+        out = {'type': self.type}
+        for name in self.fields:
+            key = DICT_KEYS.get(name, name)
+            out[key] = _to_plain(getattr(self, name))
+        for name in self.annotations:
+            value = getattr(self, name)
+            if value is not None:
+                out[name] = value
+        return out
+
+
+class Stmt(Node):
+    """Nodo che può comparire come istruzione; la sua posizione è nella SourceMap del programma."""
+    __slots__ = ()
+
+
+def _to_plain(value):
+    if isinstance(value, Node):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_to_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _to_plain(item) for key, item in value.items()}
+    return value
+
+
+# ——— Istruzioni ———
+
+class ExprStmt(Stmt):
+    __slots__ = ('expr',)
+    kind, type, fields = EXPR_STMT, 'expr_stmt', ('expr',)
+
+    def __init__(self, expr):
+        self.expr = expr
+
+
+class If(Stmt):
+    __slots__ = ('condition', 'body', 'orelse')
+    kind, type, fields = IF, 'if', ('condition', 'body', 'orelse')
+
+    def __init__(self, condition, body, orelse=None):
+        self.condition = condition
+        self.body      = body
+        self.orelse    = orelse
+
+
+class While(Stmt):
+    __slots__ = ('condition', 'body')
+    kind, type, fields = WHILE, 'while', ('condition', 'body')
+
+    def __init__(self, condition, body):
+        self.condition = condition
+        self.body      = body
+
+
+class For(Stmt):
+    """`counted` è annotato dal pass counted-loops: il ciclo è for (int i = a; i < n; i:++)."""
+    __slots__ = ('init', 'condition', 'update', 'body', 'counted')
+    kind, type, fields = FOR, 'for', ('init', 'condition', 'update', 'body')
+    annotations = ('counted',)
+
+    def __init__(self, init, condition, update, body):
+        self.init      = init
+        self.condition = condition
+        self.update    = update
+        self.body      = body
+        self.counted   = None
+
+
+class Try(Stmt):
+    __slots__ = ('body', 'handlers', 'final')
+    kind, type, fields = TRY, 'try', ('body', 'handlers', 'final')
+
+    def __init__(self, body, handlers=(), final=None):
+        self.body     = body
+        self.handlers = list(handlers)
+        self.final    = final
+
+
+class Handler(Node):
+    """Clausola 'except Tipo as nome { ... }'; `locals` è annotato dal Resolver."""
+    __slots__ = ('exception', 'var', 'body', 'locals')
+    kind, type, fields = HANDLER, 'handler', ('exception', 'var', 'body')
+
+    def __init__(self, exception, var, body):
+        self.exception = exception
+        self.var       = var
+        self.body      = body
+        self.locals    = None
+
+    def to_dict(self):
+        # i gestori erano dizionari senza 'type'
+        return {'exception': self.exception, 'var': self.var, 'body': _to_plain(self.body)}
+
+
+class Return(Stmt):
+    __slots__ = ('expression',)
+    kind, type, fields = RETURN, 'return', ('expression',)
+
+    def __init__(self, expression=None):
+        self.expression = expression
+
+
+class Import(Stmt):
+    __slots__ = ('modules',)
+    kind, type, fields = IMPORT, 'import', ('modules',)
+
+    def __init__(self, modules):
+        self.modules = modules          # lista di (modulo, alias)
+
+
+class FromImport(Stmt):
+    __slots__ = ('module', 'names')
+    kind, type, fields = FROM_IMPORT, 'from_import', ('module', 'names')
+
+    def __init__(self, module, names):
+        self.module = module
+        self.names  = names
+
+
+class Call(Stmt):
+    """
+    Chiamata. Come istruzione `name` è una stringa; come espressione è il nodo
+    del chiamato (identifier o get_attr). depth/slot sono annotati dal Resolver;
+    `cache` è la MethodCache del tree walker per le chiamate di metodo.
+    """
+    __slots__ = ('name', 'args', 'kwargs', 'depth', 'slot', 'cache')
+    kind, type, fields = CALL, 'call_callable', ('name', 'args', 'kwargs')
+
+    def __init__(self, name, args, kwargs=None):
+        self.name   = name
+        self.args   = args
+        self.kwargs = kwargs if kwargs is not None else {}
+        self.depth  = self.slot = None
+        self.cache  = None
+
+    def to_dict(self):
+        out = super().to_dict()
+        if isinstance(self.name, str) and not self.kwargs:
+            del out['kwargs']           # forma istruzione senza argomenti per nome: dizionario invariato
+        return out
+
+
+class Declaration(Stmt):
+    __slots__ = ('modifiers', 'var_type', 'name', 'value', 'slot')
+    kind, type, fields = DECLARATION, 'declaration', ('modifiers', 'var_type', 'name', 'value')
+
+    def __init__(self, modifiers, var_type, name, value):
+        self.modifiers = modifiers
+        self.var_type  = var_type
+        self.name      = name
+        self.value     = value
+        self.slot      = None
+
+
+class DeclarationCallable(Stmt):
+    __slots__ = ('modifiers', 'name', 'params', 'return_type', 'body', 'slot', 'locals')
+    kind, type = DECLARATION_CALLABLE, 'declaration_callable'
+    fields = ('modifiers', 'name', 'params', 'return_type', 'body')
+
+    def __init__(self, modifiers, name, params, return_type, body=None):
+        self.modifiers   = modifiers
+        self.name        = name
+        self.params      = params
+        self.return_type = return_type
+        self.body        = body
+        self.slot        = None
+        self.locals      = None
+
+
+class Param(Node):
+    """`default`: espressione del valore predefinito, o None se il parametro è obbligatorio."""
+    __slots__ = ('var_type', 'name', 'default')
+    kind, type, fields = PARAM, 'param', ('var_type', 'name', 'default')
+
+    def __init__(self, var_type, name, default=None):
+        self.var_type = var_type
+        self.name     = name
+        self.default  = default
+
+    def to_dict(self):
+        # nel dizionario 'type' era il tipo dichiarato del parametro
+        out = {'type': self.var_type, 'name': self.name}
+        if self.default is not None:
+            out['default'] = self.default.to_dict()
+        return out
+
+
+class Break(Stmt):
+    __slots__ = ()
+    kind, type = BREAK, 'break'
+
+
+class Continue(Stmt):
+    __slots__ = ()
+    kind, type = CONTINUE, 'continue'
+
+
+# ——— Espressioni ———
+
+class Logic(Node):
+    """`quick`/`seen`: stato del quickening del tree walker, mai salvato in cache."""
+    __slots__ = ('op', 'left', 'right', 'quick', 'seen')
+    kind, type, fields = LOGIC, 'logic', ('op', 'left', 'right')
+
+    def __init__(self, op, left, right):
+        self.op    = op
+        self.left  = left
+        self.right = right
+        self.quick = self.seen = None
+
+
+class UnaryLogic(Node):
+    __slots__ = ('op', 'expr')
+    kind, type, fields = UNARY_LOGIC, 'unary_logic', ('op', 'expr')
+
+    def __init__(self, op, expr):
+        self.op   = op
+        self.expr = expr
+
+
+class BinaryOp(Node):
+    """
+    `spec` è annotato dal pass type-specialize: tipi noti degli operandi (es. 'int+int'). `quick`/`seen` sono lo stato del quickening del tree walker.
+    """
+    __slots__ = ('op', 'left', 'right', 'spec', 'quick', 'seen')
+    kind, type, fields = BINARY_OP, 'binary_op', ('op', 'left', 'right')
+    annotations = ('spec',)
+
+    def __init__(self, op, left, right):
+        self.op    = op
+        self.left  = left
+        self.right = right
+        self.spec  = None
+        self.quick = self.seen = None
+
+
+class UnaryOp(Node):
+    """
+    ++/-- prefissi e postfissi; depth/slot si riferiscono alla variabile modificata.
+    `quick`/`seen` sono lo stato del quickening del tree walker.
+    """
+    __slots__ = ('op', 'expr', 'depth', 'slot', 'quick', 'seen')
+    kind, type, fields = UNARY_OP, 'unary_op', ('op', 'expr')
+
+    def __init__(self, op, expr):
+        self.op    = op
+        self.expr  = expr
+        self.depth = self.slot = None
+        self.quick = self.seen = None
+
+    @property
+    def target(self):
+        """Nome della variabile modificata (None se l'operando non è un identificatore)."""
+        return self.expr.name if self.expr.kind == IDENTIFIER else None
+
+
+class Literal(Node):
+    __slots__ = ('value',)
+    kind, type, fields = LITERAL, 'literal', ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Identifier(Node):
+    __slots__ = ('name', 'depth', 'slot')
+    kind, type, fields = IDENTIFIER, 'identifier', ('name',)
+
+    def __init__(self, name):
+        self.name  = name
+        self.depth = self.slot = None
+
+
+class GetAttr(Node):
+    __slots__ = ('object', 'attr')
+    kind, type, fields = GET_ATTR, 'get_attr', ('object', 'attr')
+
+    def __init__(self, object, attr):
+        self.object = object
+        self.attr   = attr
+
+
+NODE_CLASSES = {cls.type: cls for cls in (
+    ExprStmt, If, While, For, Try, Return, Import, FromImport, Call,
+    Declaration, DeclarationCallable, Break, Continue,
+    Logic, UnaryLogic, BinaryOp, UnaryOp, Literal, Identifier, GetAttr,
+)}
+
+# nomi dei campi che nel dizionario avevano una chiave diversa
+DICT_KEYS = {alias: key for key, alias in KEY_ALIASES.items()}
+
+
+def from_dict(data):
+    """Ricostruisce i nodi tipizzati da un AST in forma di dizionari (vedi Node.to_dict)."""
+    if isinstance(data, list):
+        return [from_dict(item) for item in data]
+    cls = NODE_CLASSES[data['type']]
+    args = {}
+    for name in cls.fields:
+        key = DICT_KEYS.get(name, name)
+        if key in data:
+            args[name] = _from_plain(name, data[key])
+    node = cls(**args)
+    for name in cls.annotations:
+        if name in data:
+            setattr(node, name, data[name])
+    return node
+
+
+def _from_plain(field, value):
+    if field == 'params':
+        return [Param(p['type'], p['name'], from_dict(p['default']) if 'default' in p else None)
+                for p in value]
+    if field == 'handlers':
+        return [Handler(h['exception'], h['var'], from_dict(h['body'])) for h in value]
+    if field == 'kwargs':
+        return {key: from_dict(item) for key, item in value.items()}
+    if isinstance(value, dict):
+        return from_dict(value)
+    if isinstance(value, list) and value and isinstance(value[0], dict):
+        return from_dict(value)
+    return value
+
+
+def iter_children(node):
+    """Figli diretti di un nodo (i gestori del try compresi; dei parametri solo i default)."""
+    for name in node.fields:
+        value = getattr(node, name)
+        if isinstance(value, Node):
+            yield value
+        elif isinstance(value, list):
+            for item in value:
+                if not isinstance(item, Node):
+                    continue
+                if item.kind != PARAM:
+                    yield item
+                elif item.default is not None:
+                    yield item.default
+        elif isinstance(value, dict):
+            yield from value.values()
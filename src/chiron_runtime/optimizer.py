@@ -0,0 +1,436 @@
+# chiron_runtime/optimizer.py
+
+"""
+Pass di ottimizzazione predefiniti (livello -O1):
+
+- propagate-consts: le variabili 'const' inizializzate con un literal vengono
+  sostituite nei loro usi
+- fold: binary_op, logic e unary_logic con operandi literal diventano un literal;
+  se la valutazione solleva (es. divisione per zero) il nodo resta com'è e
+  l'errore avviene a runtime come prima
+- dead-code: if/while/for con condizione literal vengono potati (l'if che
+  sopravvive è sostituito dal suo blocco) e le istruzioni dopo return/break/continue
+  rimosse
+- counted-loops: i for con contatore intero vengono marcati (For.counted) perché
+  i backend li eseguano con range()
+"""
+
+import operator
+
+from chiron_runtime.nodes import Literal, iter_children
+from chiron_runtime.passes import Pass, Visitor, Transformer, register
+
+# operatori valutabili a tempo di compilazione, con la stessa semantica di eval_expression
+FOLDABLE_OPS = {
+    '+':  operator.add,
+    '-':  operator.sub,
+    '*':  operator.mul,
+    '/':  operator.truediv,
+    '%':  operator.mod,
+    '<':  operator.lt,
+    '>':  operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+# istruzioni dopo le quali il resto del blocco non viene mai eseguito
+TERMINATORS = ('return', 'break', 'continue')
+
+# istruzioni che il codice globale tratta a parte (eseguite o registrate prima del resto)
+TOPLEVEL_ONLY = ('declaration_callable', 'import', 'from_import')
+
+# oltre questa lunghezza una stringa resta calcolata a runtime (es. "x" * 100000000)
+MAX_FOLDED_LEN = 4096
+
+
+# ——— Constant folding ———
+
+SEQUENCES = (str, bytes, tuple, list)
+
+
+def folded_len(op, left, right):
+    """
+    Lunghezza del risultato di `left op right` stimata dagli operandi, prima di
+    calcolarlo: concatenazione e ripetizione di sequenze, 0 per tutto il resto.
+    """
+    if op == '+' and isinstance(left, SEQUENCES) and isinstance(right, SEQUENCES):
+        return len(left) + len(right)
+    if op == '*':
+        if isinstance(left, SEQUENCES) and isinstance(right, int):
+            return len(left) * max(right, 0)
+        if isinstance(right, SEQUENCES) and isinstance(left, int):
+            return len(right) * max(left, 0)
+    return 0
+
+
+def fold(node):
+    """Valuta un binary_op/logic con operandi literal; se non si può lascia il nodo."""
+    left, right = node.left.value, node.right.value
+    if node.type == 'logic':
+        return Literal(left and right if node.op == 'and' else left or right)
+    if folded_len(node.op, left, right) > MAX_FOLDED_LEN:
+        # la stringa non viene nemmeno costruita: "x" * 100000000 resta a runtime
+        return node
+    try:
+        value = FOLDABLE_OPS[node.op](left, right)
+    except Exception:
+        # l'errore resta al suo posto e viene sollevato a runtime
+        return node
+    return Literal(value)
+
+
+@register
+class FoldConstants(Transformer, Pass):
+    name  = 'fold'
+    after = ('propagate-consts',)
+
+    def run(self, ast):
+        return self.visit_block(ast)
+
+    def visit_binary_op(self, node):
+        self.generic_visit(node)
+        if node.left.type == 'literal' and node.right.type == 'literal':
+            return fold(node)
+        return node
+
+    visit_logic = visit_binary_op
+
+    def visit_unary_logic(self, node):
+        self.generic_visit(node)
+        if node.expr.type == 'literal':
+            return Literal(not node.expr.value)
+        return node
+
+
+# ——— Propagazione delle costanti ———
+
+@register
+class PropagateConstants(Transformer, Pass):
+    """
+    Una costante viene propagata solo se il suo nome è dichiarato una sola volta in
+    tutto il programma, non è mai modificato con ++/-- e non ci sono 'import *'.
+    I suoi usi vengono sostituiti solo dove la dichiarazione è già stata eseguita di
+    sicuro: nel resto del blocco che la contiene, compresi i blocchi annidati.
+    Le costanti globali non entrano nei corpi dei callable, che possono essere
+    chiamati prima che il codice globale venga eseguito (o, con main, senza eseguirlo).
+    """
+
+    name = 'propagate-consts'
+
+    def run(self, ast):
+        self.propagable = collect_constants(ast)
+        self.consts     = {}          # costanti visibili nel punto corrente
+        self.toplevel   = True
+        self.fold       = FoldConstants()
+        return self.visit_block(ast)
+
+    def scoped_block(self, stmts):
+        """Visita un blocco annidato: le costanti che dichiara valgono solo al suo interno."""
+        saved = self.consts
+        self.consts = dict(saved)
+        stmts = self.visit_block(stmts)
+        self.consts = saved
+        return stmts
+
+    # ——— Statements ———
+
+    def visit_declaration(self, node):
+        node.value = self.visit(node.value)
+        if node.name in self.propagable:
+            # il valore può dipendere da altre costanti: va ridotto a literal subito
+            node.value = self.fold.visit(node.value)
+            if node.value.type == 'literal':
+                self.consts[node.name] = node.value.value
+        return node
+
+    def visit_declaration_callable(self, node):
+        saved, toplevel = self.consts, self.toplevel
+        self.consts = {} if toplevel else dict(saved)
+        self.toplevel = False
+        for param in node.params:
+            # i default si valutano nello scope della dichiarazione, a ogni chiamata
+            if param.default is not None:
+                param.default = self.visit(param.default)
+        node.body = self.visit_block(node.body)
+        self.consts, self.toplevel = saved, toplevel
+        return node
+
+    def visit_if(self, node):
+        node.condition = self.visit(node.condition)
+        node.body   = self.scoped_block(node.body)
+        node.orelse = self.scoped_block(node.orelse)
+        return node
+
+    def visit_while(self, node):
+        node.condition = self.visit(node.condition)
+        node.body = self.scoped_block(node.body)
+        return node
+
+    def visit_for(self, node):
+        saved = self.consts
+        self.consts = dict(saved)
+        self.generic_visit(node)
+        self.consts = saved
+        return node
+
+    def visit_try(self, node):
+        node.body = self.scoped_block(node.body)
+        for handler in node.handlers:
+            handler.body = self.scoped_block(handler.body)
+        node.final = self.scoped_block(node.final)
+        return node
+
+    # ——— Expressions ———
+
+    def visit_identifier(self, node):
+        if node.name in self.consts:
+            return Literal(self.consts[node.name])
+        return node
+
+    def visit_unary_op(self, node):
+        # l'operando è la variabile da modificare
+        return node
+
+    def visit_call_callable(self, node):
+        # il chiamato resta un nome: è risolto come funzione
+        if not isinstance(node.name, str) and node.name.type == 'get_attr':
+            node.name.object = self.visit(node.name.object)
+        node.args = [self.visit(arg) for arg in node.args]
+        node.kwargs = {key: self.visit(val) for key, val in node.kwargs.items()}
+        return node
+
+
+def collect_constants(ast):
+    """Nomi delle dichiarazioni 'const' che è sicuro propagare."""
+    bindings = {}
+    modified = set()
+    consts = []
+    stack = list(ast)
+    while stack:
+        node = stack.pop()
+        t = node.type
+        names = ()
+        if t == 'declaration':
+            names = (node.name,)
+            if 'const' in node.modifiers:
+                consts.append(node.name)
+        elif t == 'declaration_callable':
+            names = [node.name] + [param.name for param in node.params]
+        elif t == 'handler':
+            names = (node.var,)
+        elif t == 'import':
+            names = [alias for _, alias in node.modules]
+        elif t == 'from_import':
+            if '*' in node.names:
+                return set()
+            names = [item[1] if isinstance(item, tuple) else item for item in node.names]
+        elif t == 'unary_op':
+            modified.add(node.target)
+        for name in names:
+            bindings[name] = bindings.get(name, 0) + 1
+        stack.extend(iter_children(node))
+    return {name for name in consts if bindings[name] == 1 and name not in modified}
+
+
+# ——— Codice morto ———
+
+@register
+class EliminateDeadCode(Pass):
+    """
+    Nel codice globale le istruzioni dopo un return restano (i callable vengono
+    registrati comunque) e un if non viene appiattito se il suo blocco contiene
+    callable o import, che il codice globale esegue a parte.
+    """
+
+    name     = 'dead-code'
+    requires = ('fold',)
+
+    def run(self, ast):
+        return self.prune_block(ast, toplevel=True)
+
+    def prune_block(self, stmts, toplevel=False):
+        """Restituisce il blocco senza rami morti e codice irraggiungibile."""
+        out = []
+        for i, stmt in enumerate(stmts or ()):
+            t = stmt.type
+
+            if t == 'if' and stmt.condition.type == 'literal':
+                keep = stmt.body if stmt.condition.value else stmt.orelse
+                keep = self.prune_block(keep)
+                if toplevel and any(s.type in TOPLEVEL_ONLY for s in keep):
+                    stmt.condition, stmt.body, stmt.orelse = Literal(True), keep, None
+                    out.append(stmt)
+                else:
+                    out.extend(keep)
+
+            elif t == 'while' and stmt.condition.type == 'literal' and not stmt.condition.value:
+                pass
+
+            elif t == 'for' and stmt.condition.type == 'literal' and not stmt.condition.value:
+                # l'inizializzazione viene comunque eseguita
+                out.append(stmt.init)
+
+            else:
+                self.prune_statement(stmt)
+                out.append(stmt)
+
+            if not toplevel and out and out[-1].type in TERMINATORS:
+                break
+        return out
+
+    def prune_statement(self, node):
+        t = node.type
+        if t == 'if':
+            node.body = self.prune_block(node.body)
+            if node.orelse is not None:
+                node.orelse = self.prune_block(node.orelse)
+        elif t in ('while', 'for', 'declaration_callable'):
+            node.body = self.prune_block(node.body)
+        elif t == 'try':
+            node.body = self.prune_block(node.body)
+            for handler in node.handlers:
+                handler.body = self.prune_block(handler.body)
+            if node.final is not None:
+                node.final = self.prune_block(node.final)
+
+
+# ——— Cicli contati ———
+
+@register
+class CountedLoops(Visitor, Pass):
+    """
+    Riconosce i for della forma `for (T i = a; i < n; i:++)` (anche `<=` e `++:i`)
+    in cui né il corpo né un callable del programma riassegna i o n: il backend li
+    esegue con range(), se a e n risultano interi. I callable si controllano tutti,
+    non solo quelli dello scope del ciclo: uno globale chiamato dal corpo può
+    modificare il limite di un ciclo dentro un altro callable.
+    """
+
+    name  = 'counted-loops'
+    after = ('dead-code',)
+
+    def run(self, ast):
+        self.program = ast
+        self.visit_block(ast)
+        return ast
+
+    def visit_for(self, node):
+        if self.is_counted(node):
+            node.counted = True
+        self.generic_visit(node)
+
+    def is_counted(self, node):
+        init, cond, update = node.init, node.condition, node.update
+        if init.type != 'declaration' or cond.type != 'binary_op' or update.type != 'unary_op':
+            return False
+        name = init.name
+        if cond.op not in ('<', '<=') or cond.left.type != 'identifier' or cond.left.name != name:
+            return False
+        if update.op not in ('++_post', '++_pre') or update.target != name:
+            return False
+        names = [name]
+        stop = cond.right
+        if stop.type == 'identifier':
+            if stop.name == name:
+                return False
+            names.append(stop.name)
+        elif stop.type != 'literal':
+            return False
+        return not any(writes(n, node.body, update) or writes_in_callables(n, self.program, update)
+                       for n in names)
+
+
+def binds(node, name):
+    """
+    True se l'istruzione lega `name` nel suo scope: i namespace di variabili, funzioni
+    e moduli sono uno solo, quindi anche un callable o un import con quel nome.
+    """
+    t = node.type
+    if t == 'declaration' or t == 'declaration_callable':
+        return node.name == name
+    if t == 'import':
+        return any(alias == name for _, alias in node.modules)
+    if t == 'from_import':
+        return name in node.names or '*' in node.names
+    return False
+
+
+def writes(name, stmts, skip=None, local=True):
+    """
+    True se `stmts` può riassegnare `name`: con ++/-- (tranne il nodo `skip`) o, se
+    `local` (stesso scope del ciclo), ridichiarandolo (vedi binds()).
+    """
+    stack = [(stmt, local) for stmt in stmts or ()]
+    while stack:
+        node, local = stack.pop()
+        t = node.type
+        if t == 'unary_op' and node.target == name and node is not skip:
+            return True
+        if local and binds(node, name):
+            return True
+        if t == 'declaration_callable':
+            if callable_writes(name, node, skip):
+                return True
+            continue
+        stack.extend((child, local) for child in iter_children(node))
+    return False
+
+
+def callable_writes(name, node, skip=None):
+    """True se il callable può riassegnare `name` di uno scope esterno."""
+    if any(param.name == name for param in node.params):
+        return False
+    return block_writes(name, node.body, skip)[0]
+
+
+def block_writes(name, stmts, skip=None):
+    """
+    Come writes() per un blocco dentro un callable, dove una dichiarazione di `name`
+    lo rende locale, ma solo per le istruzioni che segue di sicuro: prima lo slot
+    locale non è assegnato e ++/-- ricadrebbe sulla variabile esterna.
+    Restituisce (può scrivere, `name` è dichiarato alla fine del blocco).
+    """
+    for stmt in stmts or ():
+        t = stmt.type
+        decl = stmt.init if t == 'for' else stmt
+        if binds(decl, name):
+            if decl.type == 'declaration':
+                return writes(name, [decl.value], skip, local=False), True
+            if decl.type == 'declaration_callable':
+                return callable_writes(name, decl, skip), True
+            return False, True
+        if t == 'for':
+            if writes(name, [stmt.init, stmt.condition, stmt.update], skip, local=False):
+                return True, False
+            if block_writes(name, stmt.body, skip)[0]:
+                return True, False
+        elif t == 'if' or t == 'while':
+            if writes(name, [stmt.condition], skip, local=False):
+                return True, False
+            wrote, declared = block_writes(name, stmt.body, skip)
+            if wrote:
+                return True, False
+            if t == 'if':
+                wrote, declared_else = block_writes(name, stmt.orelse, skip)
+                if wrote:
+                    return True, False
+                if declared and declared_else:
+                    return False, True
+        elif writes(name, [stmt], skip, local=False):
+            return True, False
+    return False, False
+
+
+def writes_in_callables(name, stmts, skip=None):
+    """True se un callable dichiarato in `stmts` (a qualsiasi profondità) può riassegnare `name`."""
+    stack = list(stmts or ())
+    while stack:
+        node = stack.pop()
+        if node.type == 'declaration_callable':
+            if callable_writes(name, node, skip):
+                return True
+            continue
+        stack.extend(iter_children(node))
+    return False
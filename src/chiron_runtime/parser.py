@@ -1,452 +1,510 @@
 # chiron_runtime/parser.py
 
-from src.chiron_runtime.lexer import Token
+import sys
+from collections import deque
+
+from chiron_runtime.lexer import (
+    Token, TokenBuffer, TokenStream, KIND_NAMES, expected_name, FIRST_KEYWORD, FIRST_DECL, LAST_DECL, FIRST_MODIFIER, LAST_MODIFIER,
+    EOF, ID, NUMBER, STRING, CHAR, LE, GE, EQ, NE, LT, GT, EQUAL, INCREMENT, DECREMENT, ARROW,
+    PLUS, MINUS, STAR, SLASH, PERCENT, LPAREN, RPAREN, LBRACE, RBRACE, COMMA, COLON, SEMICOLON, DOT,
+    KW_IF, KW_ELSE, KW_WHILE, KW_FOR, KW_TRY, KW_EXCEPT, KW_FINALLY, KW_AS, KW_RETURN,
+    KW_IMPORT, KW_FROM, KW_AND, KW_OR, KW_NOT, KW_AUTO, KW_CALLABLE,
+)
+from chiron_runtime.locations import Program, SourceMap
+from chiron_runtime.nodes import (
+    ExprStmt, If, While, For, Try, Handler, Return, Import, FromImport, Call,
+    Declaration, DeclarationCallable, Param,
+    Logic, UnaryLogic, BinaryOp, UnaryOp, Literal, Identifier, GetAttr,
+)
+
+# ——— Precedenza degli operatori ———
+
+# potenza di legame per tipo di token: (potenza, classe del nodo, operatore)
+BINARY_OPS = {
+    KW_OR:   (1, Logic, 'or'),
+    KW_AND:  (2, Logic, 'and'),
+    LT:      (4, BinaryOp, '<'),
+    GT:      (4, BinaryOp, '>'),
+    LE:      (4, BinaryOp, '<='),
+    GE:      (4, BinaryOp, '>='),
+    EQ:      (4, BinaryOp, '=='),
+    NE:      (4, BinaryOp, '!='),
+    PLUS:    (5, BinaryOp, '+'),
+    MINUS:   (5, BinaryOp, '-'),
+    STAR:    (6, BinaryOp, '*'),
+    SLASH:   (6, BinaryOp, '/'),
+    PERCENT: (6, BinaryOp, '%'),
+}
+NOT_POWER = 3
+NOT_OP    = (NOT_POWER, UnaryLogic, 'not')
+# '++:'/'--:' prefissi legano più di ogni operatore binario
+PREFIX_OPS = {INCREMENT: (7, UnaryOp, '++_pre'), DECREMENT: (7, UnaryOp, '--_pre')}
+PAREN      = (-1, None, None)
 
 class SyntaxError(Exception):
     pass
 
 class Parser:
+    def __new__(cls, tokens, dev_mode=False, **options):
+        # Parser(tokens, dev_mode=True) è un TracedParser, come prima che il
+        # tracciamento uscisse dal Parser normale
+        if dev_mode and cls is Parser:
+            cls = TracedParser
+        return super().__new__(cls)
+
     def __init__(self, tokens, dev_mode=False):
-        self.tokens   = list(tokens)
-        self.pos      = 0
-        self.dev_mode = dev_mode
+        if isinstance(tokens, TokenStream):
+            last = sys.maxsize                      # fine ignota: lo stream ripete EOF
+        else:
+            if not isinstance(tokens, TokenBuffer):
+                tokens = TokenBuffer.from_tokens(tokens)
+            last = len(tokens.kinds) - 1            # indice del token EOF
+        self.tokens    = tokens
+        self.kinds     = tokens.kinds
+        self.last      = last
+        self.pos       = 0
+        self.dev_mode  = dev_mode
+        self.locations = SourceMap(tokens.source)   # istruzione -> offset del primo token
+        self.statement_parsers = {
+            KW_IF:     self.parse_if,
+            KW_WHILE:  self.parse_while,
+            KW_FOR:    self.parse_for,
+            KW_TRY:    self.parse_try,
+            KW_RETURN: self.parse_return,
+            KW_IMPORT: self.parse_import,
+            KW_FROM:   self.parse_from_import,
+        }
 
     # ——— Core token methods ———
 
+    def kind(self) -> int:
+        return self.kinds[self.pos]
+
+    def peek_kind(self, n=1) -> int:
+        return self.kinds[min(self.pos + n, self.last)]
+
     def current(self) -> Token:
-        if self.pos < len(self.tokens):
-            return self.tokens[self.pos]
-        return Token('EOF', '')
+        return self.tokens.token(self.pos)
 
     def peek(self, n=1) -> Token:
-        i = self.pos + n
-        if i < len(self.tokens):
-            return self.tokens[i]
-        return Token('EOF', '')
+        return self.tokens.token(self.pos + n)
 
     def advance(self):
-        if self.dev_mode:
-            self.dbg(f"advance from {self.current()}")
-        self.pos += 1
-
-    def expect(self, ttype: str) -> Token:
-        tok = self.current()
-        if tok.type != ttype:
-            raise SyntaxError(f"Expected {ttype} but got {tok}")
+        if self.pos < self.last:
+            self.pos += 1
+
+    def expect(self, kind: int) -> int:
+        """Consuma un token del tipo indicato e ne restituisce l'indice."""
+        pos = self.pos
+        if self.kinds[pos] != kind:
+            raise SyntaxError(f"Expected {expected_name(kind)} but got {self.current()}")
+        self.advance()
+        return pos
+
+    def expect_name(self) -> str:
+        """Consuma un identificatore (anche una parola chiave usata come nome) e ne restituisce il testo."""
+        pos = self.pos
+        kind = self.kinds[pos]
+        if kind != ID and kind < FIRST_KEYWORD:
+            raise SyntaxError(f"Expected ID but got {self.current()}")
         self.advance()
-        return tok
+        return self.tokens.value(pos)
 
-    def lookahead(self):
-        self.advance(); next = self.current()
-        self.pos -= 1
-        return next
+    def is_name(self, kind) -> bool:
+        return kind == ID or kind >= FIRST_KEYWORD
 
-    def match(self, *ttypes):
-        tok = self.current()
-        if tok.type in ttypes:
+    def match(self, *kinds) -> bool:
+        if self.kinds[self.pos] in kinds:
             self.advance()
-            return tok
-        return None
-
-    def dbg(self, msg: str):
-        if self.dev_mode:
-            print(f"[parse @ pos={self.pos}] {msg}")
+            return True
+        return False
 
     # ——— Entry point ———
 
     def parse(self):
-        stmts = []
-        while self.current().type != 'EOF':
+        stmts = Program(locations=self.locations)
+        while self.kinds[self.pos] != EOF:
             stmts.append(self.parse_statement())
         return stmts
 
     # ——— Statement-level ———
 
     def parse_statement(self):
-        self.dbg("parse_statement")
-        tok = self.current()
+        # offset di partenza, per i messaggi d'errore e i backend; va letto
+        # subito: con uno stream il token esce presto dal buffer
+        offset = self.tokens.offset(self.pos)
+        node = self.parse_statement_body(self.kinds[self.pos])
+        self.locations.record(node, offset)
+        return node
 
+    def parse_statement_body(self, kind):
         # dispatch on leading keywords
-        if tok.type == 'ID':
-            if tok.value == 'if':
-                return self.parse_if()
-            if tok.value == 'while':
-                return self.parse_while()
-            if tok.value == 'for':
-                return self.parse_for()
-            if tok.value == 'try':
-                return self.parse_try()
-            if tok.value == 'return':
-                return self.parse_return()
-            if tok.value == 'import':
-                return self.parse_import()
-            if tok.value == 'from':
-                return self.parse_from_import()
+        parser = self.statement_parsers.get(kind)
+        if parser is not None:
+            return parser()
 
         # standalone call:  ID '(' ... ')' ';'
-        if tok.type == 'ID' and self.peek().type == 'LPAREN':
+        if self.is_name(kind) and self.peek_kind() == LPAREN:
             return self.parse_call_stmt()
 
         # declaration: modifiers/types
-        if tok.type == 'ID' and tok.value in (
-            'const','static','global','local','auto',
-            'int','float','bool','char','str','callable'
-        ):
+        if FIRST_DECL <= kind <= LAST_DECL:
             return self.parse_declaration()
 
         # fallback: expression statement
         expr = self.parse_expression()
-        self.expect('SEMICOLON')
-        return {'type':'expr_stmt','expr':expr}
+        self.expect(SEMICOLON)
+        return ExprStmt(expr)
 
     def parse_block(self):
-        self.dbg("parse_block")
-        self.expect('LBRACE')
+        self.expect(LBRACE)
         stmts = []
-        while self.current().type != 'RBRACE':
+        while self.kinds[self.pos] != RBRACE:
             stmts.append(self.parse_statement())
-        self.expect('RBRACE')
+        self.expect(RBRACE)
         return stmts
 
     # ——— Individual statements ———
 
     def parse_if(self):
-        self.dbg("parse_if")
-        self.expect('ID')              # 'if'
-        self.expect('LPAREN')
+        self.expect(KW_IF)
+        self.expect(LPAREN)
         cond = self.parse_expression()
-        self.expect('RPAREN')
+        self.expect(RPAREN)
         body = self.parse_block()
         else_body = None
-        if self.current().type=='ID' and self.current().value=='else':
-            self.advance()
+        if self.match(KW_ELSE):
             else_body = self.parse_block()
-        return {'type':'if','condition':cond,'body':body,'else':else_body}
+        return If(cond, body, else_body)
 
     def parse_while(self):
-        self.dbg("parse_while")
-        self.expect('ID')              # 'while'
-        self.expect('LPAREN')
+        self.expect(KW_WHILE)
+        self.expect(LPAREN)
         cond = self.parse_expression()
-        self.expect('RPAREN')
+        self.expect(RPAREN)
         body = self.parse_block()
-        return {'type':'while','condition':cond,'body':body}
+        return While(cond, body)
 
     def parse_for(self):
-        self.dbg("parse_for")
-        self.expect('ID')              # 'for'
-        self.expect('LPAREN')
+        self.expect(KW_FOR)
+        self.expect(LPAREN)
         init = self.parse_statement()
         cond = self.parse_expression()
-        self.expect('SEMICOLON')
+        self.expect(SEMICOLON)
         update = self.parse_expression()
-        self.expect('RPAREN')
+        self.expect(RPAREN)
         body = self.parse_block()
-        return {'type':'for','init':init,'condition':cond,'update':update,'body':body}
+        return For(init, cond, update, body)
 
     def parse_try(self):
-        self.dbg("parse_try")
-        self.expect('ID')              # 'try'
+        self.expect(KW_TRY)
         try_body = self.parse_block()
         handlers = []
-        while self.current().type=='ID' and self.current().value=='except':
-            self.advance()
-            exc_type = self.expect('ID').value
-            self.expect('ID')          # 'as'
-            exc_var  = self.expect('ID').value
+        while self.match(KW_EXCEPT):
+            exc_type = self.expect_name()
+            self.expect(KW_AS)
+            exc_var  = self.expect_name()
             handler_body = self.parse_block()
-            handlers.append({'exception':exc_type,'var':exc_var,'body':handler_body})
+            handlers.append(Handler(exc_type, exc_var, handler_body))
         final_body = None
-        if self.current().type=='ID' and self.current().value=='finally':
-            self.advance()
+        if self.match(KW_FINALLY):
             final_body = self.parse_block()
-        return {'type':'try','body':try_body,'handlers':handlers,'finally':final_body}
+        return Try(try_body, handlers, final_body)
 
     def parse_return(self):
-        self.dbg("parse_return")
-        self.expect('ID')              # 'return'
+        self.expect(KW_RETURN)
         expr = None
-        if self.current().type!='SEMICOLON':
+        if self.kinds[self.pos] != SEMICOLON:
             expr = self.parse_expression()
-        self.expect('SEMICOLON')
-        return {'type':'return','expression':expr}
+        self.expect(SEMICOLON)
+        return Return(expr)
 
     def parse_import(self):
-        self.dbg("parse_import")
-        self.expect('ID')  # 'import'
+        self.expect(KW_IMPORT)
         modules = []
 
         while True:
             module = self.parse_module_path()
             alias = None
-            if self.current().type == 'ID' and self.current().value == 'as':
-                self.advance()
-                alias = self.expect('ID').value
+            if self.match(KW_AS):
+                alias = self.expect_name()
             modules.append((module, alias))
 
-            if not self.match('COMMA'):
+            if not self.match(COMMA):
                 break
 
-        self.expect('SEMICOLON')
-        return {'type': 'import', 'modules': modules}
+        self.expect(SEMICOLON)
+        return Import(modules)
 
     def parse_from_import(self):
-        self.dbg("parse_from_import")
-        self.expect('ID')  # 'from'
+        self.expect(KW_FROM)
         module = self.parse_module_path()
-        self.expect('ID')  # 'import'
+        self.expect(KW_IMPORT)
 
         # Supporta 'from modulo import *' e 'from modulo import x, y'
         names = []
-        if self.current().type == 'STAR':
-            self.advance()
+        if self.match(STAR):
             names = ['*']
         else:
-            names = [self.expect('ID').value]
-            while self.match('COMMA'):
-                names.append(self.expect('ID').value)
-
-        self.expect('SEMICOLON')
-        return {
-            'type': 'from_import',
-            'module': module,
-            'names': names
-        }
+            names = [self.expect_name()]
+            while self.match(COMMA):
+                names.append(self.expect_name())
+
+        self.expect(SEMICOLON)
+        return FromImport(module, names)
 
     # ——— Helper per nomi di modulo puntati ———
     def parse_module_path(self) -> str:
         """Legge ID(.ID)* e restituisce la stringa modulare, es. 'std.io'."""
-        tok = self.expect('ID')
-        parts = [tok.value]
-        while self.match('DOT'):
-            next_tok = self.expect('ID')
-            parts.append(next_tok.value)
-        path = '.'.join(parts)
-        self.dbg(f"parsed module path: {path}")
-        return path
+        parts = [self.expect_name()]
+        while self.match(DOT):
+            parts.append(self.expect_name())
+        return '.'.join(parts)
 
     def parse_call_stmt(self):
-        self.dbg("parse_call_stmt")
-        name = self.expect('ID').value
-        self.expect('LPAREN')
+        name = self.expect_name()
+        self.expect(LPAREN)
+        args, kwargs = self.parse_arguments()
+        self.expect(SEMICOLON)
+        return Call(name, args, kwargs)
+
+    def parse_arguments(self):
+        """Argomenti di una chiamata dopo '(' fino a ')' compresa: posizionali e `nome = valore`."""
         args = []
-        if self.current().type!='RPAREN':
-            while True:
+        kwargs = {}
+        while self.kinds[self.pos] != RPAREN:
+            if self.is_name(self.kinds[self.pos]) and self.peek_kind() == EQUAL:
+                key = self.expect_name()
+                self.expect(EQUAL)
+                kwargs[key] = self.parse_expression()
+            else:
                 args.append(self.parse_expression())
-                if not self.match('COMMA'):
-                    break
-        self.expect('RPAREN')
-        self.expect('SEMICOLON')
-        return {'type':'call_callable','name':name,'args':args}
+            if self.kinds[self.pos] == COMMA:
+                self.advance()
+        self.expect(RPAREN)
+        return args, kwargs
 
     # ——— Declarations ———
 
     def parse_declaration(self):
-        self.dbg("parse_declaration")
         # collect modifiers
         mods = []
-        while self.current().type=='ID' and self.current().value in ('const','static','global','local'):
-            mods.append(self.current().value)
+        while FIRST_MODIFIER <= self.kinds[self.pos] <= LAST_MODIFIER:
+            mods.append(self.tokens.value(self.pos))
             self.advance()
 
         # type & name
         if 'auto' in mods:
             var_type = 'auto'
-            name     = self.expect('ID').value
+            name     = self.expect_name()
         else:
-            var_type = self.expect('ID').value
-            name     = self.expect('ID').value
+            var_type = self.expect_name()
+            name     = self.expect_name()
 
         # callable vs var
         if var_type=='callable':
             return self.parse_callable_decl(mods,name)
 
         # variable: := or =
-        if self.match('COLON'):
-            self.expect('EQUAL')
+        if self.match(COLON):
+            self.expect(EQUAL)
         else:
-            self.expect('EQUAL')
+            self.expect(EQUAL)
 
         value = self.parse_expression()
-        self.expect('SEMICOLON')
-        return {'type':'declaration','modifiers':mods,'var_type':var_type,'name':name,'value':value}
+        self.expect(SEMICOLON)
+        return Declaration(mods, var_type, name, value)
 
     def parse_callable_decl(self, mods, name):
-        self.dbg("parse_callable_decl")
-        self.expect('LPAREN')
+        self.expect(LPAREN)
         params = []
-        if self.current().type!='RPAREN':
+        if self.kinds[self.pos] != RPAREN:
             while True:
-                ptype = self.expect('ID').value
-                pname = self.expect('ID').value
-                params.append({'type':ptype,'name':pname})
-                if not self.match('COMMA'):
+                ptype = self.expect_name()
+                pname = self.expect_name()
+                default = None
+                if self.match(EQUAL):
+                    default = self.parse_expression()
+                elif params and params[-1].default is not None:
+                    raise SyntaxError(f"Parameter '{pname}' without default follows a parameter "
+                                      f"with default in '{name}' at {self.current()}")
+                params.append(Param(ptype, pname, default))
+                if not self.match(COMMA):
                     break
-        self.expect('RPAREN')
-        self.expect('ARROW')
-        return_type = self.expect('ID').value
+        self.expect(RPAREN)
+        self.expect(ARROW)
+        return_type = self.expect_name()
 
         body = None
-        if self.current().type=='LBRACE':
+        if self.kinds[self.pos] == LBRACE:
             body = self.parse_block()
-            self.expect('SEMICOLON')
+            self.expect(SEMICOLON)
         else:
-            self.expect('SEMICOLON')
-
-        return {
-            'type':'declaration_callable',
-            'modifiers':mods,
-            'name':name,
-            'params':params,
-            'return_type':return_type,
-            'body':body
-        }
+            self.expect(SEMICOLON)
+
+        return DeclarationCallable(mods, name, params, return_type, body)
 
     # ——— Expression-level (Pratt-ish) ———
 
     def parse_expression(self):
-        self.dbg("parse_expression")
-        return self.parse_or()
-
-    def parse_or(self):
-        node = self.parse_and()
-        while self.current().type == 'ID' and self.current().value == 'or':
-            op_tok = self.current()
-            self.advance()
-            right = self.parse_and()
-            node = {'type': 'logic', 'op': 'or', 'left': node, 'right': right}
-        return node
-
-    def parse_and(self):
-        node = self.parse_not()
-        while self.current().type == 'ID' and self.current().value == 'and':
-            op_tok = self.current()
-            self.advance()
-            right = self.parse_not()
-            node = {'type': 'logic', 'op': 'and', 'left': node, 'right': right}
-        return node
-
-    def parse_not(self):
-        if self.current().type == 'ID' and self.current().value == 'not':
-            self.advance()
-            expr = self.parse_not()
-            return {'type': 'unary_logic', 'op': 'not', 'expr': expr}
-        return self.parse_comparison()
-
-    def parse_comparison(self):
-        node = self.parse_add_sub()
-        # includi le sigle esatte che il lexer restituisce
-        while self.current().type in ('LT', 'GT', 'LE', 'GE', 'EQ', 'NE'):
-            op_tok = self.current()
-            self.advance()
-            right = self.parse_add_sub()
-            node = {
-                'type': 'binary_op',
-                'op': op_tok.value,
-                'left': node,
-                'right': right
-            }
-        return node
-
-    def parse_add_sub(self):
-        node = self.parse_mul_div()
-        while True:
-            if self.match('PLUS'):
-                right = self.parse_mul_div()
-                node = {'type':'binary_op','op':'+','left':node,'right':right}
-            elif self.match('MINUS'):
-                right = self.parse_mul_div()
-                node = {'type':'binary_op','op':'-','left':node,'right':right}
-            else:
-                break
-        return node
-
-    def parse_mul_div(self):
-        node = self.parse_unary()
+        """
+        Precedence climbing su uno stack esplicito: gli operatori e le parentesi
+        aperte aspettano in `ops`, gli operandi già costruiti in `vals`.
+        Un operatore riduce quelli in cima che legano almeno quanto lui (associatività a sinistra).
+        """
+        kinds = self.kinds
+        ops = []            # (potenza, classe, op); PAREN per una '(' aperta
+        vals = []
+        open_parens = 0
         while True:
-            if self.match('STAR'):
-                right = self.parse_unary()
-                node = {'type':'binary_op','op':'*','left':node,'right':right}
-            elif self.match('SLASH'):
-                right = self.parse_unary()
-                node = {'type':'binary_op','op':'/','left':node,'right':right}
-            elif self.match('PERCENT'):
-                right = self.parse_unary()
-                node = {'type':'binary_op','op':'%','left':node,'right':right}
-            else:
-                break
-        return node
-
-    def parse_unary(self):
-        if self.match('INCREMENT'):
-            if self.match('COLON'):
-                expr = self.parse_unary()
-                return {'type': 'unary_op', 'op': '++_pre', 'expr': expr}
-            else:
-                raise SyntaxError("Expected ':' after '++'")
-        if self.match('DECREMENT'):
-            if self.match('COLON'):
-                expr = self.parse_unary()
-                return {'type': 'unary_op', 'op': '--_pre', 'expr': expr}
-            else:
-                raise SyntaxError("Expected ':' after '--'")
+            # ——— posizione di operando: prefissi e parentesi ———
+            while True:
+                kind = kinds[self.pos]
+                if kind == KW_NOT and (not ops or ops[-1][0] <= NOT_POWER):
+                    # 'not' si applica a un confronto, e solo dove sono ammessi and/or
+                    self.advance()
+                    ops.append(NOT_OP)
+                elif kind == LPAREN:
+                    self.advance()
+                    ops.append(PAREN)
+                    open_parens += 1
+                elif kind == INCREMENT or kind == DECREMENT:
+                    self.advance()
+                    if not self.match(COLON):
+                        raise SyntaxError(f"Expected ':' after '{'++' if kind == INCREMENT else '--'}'")
+                    ops.append(PREFIX_OPS[kind])
+                else:
+                    break
+            vals.append(self.parse_postfix(self.parse_primary()))
 
-        node = self.parse_primary()
+            # ——— posizione di operatore: binari e parentesi chiuse ———
+            while True:
+                kind = kinds[self.pos]
+                binary = BINARY_OPS.get(kind)
+                if binary is not None:
+                    power = binary[0]
+                    while ops and ops[-1][0] >= power:
+                        self.reduce(ops.pop(), vals)
+                    self.advance()
+                    ops.append(binary)
+                    break
+                if kind == RPAREN and open_parens:
+                    while ops[-1] is not PAREN:
+                        self.reduce(ops.pop(), vals)
+                    ops.pop()
+                    open_parens -= 1
+                    self.advance()
+                    vals[-1] = self.parse_postfix(vals[-1])
+                    continue
+                # fine dell'espressione
+                while ops:
+                    op = ops.pop()
+                    if op is PAREN:
+                        self.expect(RPAREN)
+                    self.reduce(op, vals)
+                return vals[0]
+
+    @staticmethod
+    def reduce(op, vals):
+        """Applica l'operatore `op` agli operandi in cima a `vals`."""
+        _, cls, name = op
+        if cls is UnaryLogic or cls is UnaryOp:
+            vals[-1] = cls(name, vals[-1])
+        else:
+            right = vals.pop()
+            vals[-1] = cls(name, vals[-1], right)
 
+    def parse_postfix(self, node):
         # accetta ':' anche se non seguito da ++ o -- (viene ignorato)
-        if self.match('COLON'):
-            if self.match('INCREMENT'):
-                return {'type': 'unary_op', 'op': '++_post', 'expr': node}
-            elif self.match('DECREMENT'):
-                return {'type': 'unary_op', 'op': '--_post', 'expr': node}
-            else:
-                # interpretalo come "continuazione" e lascia passare
-                pass
-
+        if self.kinds[self.pos] == COLON:
+            self.advance()
+            if self.match(INCREMENT):
+                return UnaryOp('++_post', node)
+            elif self.match(DECREMENT):
+                return UnaryOp('--_post', node)
+            # altrimenti lo interpreta come "continuazione" e lascia passare
         return node
 
     def parse_primary(self):
-        tok = self.current()
-        if tok.type=='NUMBER':
+        pos = self.pos
+        kind = self.kinds[pos]
+        if kind == NUMBER:
             self.advance()
-            val = float(tok.value) if '.' in tok.value else int(tok.value)
-            return {'type':'literal','value':val}
-        if tok.type=='STRING':
+            text = self.tokens.value(pos)
+            val = float(text) if '.' in text else int(text)
+            return Literal(val)
+        if kind == STRING:
             self.advance()
-            return {'type':'literal','value':tok.value[1:-1]}
-        if tok.type=='CHAR':
+            return Literal(self.tokens.value(pos)[1:-1])
+        if kind == CHAR:
             self.advance()
-            return {'type':'literal','value':tok.value[1]}
-        if tok.type == 'ID':
-            node = {'type': 'identifier', 'name': tok.value}
+            return Literal(self.tokens.value(pos)[1])
+        if self.is_name(kind):
+            node = Identifier(self.tokens.value(pos))
             self.advance()
 
             # gestisce accessi a proprietà: a.b.c
-            while self.match('DOT'):
-                attr = self.expect('ID').value
-                node = {'type': 'get_attr', 'object': node, 'attr': attr}
+            while self.match(DOT):
+                attr = self.expect_name()
+                node = GetAttr(node, attr)
 
             # se c'è '(', è una chiamata
-            if self.current().type == 'LPAREN':
+            if self.kinds[self.pos] == LPAREN:
                 self.advance()
-                args = []
-                kwargs = {}
-                while self.current().type != 'RPAREN':
-                    if self.current().type == 'ID' and self.lookahead().type == 'EQUAL':
-                        key = self.expect('ID').value
-                        self.expect('EQUAL')
-                        val = self.parse_expression()
-                        kwargs[key] = val
-                    else:
-                        args.append(self.parse_expression())
-                    if self.current().type == 'COMMA':
-                        self.advance()
-                self.expect('RPAREN')
-                node = {'type': 'call_callable', 'name': node, 'args': args, 'kwargs': kwargs}
+                args, kwargs = self.parse_arguments()
+                node = Call(node, args, kwargs)
             return node
-        if tok.type=='LPAREN':
-            self.advance()
-            expr = self.parse_expression()
-            self.expect('RPAREN')
-            return expr
-        raise SyntaxError(f"Unexpected token {tok} in primary")
+        raise SyntaxError(f"Unexpected token {self.current()} in primary")
+
+
+# ——— Tracciamento ———
+
+class TracedParser(Parser):
+    """
+    Parser che registra ogni metodo parse_* invocato e ogni advance() in un ring
+    buffer di `size` eventi; se il parsing fallisce la traccia viene scritta su
+    `out` (stderr se non indicato). Il Parser normale non contiene alcun controllo;
+    Parser(tokens, dev_mode=True) crea un TracedParser.
+    """
+
+    def __init__(self, tokens, dev_mode=True, size=256, out=None):
+        super().__init__(tokens, dev_mode)
+        self.trace = deque(maxlen=size)        # (evento, indice del token, tipo del token)
+        self.out   = out
+
+    def advance(self):
+        self.trace.append(('advance', self.pos, self.kinds[self.pos]))
+        Parser.advance(self)
+
+    def parse(self):
+        try:
+            return Parser.parse(self)
+        except Exception:
+            self.dump()
+            raise
+
+    def dump(self, file=None):
+        """Scrive gli ultimi eventi, dal più vecchio."""
+        file = file or self.out or sys.stderr
+        print(f"--- ultimi {len(self.trace)} eventi del parser ---", file=file)
+        for event, pos, kind in self.trace:
+            try:
+                line, col = self.tokens.position(pos)
+                where = f"{line}:{col} {KIND_NAMES[kind]} {self.tokens.value(pos)!r}"
+            except IndexError:
+                where = KIND_NAMES[kind]        # token già uscito dal buffer dello stream
+            print(f"[pos={pos}] {event:<22} {where}", file=file)
+
+
+def _traced(name, method):
+    def traced(self, *args):
+        self.trace.append((name, self.pos, self.kinds[self.pos]))
+        return method(self, *args)
+    traced.__name__ = name
+    traced.__doc__  = method.__doc__
+    return traced
+
+
+for _name, _method in list(vars(Parser).items()):
+    if _name.startswith('parse_') and callable(_method):
+        setattr(TracedParser, _name, _traced(_name, _method))
@@ -0,0 +1,176 @@
+# chiron_runtime/passes.py
+
+"""
+Infrastruttura dei pass di ottimizzazione sull'AST.
+
+Un pass è una sottoclasse di Pass registrata con @register: dichiara il livello -O
+da cui è attivo, i pass che richiede (`requires`, aggiunti alla pipeline anche se
+sotto livello) e quelli dopo cui deve girare se presenti (`after`). Il PassManager
+di un livello ordina i pass rispettando le dipendenze e ne misura tempo e nodi.
+
+Visitor e Transformer smistano i nodi con una tabella per codice `kind`, costruita
+una volta per classe dai metodi visit_<tipo>, invece di una catena di if/elif.
+"""
+
+import time
+
+from chiron_runtime.nodes import Node, NODE_CLASSES, HANDLER, PARAM, iter_children
+
+MAX_LEVEL = 2
+
+PASSES = {}         # nome -> classe, in ordine di registrazione
+
+
+def register(cls):
+    """Decoratore: rende il pass disponibile alle pipeline."""
+    if cls.name in PASSES:
+        raise ValueError(f"Pass '{cls.name}' già registrato")
+    PASSES[cls.name] = cls
+    return cls
+
+
+# ——— Visitor ———
+
+# codice del nodo per ogni nome di tipo, compresi quelli senza voce in NODE_CLASSES
+KINDS_BY_TYPE = {cls.type: cls.kind for cls in NODE_CLASSES.values()}
+KINDS_BY_TYPE.update(handler=HANDLER, param=PARAM)
+
+
+class Visitor:
+    """Visita un AST; per ogni tipo di nodo chiama visit_<tipo>, altrimenti generic_visit."""
+
+    dispatch = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.dispatch = {kind: getattr(cls, f"visit_{type_}")
+                        for type_, kind in KINDS_BY_TYPE.items() if hasattr(cls, f"visit_{type_}")}
+
+    def visit(self, node):
+        method = self.dispatch.get(node.kind)
+        if method is None:
+            return self.generic_visit(node)
+        return method(self, node)
+
+    def visit_block(self, stmts):
+        for stmt in stmts or ():
+            self.visit(stmt)
+
+    def generic_visit(self, node):
+        for child in iter_children(node):
+            self.visit(child)
+
+
+class Transformer(Visitor):
+    """
+    Come Visitor, ma visit() restituisce il nodo con cui sostituire quello visitato.
+    generic_visit aggiorna i figli al loro posto; visit_block restituisce la nuova lista.
+    """
+
+    def visit_block(self, stmts):
+        if stmts is None:
+            return None
+        return [self.visit(stmt) for stmt in stmts]
+
+    def generic_visit(self, node):
+        for name in node.fields:
+            value = getattr(node, name)
+            if isinstance(value, Node):
+                setattr(node, name, self.visit(value))
+            elif isinstance(value, list):
+                if value and isinstance(value[0], Node):
+                    setattr(node, name, [self.visit(item) for item in value])
+            elif isinstance(value, dict):
+                setattr(node, name, {key: self.visit(item) for key, item in value.items()})
+        return node
+
+
+# ——— Pass ———
+
+class Pass:
+    name     = ''
+    level    = 1            # livello -O minimo a cui il pass entra nella pipeline
+    requires = ()           # pass necessari, sempre eseguiti prima
+    after    = ()           # pass che, se presenti nella pipeline, vanno eseguiti prima
+
+    def run(self, ast):
+        """Trasforma la lista di istruzioni `ast` e la restituisce."""
+        raise NotImplementedError
+
+
+def count_nodes(tree):
+    """Numero di nodi di un sottoalbero (o di una lista di istruzioni)."""
+    if tree is None:
+        return 0
+    stack = list(tree) if isinstance(tree, list) else [tree]
+    count = 0
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(iter_children(node))
+    return count
+
+
+class PassManager:
+    """Pipeline dei pass per un livello -O; `stats` raccoglie (pass, secondi, nodi prima, nodi dopo)."""
+
+    def __init__(self, level=1):
+        # i pass predefiniti si registrano all'import
+        import chiron_runtime.optimizer   # noqa: F401
+        import chiron_runtime.specialize  # noqa: F401
+        self.level    = level
+        self.pipeline = self.build_pipeline(level)
+        self.stats    = None        # resta None se l'AST ottimizzato arriva dalla cache
+
+    @property
+    def tag(self):
+        """Distingue nella cache di __chycache__ gli AST dei diversi livelli."""
+        return f"O{self.level}"
+
+    @staticmethod
+    def build_pipeline(level):
+        selected = [name for name, cls in PASSES.items() if cls.level <= level]
+        # le dipendenze dichiarate entrano anche se sotto livello
+        i = 0
+        while i < len(selected):
+            for dep in PASSES[selected[i]].requires:
+                if dep not in PASSES:
+                    raise ValueError(f"Pass '{selected[i]}' richiede '{dep}', non registrato")
+                if dep not in selected:
+                    selected.append(dep)
+            i += 1
+        # ordinamento topologico, stabile rispetto all'ordine di registrazione
+        order = []
+        state = {}
+        def visit(name):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'active':
+                raise ValueError(f"Dipendenza circolare tra i pass che coinvolge '{name}'")
+            state[name] = 'active'
+            cls = PASSES[name]
+            for dep in cls.requires + tuple(d for d in cls.after if d in selected):
+                visit(dep)
+            state[name] = 'done'
+            order.append(name)
+        for name in sorted(selected, key=list(PASSES).index):
+            visit(name)
+        return [PASSES[name] for name in order]
+
+    def optimize(self, ast):
+        self.stats = []
+        for cls in self.pipeline:
+            before = count_nodes(ast)
+            start = time.perf_counter()
+            ast[:] = cls().run(ast)
+            elapsed = time.perf_counter() - start
+            self.stats.append((cls.name, elapsed, before, count_nodes(ast)))
+        return ast
+
+    def format_stats(self):
+        if self.stats is None:
+            return [f"[-O{self.level}] AST ottimizzato letto da __chycache__"]
+        lines = [f"[-O{self.level}] {'pass':<16} {'ms':>8} {'nodi prima':>11} {'nodi dopo':>10}"]
+        for name, elapsed, before, after in self.stats:
+            lines.append(f"[-O{self.level}] {name:<16} {elapsed * 1000:8.2f} {before:11d} {after:10d}")
+        return lines
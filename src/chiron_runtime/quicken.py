@@ -0,0 +1,189 @@
+# chiron_runtime/quicken.py
+
+"""
+Quickening adattivo del tree walker.
+
+Quando i tipi non sono dichiarati (auto, parametri di callable nativi, valori
+restituiti da Python) il pass type-specialize non può specializzare nulla. Il tree
+walker allora osserva a runtime i tipi degli operandi di binary_op, logic e
+unary_op: dopo QUICKEN_AFTER osservazioni uguali di fila il nodo riceve in `quick`
+un gestore specializzato per quei tipi, che legge direttamente literal e slot
+locali, esegue l'operatore in linea (vedi specialize.binary_handler) e controlla
+con `type(x) is T` che i tipi siano ancora quelli visti. Se il controllo fallisce
+il nodo torna al percorso generico (deottimizzazione); dopo MAX_DEOPTS
+deottimizzazioni, MAX_CHANGES cambi dei tipi osservati o con tipi non
+specializzabili resta generico e non viene più osservato.
+"""
+
+from chiron_runtime.specialize import OPERATORS, binary_handler, result_type, spec_types
+
+QUICKEN_AFTER = 8       # osservazioni stabili prima di specializzare un nodo
+MAX_DEOPTS    = 4       # deottimizzazioni dopo cui il nodo resta generico
+MAX_CHANGES   = 16      # cambi dei tipi osservati dopo cui il nodo resta generico
+
+# tipi con un'implementazione specializzata, per nome come in specialize
+QUICK_TYPES = {bool: 'bool', int: 'int', float: 'float', str: 'str'}
+
+# valore di `seen` per i nodi che non vengono più osservati
+GENERIC = False
+
+# percorso generico di logic, come nel tree walker
+LOGIC_OPS = {
+    'and': lambda a, b: a and b,
+    'or':  lambda a, b: a or b,
+}
+
+
+class Quickener:
+    """Osserva i nodi del tree walker, installa i gestori specializzati e li conta."""
+
+    def __init__(self, interpreter, unset):
+        self.interpreter = interpreter
+        self.unset       = unset        # segnaposto degli slot non assegnati del Frame
+        self.quickened   = 0        # gestori installati
+        self.deoptimized = 0        # gestori rimossi perché un controllo di tipo è fallito
+        self.generic     = 0        # nodi rinunciati: tipi instabili o non specializzabili
+
+    # ——— Osservazione ———
+
+    def observe(self, node, key):
+        """Registra i tipi visti da `node`; dopo QUICKEN_AFTER osservazioni uguali lo specializza."""
+        seen = node.seen
+        if seen is None:
+            node.seen = [key, 1, 0, 0]      # tipi, osservazioni di fila, deottimizzazioni, cambi
+            return
+        if seen[0] != key:
+            # tipi instabili: senza un limite il nodo pagherebbe l'osservazione per sempre
+            seen[0], seen[1] = key, 1
+            seen[3] += 1
+            if seen[3] >= MAX_CHANGES:
+                self.give_up(node)
+            return
+        seen[1] += 1
+        if seen[1] < QUICKEN_AFTER:
+            return
+        t = node.type
+        if t == 'binary_op':
+            quick = self.quicken_binary(node, *key)
+        elif t == 'logic':
+            quick = self.quicken_logic(node, *key)
+        else:
+            quick = self.quicken_unary(node, key)
+        if quick is None:
+            self.give_up(node)
+        else:
+            node.quick = quick
+            self.quickened += 1
+
+    def specialize(self, node):
+        """Installa il gestore di un binary_op con i tipi del pass type-specialize e lo restituisce."""
+        types = spec_types(node)
+        node.seen = [types, QUICKEN_AFTER, 0, 0]
+        node.quick = self.typed_binary(node, types)
+        self.quickened += 1
+        return node.quick
+
+    def deoptimize(self, node):
+        node.quick = None
+        self.deoptimized += 1
+        seen = node.seen
+        seen[1] = 0
+        seen[2] += 1
+        if seen[2] >= MAX_DEOPTS:
+            self.give_up(node)
+
+    def give_up(self, node):
+        node.seen = GENERIC
+        self.generic += 1
+
+    def format_stats(self):
+        return [f"[quicken] nodi specializzati {self.quickened}, "
+                f"deottimizzati {self.deoptimized}, generici {self.generic}"]
+
+    # ——— Gestori specializzati ———
+    # I gestori ricevono l'interprete che li esegue: lo stesso AST può essere
+    # eseguito da più interpreti, ciascuno con il proprio ambiente globale.
+
+    def reader(self, node):
+        """Funzione (interprete, env) -> valore di un operando che non è un literal né uno slot locale."""
+        if node.type in ('binary_op', 'logic', 'unary_op'):
+            # un operando già specializzato si esegue senza passare da eval_expression
+            def read_quick(interp, env):
+                quick = node.quick
+                if quick is not None:
+                    return quick(interp, env)
+                return interp.eval_expression(node, env)
+            return read_quick
+        return lambda interp, env: interp.eval_expression(node, env)
+
+    def typed_binary(self, node, types):
+        """
+        Gestore di un binary_op o logic per i tipi `types` (vedi binary_handler): se un
+        tipo non è quello atteso il nodo si deottimizza e rientra in eval_expression.
+        """
+        operands = []
+        for operand in (node.left, node.right):
+            if operand.type == 'literal':
+                operands.append(('const', operand.value))
+            elif operand.type == 'identifier' and operand.depth == 0:
+                operands.append(('slot', operand.slot))
+            else:
+                operands.append(('read', self.reader(operand)))
+        pure = all(kind != 'read' for kind, _ in operands)
+        op = OPERATORS.get(node.op) or LOGIC_OPS[node.op]
+        unset = self.unset
+
+        def fallback(a, b, interp, env):
+            interp.quickener.deoptimize(node)
+            if pure:
+                # rileggere literal e slot non ha effetti: il percorso generico rifà tutto
+                return interp.eval_expression(node, env)
+            # un operando con effetti (es. una chiamata) non si valuta due volte
+            if a is unset:
+                a = interp.eval_expression(node.left, env)
+            if b is unset:
+                b = interp.eval_expression(node.right, env)
+            return op(a, b)
+        return binary_handler(node.op, operands, types, fallback, 'interp, env')
+
+    def quicken_binary(self, node, ltype, rtype):
+        names = QUICK_TYPES.get(ltype), QUICK_TYPES.get(rtype)
+        if None in names or result_type(node.op, *names) is None:
+            return None
+        return self.typed_binary(node, (ltype, rtype))
+
+    def quicken_logic(self, node, ltype, rtype):
+        if ltype not in QUICK_TYPES or rtype not in QUICK_TYPES:
+            return None
+        return self.typed_binary(node, (ltype, rtype))
+
+    def quicken_unary(self, node, vtype):
+        if vtype not in (int, float) or node.depth not in (0, None):
+            return None
+        delta = 1 if node.op[:2] == '++' else -1
+        prefix = node.op.endswith('_pre')
+        name = node.target
+        if node.depth is None:
+            unset = self.unset
+            def quick_unary_op(interp, env):
+                scope = interp.global_env.vars
+                old = scope.get(name, unset)
+                if type(old) is not vtype:
+                    # il controllo precede la scrittura: il percorso generico rifà tutto
+                    interp.quickener.deoptimize(node)
+                    old = interp.step_name(node, name, env, delta)
+                else:
+                    scope[name] = old + delta
+                return old + delta if prefix else old
+        else:
+            slot = node.slot
+            def quick_unary_op(interp, env):
+                slots = env.slots
+                old = slots[slot]
+                if type(old) is not vtype:
+                    interp.quickener.deoptimize(node)
+                    old = interp.step_name(node, name, env, delta)
+                else:
+                    slots[slot] = old + delta
+                return old + delta if prefix else old
+        return quick_unary_op
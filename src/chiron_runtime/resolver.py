@@ -0,0 +1,187 @@
+# chiron_runtime/resolver.py
+
+class Scope:
+    """Scope locale (corpo di un callable o di un gestore except) con i suoi slot."""
+
+    def __init__(self, names=()):
+        self.names   = []
+        self.index   = {}
+        self.dynamic = False      # contiene 'from X import *': nomi non noti a priori
+        for name in names:
+            self.declare(name)
+
+    def declare(self, name):
+        slot = self.index.get(name)
+        if slot is None:
+            slot = self.index[name] = len(self.names)
+            self.names.append(name)
+        return slot
+
+
+class Resolver:
+    """
+    Risolve staticamente i nomi dell'AST e annota i nodi con una coppia (depth, slot):
+
+    - depth >= 0: variabile locale, `depth` frame sopra quello corrente, indice `slot`
+    - depth None: nome globale, cercato direttamente nell'ambiente globale
+    - depth -1:   nome non risolvibile staticamente (import * in uno scope locale),
+                  cercato per nome lungo la catena degli ambienti
+
+    Lo scope globale resta un dizionario; ogni callable e ogni gestore except
+    ottiene un frame a dimensione fissa, la cui lista di nomi finisce in node.locals.
+    Tutte le dichiarazioni di uno scope ricevono lo slot all'ingresso nello scope:
+    finché uno slot non è assegnato, la lettura ricade sugli scope esterni come
+    nel lookup dinamico.
+    """
+
+    def __init__(self):
+        self.scopes = []
+
+    def resolve(self, ast):
+        for stmt in ast:
+            self.resolve_statement(stmt)
+        return ast
+
+    # ——— Scope helpers ———
+
+    def lookup(self, name):
+        dynamic = False
+        for depth, scope in enumerate(reversed(self.scopes)):
+            slot = scope.index.get(name)
+            if slot is not None:
+                return (-1, None) if dynamic else (depth, slot)
+            dynamic = dynamic or scope.dynamic
+        return (-1, None) if dynamic else (None, None)
+
+    def annotate(self, node, name):
+        node.depth, node.slot = self.lookup(name)
+
+    def declare(self, name):
+        return self.scopes[-1].declare(name) if self.scopes else None
+
+    def hoist(self, stmts, scope):
+        """Assegna gli slot a tutto ciò che il blocco dichiara nello scope corrente."""
+        for stmt in stmts or ():
+            t = stmt.type
+            if t in ('declaration', 'declaration_callable'):
+                scope.declare(stmt.name)
+            elif t == 'import':
+                for _, alias in stmt.modules:
+                    if alias is not None:
+                        scope.declare(alias)
+            elif t == 'from_import':
+                for name in stmt.names:
+                    if name == '*':
+                        scope.dynamic = True
+                    else:
+                        scope.declare(name)
+            elif t == 'if':
+                self.hoist(stmt.body, scope)
+                self.hoist(stmt.orelse, scope)
+            elif t == 'while':
+                self.hoist(stmt.body, scope)
+            elif t == 'for':
+                self.hoist([stmt.init], scope)
+                self.hoist(stmt.body, scope)
+            elif t == 'try':
+                # i gestori except hanno uno scope proprio
+                self.hoist(stmt.body, scope)
+                self.hoist(stmt.final, scope)
+
+    def resolve_scope(self, scope, stmts):
+        self.hoist(stmts, scope)
+        self.scopes.append(scope)
+        self.resolve_block(stmts)
+        self.scopes.pop()
+        return tuple(scope.names)
+
+    # ——— Statements ———
+
+    def resolve_block(self, stmts):
+        for stmt in stmts or ():
+            self.resolve_statement(stmt)
+
+    def resolve_statement(self, node):
+        t = node.type
+
+        if t == 'declaration':
+            self.resolve_expression(node.value)
+            node.slot = self.declare(node.name)
+
+        elif t == 'declaration_callable':
+            node.slot = self.declare(node.name)
+            # i default si valutano nello scope della dichiarazione, non in quello del corpo
+            for param in node.params:
+                if param.default is not None:
+                    self.resolve_expression(param.default)
+            scope = Scope(param.name for param in node.params)
+            node.locals = self.resolve_scope(scope, node.body)
+
+        elif t == 'call_callable':
+            self.annotate(node, node.name)
+            for arg in node.args:
+                self.resolve_expression(arg)
+            for val in node.kwargs.values():
+                self.resolve_expression(val)
+
+        elif t == 'return':
+            if node.expression is not None:
+                self.resolve_expression(node.expression)
+
+        elif t == 'try':
+            self.resolve_block(node.body)
+            for handler in node.handlers:
+                handler.locals = self.resolve_scope(Scope([handler.var]), handler.body)
+            self.resolve_block(node.final)
+
+        elif t == 'if':
+            self.resolve_expression(node.condition)
+            self.resolve_block(node.body)
+            self.resolve_block(node.orelse)
+
+        elif t == 'while':
+            self.resolve_expression(node.condition)
+            self.resolve_block(node.body)
+
+        elif t == 'for':
+            self.resolve_statement(node.init)
+            self.resolve_expression(node.condition)
+            self.resolve_expression(node.update)
+            self.resolve_block(node.body)
+
+        elif t == 'expr_stmt':
+            self.resolve_expression(node.expr)
+
+    # ——— Expressions ———
+
+    def resolve_expression(self, node):
+        t = node.type
+
+        if t == 'identifier':
+            self.annotate(node, node.name)
+
+        elif t in ('logic', 'binary_op'):
+            self.resolve_expression(node.left)
+            self.resolve_expression(node.right)
+
+        elif t == 'unary_logic':
+            self.resolve_expression(node.expr)
+
+        elif t == 'unary_op':
+            self.resolve_expression(node.expr)
+            self.annotate(node, node.target)
+
+        elif t == 'call_callable':
+            name_node = node.name
+            if name_node.type == 'identifier':
+                self.annotate(name_node, name_node.name)
+                self.annotate(node, name_node.name)
+            else:
+                self.resolve_expression(name_node)
+            for arg in node.args:
+                self.resolve_expression(arg)
+            for val in node.kwargs.values():
+                self.resolve_expression(val)
+
+        elif t == 'get_attr':
+            self.resolve_expression(node.object)
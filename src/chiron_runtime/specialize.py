@@ -0,0 +1,417 @@
+# chiron_runtime/specialize.py
+
+"""
+Pass type-specialize (livello -O2): inferenza dei tipi a partire da quelli dichiarati.
+
+I tipi di variabili e parametri (`var_type`) e quelli di ritorno dei callable
+(`return_type`) vengono propagati alle espressioni. Ogni binary_op con entrambi gli
+operandi di tipo noto riceve in `spec` i tipi degli operandi (es. 'int+int'): il
+tree walker e il compilatore a closure ne ricavano con binary_handler un gestore
+con l'operatore in linea, al posto dello smistamento generico. La VM e il backend
+Python eseguono già l'operatore senza smistamento e ignorano `spec`.
+
+Il runtime non fa rispettare i tipi dichiarati: dichiarazioni, default, return e
+argomenti di tipo incompatibile (es. `bool flag = 1;`) sono solo avvisi su stderr.
+Lo sono anche le combinazioni che a runtime solleverebbero un TypeError di Python
+(es. int + str) e le chiamate con argomenti sbagliati: il codice può stare in un
+try che gestisce l'errore o in un ramo che non viene mai eseguito, e a -O2 deve
+comportarsi come a -O0.
+Il nome, il parametro o il tipo di ritorno smentito esce dai tipi noti e l'analisi
+riparte, finché non ci sono nuove smentite: così nessuna specializzazione o errore
+si basa su un tipo dichiarato che il programma non rispetta.
+
+Un nome è tipizzato solo se tutte le sue dichiarazioni visibili concordano;
+import, nomi sconosciuti e tipi diversi da quelli sotto restano non tipizzati e
+non vengono né specializzati né controllati.
+"""
+
+import operator
+import sys
+
+from chiron_runtime.locations import locations_of
+from chiron_runtime.nodes import DeclarationCallable
+from chiron_runtime.passes import Pass, Visitor, register
+
+# tipi dichiarabili noti al pass; char è una stringa di un carattere
+TYPE_NAMES = {'int': 'int', 'float': 'float', 'str': 'str', 'char': 'str', 'bool': 'bool'}
+
+NUMERIC = ('bool', 'int', 'float')
+
+ARITHMETIC_OPS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '%': operator.mod,
+}
+
+COMPARISON_OPS = {
+    '<':  operator.lt,
+    '>':  operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+# tipo di una variabile dichiarata in più modi incompatibili
+CONFLICT = object()
+
+
+# ——— Regole degli operatori ———
+
+def result_type(op, left, right):
+    """Tipo del risultato di `left op right`, o None se la combinazione non è valida."""
+    if op in ARITHMETIC_OPS:
+        if left in NUMERIC and right in NUMERIC:
+            if op == '/' or 'float' in (left, right):
+                return 'float'
+            return 'int'
+        if op == '+' and left == right == 'str':
+            return 'str'
+        if op == '*' and {left, right} in ({'str', 'int'}, {'str', 'bool'}):
+            return 'str'
+        if op == '%' and left == 'str':
+            return 'str'                # formattazione
+        return None
+    if op in ('==', '!='):
+        return 'bool'
+    if (left in NUMERIC and right in NUMERIC) or left == right == 'str':
+        return 'bool'
+    return None
+
+
+# ——— Implementazioni specializzate ———
+
+# operatore del percorso generico, per simbolo
+OPERATORS = {**ARITHMETIC_OPS, **COMPARISON_OPS}
+
+# tipo Python dei valori di ogni tipo del pass
+PY_TYPES = {'bool': bool, 'int': int, 'float': float, 'str': str}
+
+
+def spec_types(node):
+    """Tipi Python degli operandi di un binary_op annotato dal pass (`spec` 'int+int')."""
+    return tuple(PY_TYPES[name] for name in node.spec.split(node.op))
+
+
+def binary_handler(op, operands, types, fallback, params='env'):
+    """
+    Gestore di `a op b` specializzato per i tipi Python `types`, generato come codice
+    sorgente: l'operatore è in linea invece che chiamato con la funzione di operator.
+
+    Ogni operando è ('const', valore), ('slot', indice) per lo slot locale di `env`,
+    o ('read', funzione) chiamata con `params`. Il gestore controlla con
+    `type(x) is T` gli operandi non costanti; se il controllo fallisce restituisce
+    fallback(a, b, *params), con a e b già letti (uno slot può essere ancora UNSET).
+    """
+    namespace = {'fallback': fallback}
+    lines = [f"def specialized_binary_op({params}):"]
+    guards = []
+    for var, (kind, value), vtype in zip('ab', operands, types):
+        if kind == 'const':
+            namespace[f"{var}_const"] = value
+            lines.append(f"    {var} = {var}_const")
+            continue
+        if kind == 'slot':
+            lines.append(f"    {var} = env.slots[{value}]")
+        else:
+            namespace[f"{var}_read"] = value
+            lines.append(f"    {var} = {var}_read({params})")
+        namespace[f"{var}_type"] = vtype
+        guards.append(f"type({var}) is {var}_type")
+    if guards:
+        lines.append(f"    if {' and '.join(guards)}:")
+        lines.append(f"        return a {op} b")
+        lines.append(f"    return fallback(a, b, {params})")
+    else:
+        lines.append(f"    return a {op} b")
+    exec('\n'.join(lines), namespace)
+    return namespace['specialized_binary_op']
+
+
+def assignable(declared, actual):
+    """True se un valore di tipo `actual` può stare in una variabile `declared`."""
+    if declared == actual:
+        return True
+    if declared == 'float':
+        return actual in ('int', 'bool')
+    return declared == 'int' and actual == 'bool'
+
+
+# ——— Scope ———
+
+class TypeScope:
+    """Tipi dei nomi dichiarati in uno scope (callable, gestore except o globale)."""
+
+    def __init__(self, parent=None):
+        self.parent  = parent
+        self.types   = {}           # nome -> tipo, DeclarationCallable, None o CONFLICT
+        self.dynamic = False        # from ... import * : i nomi non dichiarati sono ignoti
+
+    def declare(self, name, value):
+        if name in self.types and self.types[name] is not value and self.types[name] != value:
+            value = CONFLICT
+        self.types[name] = value
+
+    def lookup(self, name):
+        """Tipo del nome; le dichiarazioni di scope diversi devono concordare."""
+        found = None
+        scope = self
+        while scope is not None:
+            if name in scope.types:
+                value = scope.types[name]
+                if value is None or value is CONFLICT:
+                    return None
+                if found is None:
+                    found = value
+                elif found is not value and found != value:
+                    # finché lo slot locale non è assegnato si legge quello esterno
+                    return None
+            elif scope.dynamic and found is None:
+                return None
+            scope = scope.parent
+        return found
+
+
+@register
+class SpecializeTypes(Visitor, Pass):
+    name  = 'type-specialize'
+    level = 2
+    after = ('counted-loops',)
+
+    def run(self, ast):
+        self.locations = locations_of(ast)
+        self.warnings  = []
+        self.untyped   = set()          # declaration, param o callable il cui tipo è smentito
+        while True:
+            known = len(self.untyped)
+            self.errors   = []
+            self.stmt     = None        # istruzione corrente, per la posizione degli errori
+            self.callable = None        # callable che contiene l'istruzione corrente
+            self.scope    = self.enter(ast, TypeScope())
+            self.visit_block(ast)
+            if len(self.untyped) == known:
+                break
+        for message in self.warnings + self.errors:
+            print(f"warning: {message}", file=sys.stderr)
+        return ast
+
+    def where(self, message):
+        position = self.locations.position(self.stmt)
+        if position is not None:
+            message = f"line {position[0]}, col {position[1]}: {message}"
+        return message
+
+    def error(self, message):
+        """Operazione che a runtime solleverebbe un errore: avviso dell'ultimo giro dell'analisi."""
+        self.errors.append(self.where(message))
+
+    def mismatch(self, node, message):
+        """Tipo dichiarato di `node` smentito: avviso, e da qui in poi il tipo è ignoto."""
+        if node not in self.untyped:
+            self.untyped.add(node)
+            self.warnings.append(self.where(message))
+
+    def declared(self, node, var_type):
+        return None if node in self.untyped else TYPE_NAMES.get(var_type)
+
+    # ——— Dichiarazioni ———
+
+    def enter(self, stmts, scope):
+        """Registra in `scope` i tipi di tutto ciò che il blocco dichiara, come il Resolver."""
+        for stmt in stmts or ():
+            t = stmt.type
+            if t == 'declaration':
+                scope.declare(stmt.name, self.declared(stmt, stmt.var_type))
+            elif t == 'declaration_callable':
+                scope.declare(stmt.name, stmt)
+            elif t == 'import':
+                for _, alias in stmt.modules:
+                    if alias is not None:
+                        scope.declare(alias, None)
+            elif t == 'from_import':
+                for name in stmt.names:
+                    if name == '*':
+                        scope.dynamic = True
+                    else:
+                        scope.declare(name, None)
+            elif t == 'if':
+                self.enter(stmt.body, scope)
+                self.enter(stmt.orelse, scope)
+            elif t == 'while':
+                self.enter(stmt.body, scope)
+            elif t == 'for':
+                self.enter([stmt.init], scope)
+                self.enter(stmt.body, scope)
+            elif t == 'try':
+                self.enter(stmt.body, scope)
+                self.enter(stmt.final, scope)
+        return scope
+
+    def visit_block(self, stmts):
+        for stmt in stmts or ():
+            self.stmt = stmt
+            self.visit(stmt)
+
+    def visit_declaration(self, node):
+        actual = self.infer(node.value)
+        declared = self.declared(node, node.var_type)
+        if declared is not None and actual is not None and not assignable(declared, actual):
+            self.mismatch(node, f"cannot assign '{actual}' to '{node.name}' declared as '{node.var_type}'")
+
+    def visit_declaration_callable(self, node):
+        if node.body is None:
+            return
+        scope = TypeScope(self.scope)
+        for param in node.params:
+            if param.default is not None:
+                actual = self.infer(param.default)
+                declared = self.declared(param, param.var_type)
+                if declared is not None and actual is not None and not assignable(declared, actual):
+                    self.mismatch(param, f"default of '{param.name}' in {node.name}() must be "
+                               f"'{param.var_type}', not '{actual}'")
+            scope.declare(param.name, self.declared(param, param.var_type))
+        outer = self.scope, self.callable, self.stmt
+        self.scope, self.callable = self.enter(node.body, scope), node
+        self.visit_block(node.body)
+        self.scope, self.callable, self.stmt = outer
+
+    def visit_try(self, node):
+        self.visit_block(node.body)
+        for handler in node.handlers:
+            # la variabile del gestore riceve il messaggio dell'eccezione
+            scope = TypeScope(self.scope)
+            scope.declare(handler.var, 'str')
+            outer = self.scope, self.stmt
+            self.scope = self.enter(handler.body, scope)
+            self.visit_block(handler.body)
+            self.scope, self.stmt = outer
+        self.visit_block(node.final)
+
+    def visit_if(self, node):
+        self.infer(node.condition)
+        self.visit_block(node.body)
+        self.stmt = node
+        self.visit_block(node.orelse)
+
+    def visit_while(self, node):
+        self.infer(node.condition)
+        self.visit_block(node.body)
+
+    def visit_for(self, node):
+        self.visit(node.init)
+        self.infer(node.condition)
+        self.infer(node.update)
+        self.visit_block(node.body)
+
+    def visit_return(self, node):
+        if node.expression is None or self.callable is None:
+            return
+        actual = self.infer(node.expression)
+        declared = self.declared(self.callable, self.callable.return_type)
+        if declared is not None and actual is not None and not assignable(declared, actual):
+            self.mismatch(self.callable, f"'{self.callable.name}' returns '{self.callable.return_type}', "
+                       f"not '{actual}'")
+
+    def visit_expr_stmt(self, node):
+        self.infer(node.expr)
+
+    def visit_call_callable(self, node):
+        # come istruzione il chiamato è un nome
+        self.check_call(node, self.scope.lookup(node.name), node.name)
+
+    # ——— Espressioni ———
+
+    def infer(self, node):
+        """Tipo dell'espressione (None se ignoto); annota i binary_op specializzabili."""
+        t = node.type
+
+        if t == 'literal':
+            value = node.value
+            if isinstance(value, bool):
+                return 'bool'
+            if isinstance(value, int):
+                return 'int'
+            if isinstance(value, float):
+                return 'float'
+            if isinstance(value, str):
+                return 'str'
+            return None
+
+        if t == 'identifier':
+            value = self.scope.lookup(node.name)
+            return value if isinstance(value, str) else None
+
+        if t == 'binary_op':
+            node.spec = None            # annotazione di un giro precedente dell'analisi
+            left, right = self.infer(node.left), self.infer(node.right)
+            if left is None or right is None:
+                return None
+            result = result_type(node.op, left, right)
+            if result is None:
+                self.error(f"unsupported operand types for {node.op}: '{left}' and '{right}'")
+                return None
+            node.spec = f"{left}{node.op}{right}"
+            return result
+
+        if t == 'logic':
+            # and/or restituiscono uno dei due operandi
+            left, right = self.infer(node.left), self.infer(node.right)
+            return left if left == right else None
+
+        if t == 'unary_logic':
+            self.infer(node.expr)
+            return 'bool'
+
+        if t == 'unary_op':
+            target = self.infer(node.expr)
+            if target == 'str':
+                self.error(f"unsupported operand type for {node.op[:2]}: 'str'")
+                return None
+            return 'int' if target == 'bool' else target
+
+        if t == 'call_callable':
+            name_node = node.name
+            if name_node.type == 'identifier':
+                return self.check_call(node, self.scope.lookup(name_node.name), name_node.name)
+            self.infer(name_node.object)
+            for arg in node.args:
+                self.infer(arg)
+            for value in node.kwargs.values():
+                self.infer(value)
+            return None
+
+        if t == 'get_attr':
+            self.infer(node.object)
+        return None
+
+    def check_call(self, node, func, name):
+        """Controlla gli argomenti di una chiamata e restituisce il tipo di ritorno."""
+        args = [self.infer(arg) for arg in node.args]
+        kwargs = {key: self.infer(value) for key, value in node.kwargs.items()}
+        if not isinstance(func, DeclarationCallable):
+            return None
+        params = func.params
+        if func.body is not None:
+            if len(args) > len(params):
+                self.error(f"{name}() takes {len(params)} arguments but {len(args)} were given")
+            names = [param.name for param in params]
+            for key in kwargs:
+                if key not in names:
+                    self.error(f"{name}() got an unexpected keyword argument '{key}'")
+                elif names.index(key) < len(args):
+                    self.error(f"{name}() got multiple values for argument '{key}'")
+            missing = [param.name for param in params[len(args):]
+                       if param.default is None and param.name not in kwargs]
+            if missing:
+                self.error(f"{name}() missing argument " + ', '.join(f"'{m}'" for m in missing))
+        by_name = {param.name: param for param in params}
+        actuals = list(zip(params, args))
+        actuals += [(by_name[key], actual) for key, actual in kwargs.items() if key in by_name]
+        for param, actual in actuals:
+            declared = self.declared(param, param.var_type)
+            if declared is not None and actual is not None and not assignable(declared, actual):
+                self.mismatch(param, f"argument '{param.name}' of {name}() must be '{param.var_type}', "
+                           f"not '{actual}'")
+        return self.declared(func, func.return_type)
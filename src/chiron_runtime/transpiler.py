@@ -0,0 +1,629 @@
+# chiron_runtime/transpiler.py
+
+import ast
+import os
+import sys
+
+from chiron_runtime import cache
+from chiron_runtime.interpreter import Interpreter, RuntimeError, load_module
+from chiron_runtime.locations import locations_of
+from chiron_runtime.nodes import ExprStmt, iter_children
+
+
+class TranspileError(Exception):
+    pass
+
+
+# ——— Runtime helpers visibili al codice generato ———
+
+def _logic_and(left, right):
+    return left and right
+
+
+def _logic_or(left, right):
+    return left or right
+
+
+def _from_import(mod_name, names):
+    module = load_module(mod_name)
+    values = []
+    for name in names:
+        if not hasattr(module, name):
+            raise RuntimeError(f"Il modulo '{mod_name}' non ha attributo '{name}'")
+        values.append(getattr(module, name))
+    return values
+
+
+def _star_import(mod_name, namespace):
+    # importa tutto ciò che non è privato
+    module = load_module(mod_name)
+    for attr in dir(module):
+        if not attr.startswith("_"):
+            namespace[attr] = getattr(module, attr)
+
+
+# default non literal di un parametro: il corpo valuta l'espressione se l'argomento manca
+_MISSING = object()
+
+
+RUNTIME_HELPERS = {
+    '__chy_missing':     _MISSING,
+    '__chy_import':      load_module,
+    '__chy_from_import': _from_import,
+    '__chy_star_import': _star_import,
+    '__chy_and':         _logic_and,
+    '__chy_or':          _logic_or,
+    '__chy_Exception':   Exception,
+    '__chy_type':        type,
+    '__chy_str':         str,
+}
+
+BINARY_OPS = {
+    '+': ast.Add, '-': ast.Sub, '*': ast.Mult, '/': ast.Div, '%': ast.Mod,
+}
+COMPARE_OPS = {
+    '<': ast.Lt, '>': ast.Gt, '<=': ast.LtE, '>=': ast.GtE, '==': ast.Eq, '!=': ast.NotEq,
+}
+
+# nomi Chiron validi che non possono comparire come ast.Name
+RESERVED_NAMES = {'None', 'True', 'False', '__debug__'}
+
+
+def _name(name, ctx=None):
+    if name in RESERVED_NAMES:
+        name += '_'
+    return ast.Name(id=name, ctx=ctx or ast.Load())
+
+
+def _helper(name, *args):
+    return ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=list(args), keywords=[])
+
+
+def _locate(pynode, line, col=0):
+    """Assegna la riga .chy ai nodi Python generati che non ne hanno ancora una."""
+    for sub in ast.walk(pynode):
+        if 'lineno' in sub._attributes and getattr(sub, 'lineno', None) is None:
+            sub.lineno = sub.end_lineno = line
+            sub.col_offset = sub.end_col_offset = col
+    return pynode
+
+
+def _cannot_raise(node, bound):
+    """
+    True se valutare l'espressione non ha effetti né può sollevare eccezioni: literal,
+    nomi in `bound` (parametri, sempre assegnati) e loro combinazioni con not/and/or.
+    Le operazioni binarie possono fallire (divisione per zero, tipi incompatibili).
+    """
+    t = node.type
+    if t == 'literal':
+        return True
+    if t == 'identifier':
+        return node.name in bound
+    if t == 'logic':
+        return _cannot_raise(node.left, bound) and _cannot_raise(node.right, bound)
+    if t == 'unary_logic':
+        return _cannot_raise(node.expr, bound)
+    return False
+
+
+def _declared_names(stmts, names):
+    """Raccoglie i nomi che un blocco dichiara nello scope della funzione corrente."""
+    for stmt in stmts or ():
+        t = stmt.type
+        if t in ('declaration', 'declaration_callable'):
+            names.add(stmt.name)
+        elif t == 'import':
+            names.update(alias for _, alias in stmt.modules if alias is not None)
+        elif t == 'from_import':
+            names.update(n for n in stmt.names if n != '*')
+        elif t == 'if':
+            _declared_names(stmt.body, names)
+            _declared_names(stmt.orelse, names)
+        elif t == 'while':
+            _declared_names(stmt.body, names)
+        elif t == 'for':
+            _declared_names([stmt.init], names)
+            _declared_names(stmt.body, names)
+        elif t == 'try':
+            _declared_names(stmt.body, names)
+            _declared_names(stmt.final, names)
+            for handler in stmt.handlers:
+                names.add(handler.var)
+                _declared_names(handler.body, names)
+    return names
+
+
+def _read_before_declared(stmts, names):
+    """
+    Nomi letti o incrementati prima della loro prima dichiarazione nel blocco, in ordine
+    di sorgente; `names` sono già dichiarati (parametri). Il valore di una dichiarazione
+    si legge prima che il nome esista: `int x = x + 1` legge la x esterna.
+    """
+    declared = set(names)
+    early = set()
+
+    def visit(node):
+        t = node.type
+        if t == 'declaration_callable':
+            declared.add(node.name)
+            return
+        if t == 'handler':
+            declared.add(node.var)
+        elif t == 'identifier' and node.name not in declared:
+            early.add(node.name)
+        elif t == 'call_callable' and isinstance(node.name, str) and node.name not in declared:
+            early.add(node.name)
+        for child in iter_children(node):
+            visit(child)
+        if t == 'declaration':
+            declared.add(node.name)
+        elif t == 'import':
+            declared.update(alias for _, alias in node.modules if alias is not None)
+        elif t == 'from_import':
+            declared.update(n for n in node.names if n != '*')
+
+    for stmt in stmts or ():
+        visit(stmt)
+    return early
+
+
+def _walk(stmts, skip=('declaration_callable',)):
+    """Visita i nodi di un blocco senza entrare nei tipi indicati in `skip`."""
+    stack = list(stmts or ())
+    while stack:
+        node = stack.pop()
+        if node.type in skip:
+            continue
+        yield node
+        stack.extend(iter_children(node))
+
+
+class FunctionScope:
+    """
+    Nomi di una funzione generata. I locali in `renamed` sono letti prima della loro
+    dichiarazione: in Python diventerebbero locali non assegnati (UnboundLocalError),
+    mentre in Chiron uno slot non ancora assegnato ricade sullo scope esterno. Hanno
+    quindi un nome proprio, inizializzato a __chy_missing, e le letture ricadono sul
+    nome esterno finché il locale non è assegnato.
+    """
+    __slots__ = ('locals', 'params', 'renamed', 'writes')
+
+    def __init__(self, locals, params, renamed):
+        self.locals  = locals
+        self.params  = params
+        self.renamed = renamed      # nome Chiron -> nome Python del locale
+        self.writes  = {}           # nomi Python esterni modificati -> 'global' o 'nonlocal'
+
+
+class Transpiler:
+    """
+    Traduce l'AST di Chiron in un ast.Module Python equivalente,
+    pronto per essere compilato con compile().
+    Le righe dei nodi Python puntano alle righe del sorgente .chy.
+    """
+
+    def __init__(self):
+        self.scopes = []        # FunctionScope delle funzioni aperte, dalla più esterna
+        self.exc_depth = 0
+        self.loop_flags = 0
+        self.locations = None   # SourceMap del programma, impostata da transpile()
+
+    # ——— Entry point ———
+
+    def transpile(self, chy_ast):
+        self.locations = locations_of(chy_ast)
+        body = []
+        # stesso ordine del tree walker: import, funzioni, poi main o codice globale
+        for stmt in chy_ast:
+            if stmt.type in ('import', 'from_import'):
+                body.extend(self.statement(stmt))
+        entry = None
+        for stmt in chy_ast:
+            if stmt.type == 'declaration_callable':
+                body.extend(self.statement(stmt))
+                if stmt.name == 'main':
+                    entry = stmt
+        if entry:
+            line, _ = self.position(entry)
+            body.append(_locate(ast.Expr(value=_helper('main')), line))
+        else:
+            for stmt in chy_ast:
+                if stmt.type not in ('declaration_callable', 'import', 'from_import'):
+                    body.extend(self.statement(stmt))
+        return ast.Module(body=body, type_ignores=[])
+
+    def position(self, node):
+        """Riga .chy e colonna Python (da 0) dell'istruzione; (1, 0) se non è nota."""
+        position = self.locations.position(node)
+        if position is None:
+            return 1, 0
+        return position[0], position[1] - 1
+
+    # ——— Nomi ———
+
+    def load(self, name, depth=None):
+        """Lettura di un nome visto dalla funzione `depth` (default: la corrente)."""
+        if depth is None:
+            depth = len(self.scopes) - 1
+        for i in range(depth, -1, -1):
+            scope = self.scopes[i]
+            if name in scope.renamed:
+                local = ast.Name(id=scope.renamed[name], ctx=ast.Load())
+                unset = ast.Compare(left=local, ops=[ast.IsNot()], comparators=[_name('__chy_missing')])
+                return ast.IfExp(test=unset, body=local, orelse=self.load(name, i - 1))
+            if name in scope.locals:
+                break
+        return _name(name)
+
+    def owner(self, name, depth=None):
+        """Indice della funzione più interna (fino a `depth`) che dichiara `name`; None se è globale."""
+        if depth is None:
+            depth = len(self.scopes) - 1
+        for i in range(depth, -1, -1):
+            if name in self.scopes[i].locals:
+                return i
+        return None
+
+    def store_id(self, name):
+        """Nome Python della variabile Chiron `name` nella funzione più interna che la dichiara."""
+        i = self.owner(name)
+        return name if i is None else self.scopes[i].renamed.get(name, name)
+
+    def store(self, name):
+        return _name(self.store_id(name), ast.Store())
+
+    def step(self, name, op, depth=None):
+        """
+        Espressione di ++/-- su `name`. Su un locale rinominato non ancora assegnato
+        aggiorna la variabile esterna, come Frame.set_var con uno slot UNSET.
+        """
+        i = self.owner(name, depth)
+        binop = ast.Add() if op.startswith('++') else ast.Sub()
+        if i is not None and name in self.scopes[i].renamed:
+            local = self.scopes[i].renamed[name]
+            unset = ast.Compare(left=ast.Name(id=local, ctx=ast.Load()), ops=[ast.IsNot()],
+                                comparators=[_name('__chy_missing')])
+            return ast.IfExp(test=unset, body=self.step_id(local, binop, op, i),
+                             orelse=self.step(name, op, i - 1))
+        return self.step_id(name, binop, op, i)
+
+    def step_id(self, py_name, binop, op, owner):
+        """++/-- sul nome Python `py_name` della funzione `owner` (None: globale)."""
+        self.note_write(py_name, owner)
+        step = ast.BinOp(left=_name(py_name), op=binop, right=ast.Constant(1))
+        assign = ast.NamedExpr(target=_name(py_name, ast.Store()), value=step)
+        if op.endswith('_pre'):
+            return assign
+        # post: (x, (x := x + 1))[0] restituisce il valore precedente
+        pair = ast.Tuple(elts=[_name(py_name), assign], ctx=ast.Load())
+        return ast.Subscript(value=pair, slice=ast.Constant(0), ctx=ast.Load())
+
+    def note_write(self, py_name, owner):
+        """Registra che la funzione corrente modifica un nome di un'altra funzione o globale."""
+        if self.scopes and owner != len(self.scopes) - 1:
+            self.scopes[-1].writes[_name(py_name).id] = 'global' if owner is None else 'nonlocal'
+
+    # ——— Statements ———
+
+    def block(self, stmts):
+        body = []
+        for stmt in stmts or ():
+            body.extend(self.statement(stmt))
+        return body or [ast.Pass()]
+
+    def statement(self, node):
+        stmts = self.statement_body(node)
+        line, col = self.position(node)
+        for stmt in stmts:
+            _locate(stmt, line, col)
+        return stmts
+
+    def statement_body(self, node):
+        t = node.type
+
+        if t == 'import':
+            stmts = []
+            for mod_name, alias in node.modules:
+                call = _helper('__chy_import', ast.Constant(mod_name))
+                if alias is None:
+                    stmts.append(ast.Expr(value=call))
+                else:
+                    stmts.append(ast.Assign(targets=[self.store(alias)], value=call))
+            return stmts
+
+        if t == 'from_import':
+            mod_name = node.module
+            if '*' in node.names:
+                if self.scopes:
+                    raise TranspileError(
+                        f"'from {mod_name} import *' non è supportato dentro un callable dal backend python"
+                    )
+                return [ast.Expr(value=_helper('__chy_star_import', ast.Constant(mod_name),
+                                                ast.Name(id='__chy_namespace', ctx=ast.Load())))]
+            targets = ast.Tuple(elts=[self.store(n) for n in node.names], ctx=ast.Store())
+            names = ast.Tuple(elts=[ast.Constant(n) for n in node.names], ctx=ast.Load())
+            return [ast.Assign(targets=[targets],
+                               value=_helper('__chy_from_import', ast.Constant(mod_name), names))]
+
+        if t == 'declaration':
+            return [ast.Assign(targets=[self.store(node.name)], value=self.expression(node.value))]
+
+        if t == 'declaration_callable':
+            return [self.function(node)]
+
+        if t == 'call_callable':
+            keywords = [ast.keyword(arg=key, value=self.expression(val))
+                        for key, val in node.kwargs.items()]
+            call = ast.Call(func=self.load(node.name), args=[self.expression(a) for a in node.args],
+                            keywords=keywords)
+            return [ast.Expr(value=call)]
+
+        if t == 'return':
+            if not self.scopes:
+                raise TranspileError("'return' fuori da un callable")
+            value = None if node.expression is None else self.expression(node.expression)
+            return [ast.Return(value=value)]
+
+        if t == 'try':
+            return self.try_statement(node)
+
+        if t == 'if':
+            orelse = self.block(node.orelse) if node.orelse else []
+            return [ast.If(test=self.expression(node.condition), body=self.block(node.body), orelse=orelse)]
+
+        if t == 'while':
+            return [ast.While(test=self.expression(node.condition), body=self.block(node.body), orelse=[])]
+
+        if t == 'for':
+            return self.for_statement(node)
+
+        if t == 'expr_stmt':
+            expr = node.expr
+            if expr.type == 'unary_op':
+                name = expr.target
+                i = self.owner(name)
+                if i is not None and name in self.scopes[i].renamed:
+                    return [ast.Expr(value=self.step(name, expr.op))]
+                # `i:++;` diventa `i += 1`
+                self.note_write(name, i)
+                op = ast.Add() if expr.op.startswith('++') else ast.Sub()
+                return [ast.AugAssign(target=_name(name, ast.Store()), op=op, value=ast.Constant(1))]
+            return [ast.Expr(value=self.expression(expr))]
+
+        if t == 'break':
+            return [ast.Break()]
+
+        if t == 'continue':
+            return [ast.Continue()]
+
+        raise TranspileError(f"Unknown statement type: {t}")
+
+    def function(self, node):
+        params = [param.name for param in node.params]
+        body_nodes = node.body or []
+
+        # i default literal restano default Python; gli altri si valutano a ogni chiamata
+        # che li usa, come negli altri backend, con un prologo nel corpo
+        defaults, fill = [], []
+        for param in node.params:
+            default = param.default
+            if default is None:
+                continue
+            if default.type == 'literal':
+                defaults.append(ast.Constant(default.value))
+                continue
+            defaults.append(_name('__chy_missing'))
+            fill.append(ast.If(
+                test=ast.Compare(left=_name(param.name), ops=[ast.Is()],
+                                 comparators=[_name('__chy_missing')]),
+                body=[ast.Assign(targets=[_name(param.name, ast.Store())],
+                                 value=self.expression(default))],
+                orelse=[]))
+
+        local_names = _declared_names(body_nodes, set(params))
+        # anche i default, valutati nel prologo del corpo, leggono i nomi esterni
+        defaults_read = _read_before_declared([p.default for p in node.params if p.default is not None], ())
+        early = (_read_before_declared(body_nodes, params) | defaults_read) & local_names
+        renamed = {name: f'__chy_local_{name}' for name in sorted(early)}
+        scope = FunctionScope(local_names, set(params), renamed)
+        self.scopes.append(scope)
+        body = fill + self.block(body_nodes)
+        self.scopes.pop()
+        unset = [ast.Assign(targets=[ast.Name(id=local, ctx=ast.Store())], value=_name('__chy_missing'))
+                 for local in renamed.values()]
+
+        # i nomi incrementati ma non dichiarati appartengono a uno scope esterno
+        globals_ = sorted(name for name, kind in scope.writes.items() if kind == 'global')
+        nonlocals = sorted(name for name, kind in scope.writes.items() if kind == 'nonlocal')
+        prelude = []
+        if globals_:
+            prelude.append(ast.Global(names=globals_))
+        if nonlocals:
+            prelude.append(ast.Nonlocal(names=nonlocals))
+
+        args = ast.arguments(
+            posonlyargs=[], args=[ast.arg(arg=p) for p in params], vararg=None,
+            kwonlyargs=[], kw_defaults=[], kwarg=None, defaults=defaults,
+        )
+        return ast.FunctionDef(name=node.name, args=args, body=prelude + unset + body, decorator_list=[],
+                               returns=None)
+
+    def for_statement(self, node):
+        init = self.statement(node.init)
+        cond = self.expression(node.condition)
+        update = ast.Expr(value=self.expression(node.update))
+        if node.update.type == 'unary_op':
+            update = self.statement_body(ExprStmt(node.update))[0]
+        body = self.block(node.body)
+
+        loop_nodes = _walk(node.body, skip=('declaration_callable', 'while', 'for'))
+        if not any(n.type == 'continue' for n in loop_nodes):
+            return init + [ast.While(test=cond, body=body + [update], orelse=[])]
+
+        # con `continue` l'update deve comunque essere eseguito prima della condizione
+        self.loop_flags += 1
+        first = f'__chy_first{self.loop_flags}'
+        loop_body = [
+            ast.If(test=ast.UnaryOp(op=ast.Not(), operand=ast.Name(id=first, ctx=ast.Load())),
+                   body=[update], orelse=[]),
+            ast.Assign(targets=[ast.Name(id=first, ctx=ast.Store())], value=ast.Constant(False)),
+            ast.If(test=ast.UnaryOp(op=ast.Not(), operand=cond), body=[ast.Break()], orelse=[]),
+        ] + body
+        return init + [
+            ast.Assign(targets=[ast.Name(id=first, ctx=ast.Store())], value=ast.Constant(True)),
+            ast.While(test=ast.Constant(True), body=loop_body, orelse=[]),
+        ]
+
+    def try_statement(self, node):
+        body = self.block(node.body)
+        final = self.block(node.final) if node.final else []
+        handlers = node.handlers
+        if not handlers and not final:
+            return body
+
+        py_handlers = []
+        if handlers:
+            self.exc_depth += 1
+            exc = f'__chy_exc{self.exc_depth}'
+            # come il tree walker: confronto sul nome del tipo, 'Exception' cattura tutto
+            chain = [ast.Raise(exc=None, cause=None)]
+            for handler in reversed(handlers):
+                bind = ast.Assign(targets=[self.store(handler.var)],
+                                  value=_helper('__chy_str', ast.Name(id=exc, ctx=ast.Load())))
+                if handler.exception == 'Exception':
+                    chain = [bind] + self.block(handler.body)
+                    continue
+                test = ast.Compare(
+                    left=ast.Attribute(value=_helper('__chy_type', ast.Name(id=exc, ctx=ast.Load())),
+                                       attr='__name__', ctx=ast.Load()),
+                    ops=[ast.In()],
+                    comparators=[ast.Tuple(elts=[ast.Constant(handler.exception), ast.Constant('Exception')],
+                                           ctx=ast.Load())],
+                )
+                chain = [ast.If(test=test, body=[bind] + self.block(handler.body), orelse=chain)]
+            self.exc_depth -= 1
+            py_handlers.append(ast.ExceptHandler(
+                type=ast.Name(id='__chy_Exception', ctx=ast.Load()), name=exc, body=chain,
+            ))
+        return [ast.Try(body=body, handlers=py_handlers, orelse=[], finalbody=final)]
+
+    # ——— Expressions ———
+
+    def expression(self, node):
+        t = node.type
+
+        if t == 'literal':
+            return ast.Constant(node.value)
+
+        if t == 'identifier':
+            return self.load(node.name)
+
+        if t == 'binary_op':
+            op = node.op
+            left = self.expression(node.left)
+            right = self.expression(node.right)
+            if op in BINARY_OPS:
+                return ast.BinOp(left=left, op=BINARY_OPS[op](), right=right)
+            if op in COMPARE_OPS:
+                return ast.Compare(left=left, ops=[COMPARE_OPS[op]()], comparators=[right])
+            raise TranspileError(f"Unknown binary operator {op}")
+
+        if t == 'logic':
+            left = self.expression(node.left)
+            right = self.expression(node.right)
+            bound = self.scopes[-1].params if self.scopes else ()
+            if _cannot_raise(node.right, bound):
+                op = ast.And() if node.op == 'and' else ast.Or()
+                return ast.BoolOp(op=op, values=[left, right])
+            # l'operando destro può avere effetti o fallire: va valutato comunque, come nel tree walker
+            return _helper('__chy_and' if node.op == 'and' else '__chy_or', left, right)
+
+        if t == 'unary_logic':
+            return ast.UnaryOp(op=ast.Not(), operand=self.expression(node.expr))
+
+        if t == 'unary_op':
+            name = node.target
+            op = node.op
+            if op not in ('++_pre', '--_pre', '++_post', '--_post'):
+                raise TranspileError(f"Unknown unary op {op}")
+            return self.step(name, op)
+
+        if t == 'call_callable':
+            name_node = node.name
+            if name_node.type == 'identifier':
+                func = self.load(name_node.name)
+            elif name_node.type == 'get_attr':
+                func = ast.Attribute(value=self.expression(name_node.object), attr=name_node.attr,
+                                     ctx=ast.Load())
+            else:
+                raise TranspileError(f"Invalid function name: {name_node}")
+            keywords = [ast.keyword(arg=key, value=self.expression(val))
+                        for key, val in node.kwargs.items()]
+            return ast.Call(func=func, args=[self.expression(a) for a in node.args], keywords=keywords)
+
+        if t == 'get_attr':
+            return ast.Attribute(value=self.expression(node.object), attr=node.attr, ctx=ast.Load())
+
+        raise TranspileError(f"Unknown expression type {t}")
+
+
+# ——— Cache su disco del codice generato ———
+
+# il bytecode Python dipende dalla versione dell'interprete che lo ha prodotto
+CODE_SUFFIX = f".{sys.implementation.cache_tag}.pyc"
+
+
+class PythonBackend(Interpreter):
+    """
+    Backend che traduce il programma in codice Python e lo esegue con compile()/exec().
+    """
+
+    def __init__(self, devMode=False):
+        super().__init__(devMode)
+        self.namespace = None
+
+    def compile_ast(self, chy_ast, filename='<chiron>'):
+        module = Transpiler().transpile(chy_ast)
+        return compile(module, filename, 'exec')
+
+    def execute(self, code):
+        namespace = dict(RUNTIME_HELPERS)
+        namespace['__builtins__'] = {}          # solo i nomi definiti dal programma
+        namespace['__chy_namespace'] = namespace
+        self.namespace = namespace
+        exec(code, namespace)
+        if self.devMode: self.dump_env()
+
+    def interpret(self, ast):
+        self.execute(self.compile_ast(ast))
+
+    def run_source(self, source, path, use_cache=True, optimizer=None):
+        if not use_cache or self.devMode:
+            chy_ast = cache.parse_source(source, optimizer=optimizer, dev_mode=self.devMode)
+            self.execute(self.compile_ast(chy_ast, os.path.abspath(path)))
+            return
+        level = 'raw' if optimizer is None else optimizer.tag
+        key = cache.source_key(source, f"python-{level}")
+        code = cache.load(path, key, CODE_SUFFIX, level)
+        if code is None:
+            chy_ast = cache.parse_source(source, path, optimizer=optimizer)
+            code = self.compile_ast(chy_ast, os.path.abspath(path))
+            cache.store(path, key, code, CODE_SUFFIX, level)
+        self.execute(code)
+
+    def dump_env(self):
+        print("\n=== Ambiente finale ===")
+        for name, val in self.namespace.items():
+            if not name.startswith('__'):
+                print(f"{name} = {val}")
+
+
+if __name__ == '__main__':
+    # uso: python -m chiron_runtime.transpiler <file.chy>  → stampa il Python generato
+    from chiron_runtime.lexer import Lexer
+    from chiron_runtime.parser import Parser
+
+    with open(sys.argv[1]) as f:
+        source = f.read()
+    module = Transpiler().transpile(Parser(Lexer(source).tokenize()).parse())
+    print(ast.unparse(module))
@@ -0,0 +1,271 @@
+# chiron_runtime/vm.py
+
+from chiron_runtime.interpreter import Interpreter, Environment, RuntimeError
+from chiron_runtime.compiler import (
+    Compiler, BINARY_FUNCS,
+    LOAD_CONST, LOAD_NAME, LOAD_FUNC, STORE_NAME, STORE_FUNC, LOAD_ATTR,
+    BINARY_OP, UNARY_NOT, PRE_INC, PRE_DEC, POST_INC, POST_DEC,
+    CALL, CALL_KW, POP_TOP, JUMP, POP_JUMP_IF_FALSE, RETURN_VALUE,
+    MAKE_FUNCTION, IMPORT, FROM_IMPORT, SETUP_EXCEPT, POP_BLOCK,
+    PUSH_SCOPE, POP_SCOPE, MATCH_EXCEPT, BIND_EXCEPT, RERAISE, INC_NAME, DEC_NAME,
+)
+
+
+def scope_vars(params, args):
+    """Dizionario dello scope di una chiamata con l'arità esatta; None senza parametri."""
+    n = len(params)
+    if n == 1:
+        return {params[0]: args[0]}
+    if n == 2:
+        return {params[0]: args[0], params[1]: args[1]}
+    # lo scope resta senza dizionario finché il corpo non definisce qualcosa
+    return dict(zip(params, args)) if n else None
+
+
+class Function:
+    """Callable Chiron compilato: CodeObject più l'ambiente in cui è stato definito."""
+    __slots__ = ('vm', 'code', 'env')
+
+    def __init__(self, vm, code, env):
+        self.vm   = vm
+        self.code = code
+        self.env  = env
+
+    def __call__(self, *args, **kwargs):
+        # chiamata da codice Python (es. callback) o con keyword: riparte un ciclo della VM
+        code = self.code
+        if kwargs or len(args) != len(code.params):
+            return self.vm.run(code, self.vm.bind_args(self, args, kwargs))
+        # arità esatta: lo scope nasce già pieno, senza passare da bind_args
+        return self.vm.run(code, Environment(self.env, scope_vars(code.params, args)))
+
+    def __repr__(self):
+        return f"<callable {self.code.name}>"
+
+
+class Frame:
+    __slots__ = ('code', 'pc', 'stack', 'env', 'blocks')
+
+    def __init__(self, code, env):
+        self.code   = code
+        self.pc     = 0
+        self.stack  = []
+        self.env    = env
+        self.blocks = []      # (pc del gestore, profondità dello stack, env)
+
+
+class VM(Interpreter):
+    """
+    Esegue il bytecode prodotto da chiron_runtime.compiler con un unico ciclo
+    fetch/dispatch. Le chiamate tra callable Chiron non usano la ricorsione
+    Python: ogni chiamata spinge un Frame su uno stack esplicito.
+    """
+
+    def run_program(self, ast):
+        module = Compiler().compile_module(ast)
+        self.run(module, self.global_env)
+        if self.devMode: self.dump_env()
+
+    def is_chiron_callable(self, func):
+        return type(func) is Function
+
+    def error_calls(self, error):
+        """
+        Come nel tree walker, ma dalle coppie (frame, pc) che run() registra in
+        `chy_trace` mentre l'eccezione risale. Un frame compare più volte se un try
+        rilancia l'eccezione: vale la prima posizione, quella dove è nata.
+        """
+        offsets = self.locations.offsets
+        trace = []
+        seen = set()
+        for frame, pc in getattr(error, 'chy_trace', ()):
+            if id(frame) not in seen:
+                seen.add(id(frame))
+                trace.append((frame.code, pc))
+        calls = []
+        for code, pc in reversed(trace):
+            node = code.statement_at(pc)
+            name = '<global>' if code.name == '<module>' else code.name
+            calls.append([name, node if node in offsets else None])
+        return calls or [['<global>', None]]
+
+    def bind_args(self, func, args, kwargs=None):
+        code = func.code
+        params = code.params
+        if kwargs or len(args) != len(params):
+            # keyword, default o errore di arità: il piano dà i valori di tutti i parametri
+            args = code.plan.bind(args, kwargs, lambda default: self.run(default, func.env))
+        return Environment(func.env, scope_vars(params, args))
+
+    def run(self, code, env):
+        frame = Frame(code, env)
+        frames = []           # frame chiamanti, dal più esterno
+
+        ops    = frame.code.code
+        consts = frame.code.consts
+        names  = frame.code.names
+        stack  = frame.stack
+        blocks = frame.blocks
+        pc     = 0
+        push   = stack.append
+        pop    = stack.pop
+        interop = self.interop
+
+        while True:
+            try:
+                while True:
+                    op  = ops[pc]
+                    arg = ops[pc + 1]
+                    pc += 2
+
+                    if op == LOAD_NAME:
+                        push(env.get_var(names[arg]))
+                    elif op == LOAD_CONST:
+                        push(consts[arg])
+                    elif op == BINARY_OP:
+                        right = pop()
+                        stack[-1] = BINARY_FUNCS[arg](stack[-1], right)
+                    elif op == POP_JUMP_IF_FALSE:
+                        if not pop():
+                            pc = arg
+                    elif op == POP_TOP:
+                        pop()
+                    elif op == JUMP:
+                        pc = arg
+                    elif op == INC_NAME:
+                        name = names[arg]
+                        env.set_var(name, env.get_var(name) + 1)
+                    elif op == POST_INC:
+                        name = names[arg]
+                        old = env.get_var(name)
+                        env.set_var(name, old + 1)
+                        push(old)
+                    elif op == CALL:
+                        if arg:
+                            args = stack[-arg:]
+                            del stack[-arg:]
+                        else:
+                            args = ()
+                        func = pop()
+                        if type(func) is Function:
+                            # gli argomenti si legano prima di sospendere il chiamante:
+                            # un errore di arità resta nel suo frame
+                            callee = Frame(func.code, self.bind_args(func, args))
+                            frame.pc = pc
+                            frame.env = env
+                            frames.append(frame)
+                            frame  = callee
+                            ops    = frame.code.code
+                            consts = frame.code.consts
+                            names  = frame.code.names
+                            stack  = frame.stack
+                            blocks = frame.blocks
+                            env    = frame.env
+                            push   = stack.append
+                            pop    = stack.pop
+                            pc     = 0
+                        elif interop is None:
+                            push(func(*args))
+                        else:
+                            push(interop.call(func, args))
+                    elif op == RETURN_VALUE:
+                        value = pop()
+                        if not frames:
+                            return value
+                        frame  = frames.pop()
+                        ops    = frame.code.code
+                        consts = frame.code.consts
+                        names  = frame.code.names
+                        stack  = frame.stack
+                        blocks = frame.blocks
+                        env    = frame.env
+                        push   = stack.append
+                        pop    = stack.pop
+                        pc     = frame.pc
+                        push(value)
+                    elif op == LOAD_FUNC:
+                        push(env.get_func(names[arg]))
+                    elif op == STORE_NAME:
+                        env.define_var(names[arg], pop())
+                    elif op == LOAD_ATTR:
+                        stack[-1] = getattr(stack[-1], names[arg])
+                    elif op == UNARY_NOT:
+                        stack[-1] = not stack[-1]
+                    elif op == PRE_INC:
+                        name = names[arg]
+                        value = env.get_var(name) + 1
+                        env.set_var(name, value)
+                        push(value)
+                    elif op == PRE_DEC:
+                        name = names[arg]
+                        value = env.get_var(name) - 1
+                        env.set_var(name, value)
+                        push(value)
+                    elif op == DEC_NAME:
+                        name = names[arg]
+                        env.set_var(name, env.get_var(name) - 1)
+                    elif op == POST_DEC:
+                        name = names[arg]
+                        old = env.get_var(name)
+                        env.set_var(name, old - 1)
+                        push(old)
+                    elif op == CALL_KW:
+                        kw_names = pop()
+                        args = stack[-arg:]
+                        del stack[-arg:]
+                        func = pop()
+                        split = len(args) - len(kw_names)
+                        kw_args = dict(zip(kw_names, args[split:]))
+                        if interop is None:
+                            push(func(*args[:split], **kw_args))
+                        else:
+                            push(interop.call(func, args[:split], kw_args))
+                    elif op == STORE_FUNC:
+                        env.define_func(names[arg], pop())
+                    elif op == MAKE_FUNCTION:
+                        push(Function(self, consts[arg], env))
+                    elif op == SETUP_EXCEPT:
+                        blocks.append((arg, len(stack), env))
+                    elif op == POP_BLOCK:
+                        blocks.pop()
+                    elif op == PUSH_SCOPE:
+                        env = Environment(env)
+                    elif op == POP_SCOPE:
+                        env = env.parent
+                    elif op == MATCH_EXCEPT:
+                        push(consts[arg] in (type(stack[-1]).__name__, 'Exception'))
+                    elif op == BIND_EXCEPT:
+                        env.define_var(names[arg], str(stack[-1]))
+                    elif op == RERAISE:
+                        raise pop()
+                    elif op == IMPORT:
+                        self._exec_import(consts[arg], env)
+                    elif op == FROM_IMPORT:
+                        self._exec_from_import(consts[arg], env)
+                    else:
+                        raise RuntimeError(f"Unknown opcode {op}")
+
+            except Exception as exc:
+                # istruzioni attraversate dall'eccezione, per format_error: l'opcode che
+                # l'ha sollevata e le chiamate dei frame chiusi, dopo quelle delle run
+                # annidate (callback chiamate da Python)
+                trace = getattr(exc, 'chy_trace', None)
+                if trace is None:
+                    trace = exc.chy_trace = []
+                trace.append((frame, pc - 2))
+                # risale i frame fino al primo blocco try attivo
+                while not blocks:
+                    if not frames:
+                        raise
+                    frame  = frames.pop()
+                    trace.append((frame, frame.pc - 2))
+                    ops    = frame.code.code
+                    consts = frame.code.consts
+                    names  = frame.code.names
+                    stack  = frame.stack
+                    blocks = frame.blocks
+                    push   = stack.append
+                    pop    = stack.pop
+                pc, depth, env = blocks.pop()
+                del stack[depth:]
+                push(exc)
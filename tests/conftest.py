@@ -0,0 +1,10 @@
+# tests/conftest.py
+
+"""Percorso del runtime per i test, come in benchmarks/common.py."""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, ROOT)
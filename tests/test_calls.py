@@ -0,0 +1,45 @@
+# tests/test_calls.py
+
+"""Chiamate ai callable: le forme ad arità fissa legano keyword e segnalano gli errori come il piano."""
+
+import pytest
+
+from chiron_runtime.cache import parse_source
+from chiron_runtime.closures import ClosureInterpreter
+from chiron_runtime.interpreter import Interpreter
+from chiron_runtime.vm import VM
+
+BACKENDS = {'tree': Interpreter, 'closure': ClosureInterpreter, 'vm': VM}
+
+PROGRAM = """\
+from std.io import *;
+import builtins as py;
+callable one(int x) -> int { int y = x * 2; return y + 1; };
+callable two(int a, int b) -> int { return a - b; };
+print(one(3));
+print(one(x = 4));
+print(two(b = 1, a = 10));
+auto alias = two;
+print(alias(b = 3, a = 4));
+print(py.sum(py.map(two, py.range(5), py.range(3))));
+try { one(1, 2); } except RuntimeError as e { print(e); }
+try { two(1); } except RuntimeError as e { print(e); }
+try { two(1, a = 2); } except RuntimeError as e { print(e); }
+"""
+
+EXPECTED = """\
+7
+9
+9
+1
+0
+one() takes 1 arguments but 2 were given
+two() missing argument 'b'
+two() got multiple values for argument 'a'
+"""
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_fixed_arity_calls(backend, capsys):
+    BACKENDS[backend]().interpret(parse_source(PROGRAM))
+    assert capsys.readouterr().out == EXPECTED
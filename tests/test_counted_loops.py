@@ -0,0 +1,92 @@
+# tests/test_counted_loops.py
+
+"""Pass counted-loops: un for resta un ciclo normale se un callable può cambiarne il limite."""
+
+import pytest
+
+from chiron_runtime.cache import parse_source
+from chiron_runtime.closures import ClosureInterpreter
+from chiron_runtime.interpreter import Interpreter
+from chiron_runtime.nodes import iter_children
+from chiron_runtime.passes import PassManager
+from chiron_runtime.transpiler import PythonBackend
+from chiron_runtime.vm import VM
+
+BACKENDS = {'tree': Interpreter, 'closure': ClosureInterpreter, 'vm': VM, 'python': PythonBackend}
+
+# il limite n è globale e lo decrementa un callable globale chiamato dal corpo del ciclo,
+# che sta in un altro callable
+GLOBAL_BOUND = """\
+from std.io import *;
+int n = 5;
+callable bump() -> void { n:--; };
+callable run() -> void { for (int i = 0; i < n; i:++) { bump(); print(i); } };
+run();
+"""
+
+LOCAL_BOUND = """\
+from std.io import *;
+callable run() -> void { int n = 3; for (int i = 0; i < n; i:++) { print(i); } };
+run();
+"""
+
+
+def loops(tree):
+    """I for del programma, in qualsiasi callable."""
+    stack = list(tree)
+    while stack:
+        node = stack.pop()
+        if node.type == 'for':
+            yield node
+        stack.extend(iter_children(node))
+
+
+def test_bound_written_by_other_callable_is_not_counted():
+    tree = parse_source(GLOBAL_BOUND, optimizer=PassManager(1))
+    assert [bool(loop.counted) for loop in loops(tree)] == [False]
+
+
+def test_local_bound_is_counted():
+    tree = parse_source(LOCAL_BOUND, optimizer=PassManager(1))
+    assert [bool(loop.counted) for loop in loops(tree)] == [True]
+
+
+@pytest.mark.parametrize('level', [0, 1, 2])
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_bound_written_by_other_callable(backend, level, capsys):
+    optimizer = PassManager(level) if level else None
+    BACKENDS[backend]().interpret(parse_source(GLOBAL_BOUND, optimizer=optimizer))
+    assert capsys.readouterr().out.split() == ['0', '1', '2']
+
+
+# il limite è ridefinito nel corpo del ciclo da un callable o da un import con lo
+# stesso nome: al giro dopo il confronto fallisce come a -O0
+REBOUND = {
+    'callable': """\
+from std.io import *;
+int m = 3;
+for (int j = 0; j < m; j:++) { print(j); callable m() -> int { return 0; }; }
+""",
+    'import': """\
+from std.io import *;
+int n = 3;
+for (int i = 0; i < n; i:++) { print(i); if (i == 1) { import math as n; } }
+""",
+}
+
+
+@pytest.mark.parametrize('case', list(REBOUND))
+def test_rebound_bound_is_not_counted(case):
+    tree = parse_source(REBOUND[case], optimizer=PassManager(1))
+    assert [bool(loop.counted) for loop in loops(tree)] == [False]
+
+
+@pytest.mark.parametrize('level', [0, 1, 2])
+@pytest.mark.parametrize('backend', list(BACKENDS))
+@pytest.mark.parametrize('case', list(REBOUND))
+def test_rebound_bound(case, backend, level, capsys):
+    optimizer = PassManager(level) if level else None
+    with pytest.raises(Exception, match="'<' not supported"):
+        BACKENDS[backend]().interpret(parse_source(REBOUND[case], optimizer=optimizer))
+    expected = ['0'] if case == 'callable' else ['0', '1']
+    assert capsys.readouterr().out.split() == expected
@@ -0,0 +1,41 @@
+# tests/test_errors.py
+
+"""Errori a runtime: posizione .chy e traceback delle chiamate uguali in tree, closure e vm."""
+
+import pytest
+
+from chiron_runtime.cache import parse_source
+from chiron_runtime.closures import ClosureInterpreter
+from chiron_runtime.interpreter import Interpreter, RuntimeError as ChironError
+from chiron_runtime.vm import VM
+
+BACKENDS = {'tree': Interpreter, 'closure': ClosureInterpreter, 'vm': VM}
+
+PROGRAM = """\
+import builtins as py;
+callable f(int n) -> int {
+    if (n > 2) {
+        return 10 / (n - n);
+    }
+    return f(n + 1);
+};
+callable key(int x) -> int {
+    return f(x);
+};
+auto ys = py.sorted(py.range(2, 3), key = key);
+"""
+
+EXPECTED = """\
+ChironError at line 4, col 9: division by zero
+Traceback (.chy, most recent call last):
+  line 11, col 1, in <global>
+  line 9, col 5, in key
+  line 6, col 5, in f
+  line 4, col 9, in f"""
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_error_points_into_source(backend):
+    with pytest.raises(ChironError) as info:
+        BACKENDS[backend]().interpret(parse_source(PROGRAM))
+    assert str(info.value) == EXPECTED
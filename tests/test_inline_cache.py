@@ -0,0 +1,33 @@
+# tests/test_inline_cache.py
+
+"""Inline cache delle chiamate di metodo: hit dei tipi built-in, getattr per i moduli."""
+
+import pytest
+
+from chiron_runtime.cache import parse_source
+from chiron_runtime.closures import ClosureInterpreter
+from chiron_runtime.interpreter import Interpreter
+
+BACKENDS = {'tree': Interpreter, 'closure': ClosureInterpreter}
+
+CALLS = """\
+from std.io import *;
+import math as math;
+import builtins as py;
+auto xs = py.list();
+for (int i = 0; i < 10; i:++) { xs.append(math.sqrt(i * i)); }
+print(py.len(xs), xs.pop());
+"""
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_method_and_module_call_sites(backend, capsys):
+    interpreter = BACKENDS[backend]()
+    interpreter.interpret(parse_source(CALLS))
+    assert capsys.readouterr().out.split() == ['10', '9.0']
+    caches = {cache.attr: cache for cache in interpreter.call_caches}
+    # list.append è in cache dalla seconda chiamata
+    assert (caches['append'].hits, caches['append'].misses) == (9, 1)
+    # il modulo resta un esito negativo: nessuna nuova ricerca dopo il primo miss
+    assert caches['sqrt'].func is None
+    assert (caches['sqrt'].hits, caches['sqrt'].misses) == (0, 1)
@@ -0,0 +1,44 @@
+# tests/test_parser.py
+
+"""Parser: messaggi d'errore e modalità di sviluppo con traccia."""
+
+import io
+
+import pytest
+
+from chiron_runtime.lexer import Lexer
+from chiron_runtime.parser import Parser, SyntaxError as ChironSyntaxError, TracedParser
+
+
+def parse_error(source):
+    with pytest.raises(ChironSyntaxError) as info:
+        Parser(Lexer(source).tokenize()).parse()
+    return str(info.value)
+
+
+@pytest.mark.parametrize('source, message', [
+    # le parole chiave sono token 'ID' nei messaggi, come prima del lexer a interi
+    ('int x = 1\nint y = 2;', "Expected SEMICOLON but got Token('ID', 'int', line=2, col=1)"),
+    ('int x = 2 as;', "Expected SEMICOLON but got Token('ID', 'as', line=1, col=11)"),
+    ('callable f(int a) int { return a; };', "Expected ARROW but got Token('ID', 'int', line=1, col=19)"),
+    ('if (x < 1 { }', "Expected RPAREN but got Token('LBRACE', '{', line=1, col=11)"),
+    ('try { } except ValueError e { }', "Expected 'as' but got Token('ID', 'e', line=1, col=27)"),
+])
+def test_error_messages(source, message):
+    assert parse_error(source) == message
+
+
+def test_dev_mode_creates_traced_parser():
+    tokens = Lexer('int x = 1;').tokenize()
+    assert type(Parser(tokens)) is Parser
+    parser = Parser(tokens, dev_mode=True)
+    assert isinstance(parser, TracedParser) and parser.dev_mode
+    assert [stmt.name for stmt in parser.parse()] == ['x']
+
+
+def test_dev_mode_dumps_trace_on_error():
+    out = io.StringIO()
+    parser = TracedParser(Lexer('int x = 1\nint y = 2;').tokenize(), out=out)
+    with pytest.raises(ChironSyntaxError):
+        parser.parse()
+    assert 'parse_declaration' in out.getvalue()
@@ -0,0 +1,52 @@
+# tests/test_quicken.py
+
+"""Quickening del tree walker: deottimizzazione e nodi con tipi instabili."""
+
+from chiron_runtime.cache import parse_source
+from chiron_runtime.interpreter import Interpreter
+from chiron_runtime.nodes import iter_children
+from chiron_runtime.quicken import GENERIC, QUICKEN_AFTER
+
+# l'operando sinistro è una chiamata: quando il controllo di tipo fallisce non
+# deve essere rieseguita
+SIDE_EFFECT = f"""\
+from std.io import *;
+callable g(int k) -> int {{ print("g"); return k; }};
+callable h(int a) -> int {{ return g(a) + 1; }};
+for (int i = 0; i < {QUICKEN_AFTER + 2}; i:++) {{ h(1); }}
+print(h(1.5));
+"""
+
+# i tipi degli operandi cambiano a ogni chiamata
+ALTERNATING = """\
+from std.io import *;
+callable f(int a) -> int { return a + a; };
+for (int i = 0; i < 100; i:++) { f(1); f(1.5); }
+print(f(2));
+"""
+
+
+def binary_ops(tree):
+    stack = list(tree)
+    while stack:
+        node = stack.pop()
+        if node.type == 'binary_op':
+            yield node
+        stack.extend(iter_children(node))
+
+
+def test_deoptimization_does_not_repeat_operands(capsys):
+    interpreter = Interpreter()
+    interpreter.interpret(parse_source(SIDE_EFFECT))
+    out = capsys.readouterr().out.split()
+    assert out == ['g'] * (QUICKEN_AFTER + 3) + ['2.5']
+    assert interpreter.quickener.deoptimized == 1
+
+
+def test_unstable_types_become_generic(capsys):
+    tree = parse_source(ALTERNATING)
+    interpreter = Interpreter()
+    interpreter.interpret(tree)
+    assert capsys.readouterr().out.split() == ['4']
+    add = next(node for node in binary_ops(tree) if node.op == '+')
+    assert add.seen is GENERIC and add.quick is None
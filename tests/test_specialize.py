@@ -0,0 +1,90 @@
+# tests/test_specialize.py
+
+"""Pass type-specialize: tipi dichiarati smentiti e operandi invalidi sono solo avvisi."""
+
+import pytest
+
+from chiron_runtime.cache import parse_source
+from chiron_runtime.closures import ClosureInterpreter
+from chiron_runtime.interpreter import Interpreter
+from chiron_runtime.nodes import iter_children
+from chiron_runtime.passes import PassManager
+from chiron_runtime.transpiler import PythonBackend
+from chiron_runtime.vm import VM
+
+BACKENDS = {'tree': Interpreter, 'closure': ClosureInterpreter, 'vm': VM, 'python': PythonBackend}
+
+MISMATCHES = """\
+from std.io import *;
+bool flag = 1;
+int x = "a";
+callable f(int a) -> int { return a + "!"; };
+callable g() -> str { return 3; };
+print(flag); print(x + "b"); print(f("s")); print(g());
+"""
+
+
+def binary_ops(tree):
+    stack = list(tree)
+    while stack:
+        node = stack.pop()
+        if node.type == 'binary_op':
+            yield node
+        stack.extend(iter_children(node))
+
+
+def test_declared_type_mismatches_are_warnings(capsys):
+    tree = parse_source(MISMATCHES, optimizer=PassManager(2))
+    warnings = capsys.readouterr().err.splitlines()
+    assert len(warnings) == 4
+    assert all(line.startswith('warning: line ') for line in warnings)
+    Interpreter().interpret(tree)
+    assert capsys.readouterr().out.split() == ['1', 'ab', 's!', '3']
+
+
+# int + str a runtime solleva un TypeError, che qui è gestito o in un ramo mai eseguito
+INVALID_OPERANDS = """\
+from std.io import *;
+int a = 1;
+str s = "x";
+try {
+    auto b = a + s;
+} except TypeError as e {
+    print("caught");
+}
+if (a == 2) { print(a + s); }
+print("end");
+"""
+
+
+@pytest.mark.parametrize('level', [0, 1, 2])
+def test_invalid_operands_are_warnings(level, capsys):
+    optimizer = PassManager(level) if level else None
+    tree = parse_source(INVALID_OPERANDS, optimizer=optimizer)
+    warnings = capsys.readouterr().err.splitlines()
+    if level == 2:
+        assert warnings == ["warning: line 5, col 5: unsupported operand types for +: 'int' and 'str'",
+                            "warning: line 9, col 15: unsupported operand types for +: 'int' and 'str'"]
+    Interpreter().interpret(tree)
+    assert capsys.readouterr().out.split() == ['caught', 'end']
+
+
+# x è dichiarato int ma riceve un float da Python: il pass specializza x + 1 per
+# int + int e il gestore deve ripiegare sul percorso generico
+UNTRUSTED = """\
+from std.io import *;
+import builtins as py;
+callable f(int n) -> int {
+    int x = py.float(n);
+    return x + 1;
+};
+print(f(2)); print(f(3));
+"""
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_specialized_operation_with_other_types(backend, capsys):
+    tree = parse_source(UNTRUSTED, optimizer=PassManager(2))
+    assert [node.spec for node in binary_ops(tree)] == ['int+int']
+    BACKENDS[backend]().interpret(tree)
+    assert capsys.readouterr().out.split() == ['3.0', '4.0']